@@ -3,15 +3,16 @@ FastAPI server for Paper2Slides
 """
 
 import sys
+import json
 import uuid
 import asyncio
 import logging
 from pathlib import Path
 from typing import List, Optional
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -25,10 +26,11 @@ sys.path.insert(0, str(PROJECT_ROOT))
 # Import paper2slides functions
 from paper2slides.core import (
     run_pipeline, get_base_dir, get_config_dir,
-    get_config_name, detect_start_stage
+    get_config_name, detect_start_stage, load_state,
+    JobScheduler, SchedulerLimits, EventBus,
 )
 from paper2slides.utils.path_utils import get_project_name
-from paper2slides.utils import setup_logging
+from paper2slides.utils import setup_logging, close_async_clients, rate_limit_stats
 
 # Configuration - use project root directories
 UPLOAD_DIR = PROJECT_ROOT / "sources" / "uploads"
@@ -41,48 +43,16 @@ app = FastAPI(title="Paper2Slides API", version="1.0.0")
 # Configure logging for paper2slides
 setup_logging(level=logging.INFO)
 
-# Global state for tracking running sessions
-class SessionManager:
-    def __init__(self):
-        self.running_session = None
-        self.cancelled_sessions = set()  # Track cancelled session IDs
-        self.lock = asyncio.Lock()
-    
-    async def start_session(self, session_id: str) -> bool:
-        """Try to start a new session. Returns False if another session is already running"""
-        async with self.lock:
-            if self.running_session is not None:
-                return False
-            self.running_session = session_id
-            # Remove from cancelled set when starting (for regeneration cases)
-            self.cancelled_sessions.discard(session_id)
-            return True
-    
-    async def end_session(self, session_id: str):
-        """End a session"""
-        async with self.lock:
-            if self.running_session == session_id:
-                self.running_session = None
-            # Keep cancelled flag for a bit, clean up later if needed
-    
-    async def cancel_session(self, session_id: str) -> bool:
-        """Cancel a running session. Returns True if session was running"""
-        async with self.lock:
-            if self.running_session == session_id:
-                self.cancelled_sessions.add(session_id)
-                logger.info(f"Session {session_id[:8]} marked for cancellation")
-                return True
-            return False
-    
-    def is_cancelled(self, session_id: str) -> bool:
-        """Check if a session has been cancelled"""
-        return session_id in self.cancelled_sessions
-    
-    def get_running_session(self) -> Optional[str]:
-        """Get the currently running session ID"""
-        return self.running_session
-
-session_manager = SessionManager()
+# Job scheduler: queued sessions with global and per-stage concurrency limits
+# (MAX_CONCURRENT_JOBS, MAX_PARSE_JOBS, MAX_LLM_JOBS, MAX_IMAGE_JOBS)
+session_manager = JobScheduler(SchedulerLimits.from_env())
+app.state.results = {}
+# Config dir of each session's run, so status lookups skip directory scans
+app.state.session_dirs = {}
+
+# Progress events per session, streamed to the frontend over SSE
+events = EventBus()
+SSE_KEEPALIVE_SECONDS = 15
 
 # CORS middleware
 app.add_middleware(
@@ -101,6 +71,7 @@ app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
 class ChatResponse(BaseModel):
     message: str
+    queue_position: Optional[int] = None
     slides: Optional[List[dict]] = None
     ppt_url: Optional[str] = None
     poster_url: Optional[str] = None
@@ -108,6 +79,12 @@ class ChatResponse(BaseModel):
     uploaded_files: Optional[List[dict]] = None
 
 
+@app.on_event("shutdown")
+async def shutdown_llm_clients():
+    """Close pooled LLM connections"""
+    await close_async_clients()
+
+
 @app.get("/")
 async def root():
     return {"message": "Paper2Slides API Server", "status": "running"}
@@ -120,19 +97,28 @@ async def health():
 
 @app.get("/api/session/running")
 async def get_running_session():
-    """Check if there is a session currently running"""
-    running_session = session_manager.get_running_session()
+    """List running and queued sessions"""
+    running = session_manager.running_jobs()
     return {
-        "has_running_session": running_session is not None,
-        "running_session_id": running_session[:8] if running_session else None
+        "has_running_session": bool(running),
+        "running_session_id": running[0].job_id[:8] if running else None,
+        "running_session_ids": [job.job_id[:8] for job in running],
+        "queued": len(session_manager.queued_jobs()),
+        "scheduler": session_manager.snapshot()["limits"],
     }
 
 
 @app.post("/api/cancel/{session_id}")
 async def cancel_session(session_id: str):
-    """Cancel a running session"""
+    """Cancel a queued or running session"""
     try:
-        cancelled = await session_manager.cancel_session(session_id)
+        job = session_manager.get_job(session_id)
+        was_queued = job is not None and job.status == "queued"
+        cancelled = session_manager.cancel(session_id)
+        if cancelled and was_queued:
+            app.state.results[session_id] = {"error": "Generation cancelled by user"}
+            events.publish(session_id, {"type": "error", "error": "Generation cancelled by user"})
+            _publish_queue_positions()
         if cancelled:
             return {"message": f"Session {session_id[:8]} cancellation requested", "cancelled": True}
         else:
@@ -144,7 +130,6 @@ async def cancel_session(session_id: str):
 
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(
-    background_tasks: BackgroundTasks,
     message: str = Form(""),
     content: str = Form("paper"),  # 'paper' or 'general'
     output_type: str = Form("slides"),  # 'slides' or 'poster'
@@ -153,6 +138,7 @@ async def chat(
     density: Optional[str] = Form(None),  # 'sparse', 'medium', 'dense' (for poster)
     fast_mode: Optional[str] = Form(None),  # 'true' or 'false' - fast mode for paper content
     session_id: Optional[str] = Form(None),  # Existing session ID to reuse files
+    priority: int = Form(0),  # Higher runs first among queued sessions
     files: List[UploadFile] = File([])
 ):
     """
@@ -167,15 +153,13 @@ async def chat(
         density: 'sparse', 'medium', 'dense' (for poster)
         fast_mode: 'true' or 'false' - fast mode for paper content (no RAG indexing)
         session_id: Optional existing session ID to reuse files (for regeneration)
+        priority: Admission priority; equal priorities are served FIFO
         files: List of uploaded files (PDF, MD, etc.)
     
     Returns:
         Response with session ID - actual generation happens in background
     """
     try:
-        # Check if another session is already running
-        running_session = session_manager.get_running_session()
-        
         # Check if reusing existing session
         reusing_session = False
         if session_id and not files:
@@ -185,22 +169,17 @@ async def chat(
                 reusing_session = True
                 print(f"Reusing existing session: {session_id[:8]}")
                 
-                # Check if this is a different session from the running one
-                if running_session and running_session != session_id:
+                # A session can only have one queued or running job
+                job = session_manager.get_job(session_id)
+                if job and job.active:
                     raise HTTPException(
                         status_code=409, 
-                        detail=f"Another session is already running. Please wait for it to complete. Running session: {running_session[:8]}"
+                        detail=f"Session {session_id[:8]} is already {job.status}. Please wait for it to complete."
                     )
             else:
                 raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
         else:
             # Generate new session ID
-            if running_session:
-                raise HTTPException(
-                    status_code=409, 
-                    detail=f"Another session is already running. Please wait for it to complete. Running session: {running_session[:8]}"
-                )
-            
             session_id = str(uuid.uuid4())
             session_dir = UPLOAD_DIR / session_id
             session_dir.mkdir(exist_ok=True)
@@ -268,29 +247,60 @@ async def chat(
             "poster_url": None
         }
         
-        # Start the pipeline in background
-        background_tasks.add_task(
-            run_pipeline_background,
+        # Queue the pipeline; jobs writing the same project never run concurrently
+        app.state.results.pop(session_id, None)
+        events.reset(session_id)
+        session_manager.submit(
             session_id,
-            message,
-            saved_files,
-            content,
-            output_type,
-            style,
-            length,
-            density,
-            fast_mode_bool,
-            session_manager  # Pass session manager to check for cancellation
+            lambda: run_pipeline_background(
+                session_id,
+                message,
+                saved_files,
+                content,
+                output_type,
+                style,
+                length,
+                density,
+                fast_mode_bool,
+                session_manager,  # Pass session manager to check for cancellation
+            ),
+            priority=priority,
+            resource_key=_get_resource_key(session_id, saved_files, content),
         )
+        response_data["queue_position"] = session_manager.queue_position(session_id)
+        if response_data["queue_position"] is not None:
+            events.publish(session_id, {"type": "queued", "position": response_data["queue_position"]})
         
-        # Return immediately so frontend can start polling
+        # Return immediately so frontend can subscribe to /api/events
         return JSONResponse(content=response_data)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error processing request: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
 
 
+def _publish_queue_positions():
+    """Tell every queued session its current position"""
+    for position, job in enumerate(session_manager.queued_jobs(), 1):
+        events.publish(job.job_id, {"type": "queued", "position": position})
+
+
+def _output_url(path: str) -> str:
+    return f"/outputs/{Path(path).relative_to(OUTPUT_DIR).as_posix()}"
+
+
+def _get_resource_key(session_id: str, files: List[dict], content: str) -> str:
+    """Output project a session writes to (same key => serialized)"""
+    pdf_paths = [f['path'] for f in files if f['filename'].lower().endswith('.pdf')]
+    if len(pdf_paths) == 1:
+        project_name = get_project_name(pdf_paths[0])
+    else:
+        project_name = f"session_{session_id[:8]}"
+    return f"{project_name}/{content}"
+
+
 async def generate_slides_with_pipeline(
     session_id: str,
     message: str, 
@@ -301,7 +311,7 @@ async def generate_slides_with_pipeline(
     length: Optional[str] = None,
     density: Optional[str] = None,
     fast_mode: bool = False,
-    session_manager: SessionManager = None
+    session_manager: JobScheduler = None
 ) -> dict:
     """
     Run the actual Paper2Slides pipeline
@@ -401,11 +411,18 @@ async def generate_slides_with_pipeline(
         initial_state["stages"][STAGES[i]] = "completed"
     
     save_state(config_dir, initial_state)
+    app.state.session_dirs[session_id] = config_dir
     print(f"  Initial state saved (starting from {from_stage})")
     
+    def on_event(event: dict):
+        # Slide paths become URLs the frontend can show right away
+        if event.get("type") == "slide":
+            event = {**event, "image_url": _output_url(event.pop("path"))}
+        events.publish(session_id, event)
+    
     # Run the pipeline (base_dir already handles document grouping)
     # Pass session_manager to enable cancellation checks
-    await run_pipeline(base_dir, config_dir, config, from_stage, session_id, session_manager)
+    await run_pipeline(base_dir, config_dir, config, from_stage, session_id, session_manager, on_event=on_event)
     
     # Find generated output
     output_files = []
@@ -425,6 +442,7 @@ async def generate_slides_with_pipeline(
     
     return {
         "output_dir": str(config_dir),
+        "output_type": output_type,
         "output_files": output_files,
         "num_files": len(output_files)
     }
@@ -496,23 +514,15 @@ async def run_pipeline_background(
     length: Optional[str],
     density: Optional[str],
     fast_mode: bool = False,
-    session_manager: SessionManager = None
+    session_manager: JobScheduler = None
 ):
     """
     Run pipeline in background and store results
     """
     try:
-        # Try to start the session
-        can_start = await session_manager.start_session(session_id)
-        if not can_start:
-            logger.error(f"Cannot start session {session_id[:8]} - another session is already running")
-            # Store error in state
-            if not hasattr(app.state, 'results'):
-                app.state.results = {}
-            app.state.results[session_id] = {"error": "Another session is already running"}
-            return
-        
         logger.info(f"Starting background pipeline for session {session_id[:8]}")
+        events.publish(session_id, {"type": "started"})
+        _publish_queue_positions()
         result = await generate_slides_with_pipeline(
             session_id, message, files, content, output_type, style, length, density, fast_mode, session_manager
         )
@@ -525,16 +535,19 @@ async def run_pipeline_background(
         logger.info(f"Background pipeline completed for session {session_id[:8]}")
         
         # Store result in a simple cache (in production, use Redis or database)
-        if not hasattr(app.state, 'results'):
-            app.state.results = {}
         app.state.results[session_id] = result
+        events.publish(session_id, {"type": "done", "result": _build_result_payload(session_id, result)})
         
+    except asyncio.CancelledError:
+        logger.info(f"Session {session_id[:8]} was cancelled")
+        app.state.results[session_id] = {"error": "Generation cancelled by user"}
+        events.publish(session_id, {"type": "error", "error": "Generation cancelled by user"})
+        raise
     except Exception as e:
         logger.error(f"Background pipeline failed for session {session_id[:8]}: {e}", exc_info=True)
         # Store error in state
-        if not hasattr(app.state, 'results'):
-            app.state.results = {}
         app.state.results[session_id] = {"error": str(e)}
+        events.publish(session_id, {"type": "error", "error": str(e)})
         
         # Also update the state.json file to reflect the failure
         try:
@@ -542,11 +555,42 @@ async def run_pipeline_background(
         except Exception as state_err:
             logger.error(f"Failed to update state file: {state_err}")
     finally:
-        # Always end the session when done (success or failure)
-        await session_manager.end_session(session_id)
         logger.info(f"Session {session_id[:8]} ended")
 
 
+def _find_session_state(session_id: str, project_name: str) -> Optional[dict]:
+    """Scan a project's state.json files for a session (fallback after server restarts)"""
+    state_data = None
+    most_recent_time = None
+    
+    # Check both paper and general content types
+    for content_type in ["paper", "general"]:
+        base_dir = Path(get_base_dir(str(OUTPUT_DIR), project_name, content_type))
+        if not base_dir.exists():
+            continue
+        # Look for all state.json files in config directories
+        for state_file_path in base_dir.rglob("state.json"):
+            if not state_file_path.is_file():
+                continue
+            try:
+                with open(state_file_path, 'r') as f:
+                    current_state = json.load(f)
+                
+                # First priority: exact match by session_id
+                if current_state.get("session_id") == session_id:
+                    logger.debug(f"Found exact session match: {state_file_path}")
+                    return current_state
+                
+                # Second priority: most recently updated (fallback for old state files)
+                updated_at = current_state.get("updated_at") or current_state.get("created_at")
+                if updated_at and (most_recent_time is None or updated_at > most_recent_time):
+                    most_recent_time = updated_at
+                    state_data = current_state
+            except Exception as e:
+                logger.warning(f"Error reading state file {state_file_path}: {e}")
+    return state_data
+
+
 @app.get("/api/status/{session_id}")
 async def get_status(session_id: str):
     """Get processing status for a session"""
@@ -561,51 +605,29 @@ async def get_status(session_id: str):
         if not pdf_files:
             return {"session_id": session_id, "status": "no_files", "stages": {}}
         
-        # Determine project name and paths
-        if len(pdf_files) > 1:
-            project_name = f"session_{session_id[:8]}"
-        else:
-            project_name = get_project_name(str(pdf_files[0]))
-        
-        # Try to find the state file matching session_id
-        from paper2slides.core.paths import get_base_dir
-        import json
+        # Still waiting for admission: report queue position
+        job = session_manager.get_job(session_id)
+        queue_position = session_manager.queue_position(session_id)
+        if queue_position is not None:
+            return {
+                "session_id": session_id,
+                "status": "queued",
+                "queue_position": queue_position,
+                "queue_length": len(session_manager.queued_jobs()),
+                "stages": {stage: "pending" for stage in ["rag", "summary", "plan", "generate"]},
+            }
         
-        # Check both paper and general content types
+        # Known sessions read their own state.json directly
         state_data = None
-        most_recent_time = None
-        
-        for content_type in ["paper", "general"]:
-            base_dir = Path(get_base_dir(str(OUTPUT_DIR), project_name, content_type))
-            if base_dir.exists():
-                # Look for all state.json files in config directories
-                for state_file_path in base_dir.rglob("state.json"):
-                    if state_file_path.is_file():
-                        try:
-                            with open(state_file_path, 'r') as f:
-                                current_state = json.load(f)
-                            
-                            # First priority: exact match by session_id
-                            if current_state.get("session_id") == session_id:
-                                state_data = current_state
-                                logger.debug(f"Found exact session match: {state_file_path}")
-                                break
-                            
-                            # Second priority: most recently updated (fallback for old state files)
-                            updated_at = current_state.get("updated_at") or current_state.get("created_at")
-                            if updated_at:
-                                if most_recent_time is None or updated_at > most_recent_time:
-                                    most_recent_time = updated_at
-                                    # Only use as fallback if no exact match found
-                                    if state_data is None or state_data.get("session_id") != session_id:
-                                        state_data = current_state
-                        except Exception as e:
-                            logger.warning(f"Error reading state file {state_file_path}: {e}")
-                            continue
-                
-                # If found exact match, stop searching
-                if state_data and state_data.get("session_id") == session_id:
-                    break
+        config_dir = app.state.session_dirs.get(session_id)
+        if config_dir:
+            state_data = load_state(config_dir)
+        if state_data is None:
+            if len(pdf_files) > 1:
+                project_name = f"session_{session_id[:8]}"
+            else:
+                project_name = get_project_name(str(pdf_files[0]))
+            state_data = _find_session_state(session_id, project_name)
         
         if not state_data:
             return {
@@ -634,6 +656,8 @@ async def get_status(session_id: str):
             "session_id": session_id,
             "status": overall_status,
             "stages": stages,
+            "current_stage": job.stage if job else None,
+            "queue_position": None,
             "error": state_data.get("error"),
             "updated_at": state_data.get("updated_at")
         }
@@ -643,74 +667,52 @@ async def get_status(session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _build_result_payload(session_id: str, result: dict) -> dict:
+    """Slides and download links for a finished session"""
+    output_files = result.get("output_files", [])
+    output_type = result.get("output_type", "slides")
+    
+    # Find PDF file in output
+    pdf_file = next((f for f in output_files if f['filename'].endswith('.pdf')), None)
+    # Find image files
+    image_files = [f for f in output_files if f['filename'].endswith(('.png', '.jpg', '.jpeg', '.webp'))]
+    
+    response_data = {
+        "session_id": session_id,
+        "slides": [
+            {
+                "title": f"Slide {i+1}",
+                "image_url": f"/outputs/{img['relative_path']}"
+            }
+            for i, img in enumerate(image_files)
+        ],
+    }
+    
+    # Add download links
+    if pdf_file:
+        if output_type == "slides":
+            response_data["ppt_url"] = f"/outputs/{pdf_file['relative_path']}"
+        elif output_type == "poster":
+            response_data["poster_url"] = f"/outputs/{pdf_file['relative_path']}"
+    elif image_files and output_type == "poster":
+        # If no PDF but has images, use first image as poster
+        response_data["poster_url"] = f"/outputs/{image_files[0]['relative_path']}"
+    
+    return response_data
+
+
 @app.get("/api/result/{session_id}")
 async def get_result(session_id: str):
     """Get the final result for a completed session"""
     try:
         # Check if result is in cache
-        if hasattr(app.state, 'results') and session_id in app.state.results:
+        if session_id in app.state.results:
             result = app.state.results[session_id]
             
             if "error" in result:
                 raise HTTPException(status_code=500, detail=result["error"])
             
-            # Prepare response with output files
-            output_files = result.get("output_files", [])
-            
-            # Find PDF file in output
-            pdf_file = next((f for f in output_files if f['filename'].endswith('.pdf')), None)
-            # Find image files
-            image_files = [f for f in output_files if f['filename'].endswith(('.png', '.jpg', '.jpeg', '.webp'))]
-            
-            # Get output_type from state
-            session_dir = UPLOAD_DIR / session_id
-            pdf_files = list(session_dir.glob("*.pdf"))
-            if len(pdf_files) > 1:
-                project_name = f"session_{session_id[:8]}"
-            else:
-                project_name = get_project_name(str(pdf_files[0]))
-            
-            # Try to get output type from state
-            from paper2slides.core.paths import get_base_dir
-            import json
-            
-            output_type = "slides"  # default
-            for content_type in ["paper", "general"]:
-                base_dir = Path(get_base_dir(str(OUTPUT_DIR), project_name, content_type))
-                if base_dir.exists():
-                    for state_file_path in base_dir.rglob("state.json"):
-                        if state_file_path.is_file():
-                            try:
-                                with open(state_file_path, 'r') as f:
-                                    state_data = json.load(f)
-                                    output_type = state_data.get("config", {}).get("output_type", "slides")
-                                    break
-                            except:
-                                pass
-                    if output_type != "slides":
-                        break
-            
-            response_data = {
-                "session_id": session_id,
-                "slides": [
-                    {
-                        "title": f"Slide {i+1}",
-                        "image_url": f"/outputs/{img['relative_path']}"
-                    }
-                    for i, img in enumerate(image_files)
-                ],
-            }
-            
-            # Add download links
-            if pdf_file:
-                if output_type == "slides":
-                    response_data["ppt_url"] = f"/outputs/{pdf_file['relative_path']}"
-                elif output_type == "poster":
-                    response_data["poster_url"] = f"/outputs/{pdf_file['relative_path']}"
-            elif image_files and output_type == "poster":
-                # If no PDF but has images, use first image as poster
-                response_data["poster_url"] = f"/outputs/{image_files[0]['relative_path']}"
-            
+            response_data = _build_result_payload(session_id, result)
             return JSONResponse(content=response_data)
         
         # If not in cache, return not ready
@@ -726,6 +728,79 @@ async def get_result(session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/events/{session_id}")
+async def stream_events(session_id: str):
+    """Server-Sent Events stream of a session's progress
+    
+    Events (SSE event name = type): queued, started, stages, stage, slide,
+    done (with the final result) and error. Past events are replayed first,
+    so subscribing late is safe.
+    """
+    if not (UPLOAD_DIR / session_id).exists():
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    
+    if not events.has_channel(session_id):
+        job = session_manager.get_job(session_id)
+        if session_id in app.state.results:
+            # Finished before anyone subscribed and history was pruned
+            result = app.state.results[session_id]
+            if "error" in result:
+                events.publish(session_id, {"type": "error", "error": result["error"]})
+            else:
+                events.publish(session_id, {"type": "done", "result": _build_result_payload(session_id, result)})
+        elif job is None or not job.active:
+            raise HTTPException(status_code=404, detail=f"No active run for session {session_id}")
+    
+    async def event_stream():
+        async for event in events.subscribe(session_id, keepalive=SSE_KEEPALIVE_SECONDS):
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/metrics")
+async def get_server_metrics():
+    """Process-wide metrics: provider rate limiters and the job scheduler"""
+    return {
+        "rate_limits": rate_limit_stats(),
+        "scheduler": session_manager.snapshot(),
+    }
+
+
+@app.get("/api/metrics/{session_id}")
+async def get_session_metrics(session_id: str):
+    """Run metrics of a session (stage timings, provider calls, cache hits)
+    
+    Query the "calls" list for per-request wall time, queue wait, retries,
+    tokens and bytes; "calls_by_stage" has the totals.
+    """
+    config_dir = app.state.session_dirs.get(session_id)
+    state_data = load_state(config_dir) if config_dir else None
+    if state_data is None:
+        # After a restart: only an exact session match, not the most recent run
+        pdf_files = list((UPLOAD_DIR / session_id).glob("*.pdf"))
+        if pdf_files:
+            project_name = f"session_{session_id[:8]}" if len(pdf_files) > 1 else get_project_name(str(pdf_files[0]))
+            state_data = _find_session_state(session_id, project_name)
+            if state_data and state_data.get("session_id") != session_id:
+                state_data = None
+    if not state_data or "metrics" not in state_data:
+        raise HTTPException(status_code=404, detail=f"No metrics for session {session_id}")
+    
+    return {
+        "session_id": session_id,
+        "stages": state_data.get("stages", {}),
+        "metrics": state_data["metrics"],
+    }
+
+
 @app.get("/api/download/{filepath:path}")
 async def download_file(filepath: str):
     """Download generated file (supports subdirectories)"""
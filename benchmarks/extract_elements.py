@@ -0,0 +1,115 @@
+"""
+Benchmark table/figure extraction on large merged markdown.
+
+Builds a synthetic corpus shaped like merged MinerU output of several
+papers (sections, long paragraphs, HTML tables, images, captions before and
+after elements, some uncaptioned) and times extract_tables_and_figures on
+growing sizes. A cost per element that stays flat as the corpus grows means
+extraction is linear in document size.
+
+Usage:
+    python benchmarks/extract_elements.py
+    python benchmarks/extract_elements.py --papers 5 20 80 --repeat 5
+    python benchmarks/extract_elements.py --write corpus.md --papers 40
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from paper2slides.summary.extractors import extract_tables_and_figures
+
+WORDS = (
+    "model training attention layer dataset baseline results accuracy loss "
+    "gradient encoder decoder token sequence benchmark ablation transformer"
+).split()
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)) + "."
+
+
+def _table(rng: random.Random, rows: int) -> str:
+    cells = "".join(
+        "<tr>" + "".join(f"<td>{rng.random():.3f}</td>" for _ in range(4)) + "</tr>"
+        for _ in range(rows)
+    )
+    return f"<table>{cells}</table>"
+
+
+def build_paper(rng: random.Random, index: int, sections: int = 8) -> str:
+    """One paper: sections with text, figures and tables, captions in varied places"""
+    parts = [f"# Paper {index}: {_paragraph(rng, 6)}", ""]
+    figure_no = table_no = 0
+    for section in range(sections):
+        parts += [f"## {section + 1} Section", ""]
+        for _ in range(rng.randint(2, 5)):
+            # Long single-line paragraphs, as MinerU writes them
+            parts += [_paragraph(rng, rng.randint(40, 200)), ""]
+            roll = rng.random()
+            if roll < 0.25:
+                figure_no += 1
+                image = f"![](images/p{index}_f{figure_no}.jpg)"
+                caption = f"Figure {figure_no}: {_paragraph(rng, 12)}"
+                if rng.random() < 0.8:
+                    parts += [image, "", caption, ""]
+                else:
+                    parts += [caption, "", image, ""]
+            elif roll < 0.45:
+                table_no += 1
+                table = _table(rng, rng.randint(3, 20))
+                caption = f"Table {table_no}: {_paragraph(rng, 10)}"
+                if rng.random() < 0.7:
+                    parts += [caption, "", table, ""]
+                elif rng.random() < 0.5:
+                    parts += [table, "", caption, ""]
+                else:
+                    # Caption only reachable through the character fallback
+                    parts += [table, _paragraph(rng, 3) + f" Table {table_no}. inline caption", ""]
+            elif roll < 0.5:
+                parts += [f"![](images/p{index}_u{section}.jpg)", ""]
+    return "\n".join(parts)
+
+
+def build_corpus(papers: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "\n\n".join(build_paper(rng, i) for i in range(papers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark markdown table/figure extraction")
+    parser.add_argument("--papers", type=int, nargs="+", default=[5, 20, 80],
+                        help="Corpus sizes in merged papers")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--write", help="Write the largest corpus to this path and exit")
+    args = parser.parse_args()
+
+    if args.write:
+        Path(args.write).write_text(build_corpus(max(args.papers), args.seed), encoding="utf-8")
+        print(f"Wrote {args.write}")
+        return
+
+    print(f"{'papers':>7} {'MB':>7} {'figures':>8} {'tables':>7} {'best s':>8} {'us/element':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for papers in args.papers:
+            md_path = Path(tmp) / f"corpus_{papers}.md"
+            md_path.write_text(build_corpus(papers, args.seed), encoding="utf-8")
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                elements = extract_tables_and_figures(str(md_path))
+                best = min(best, time.perf_counter() - start)
+            count = len(elements.figures) + len(elements.tables)
+            print(
+                f"{papers:>7} {md_path.stat().st_size / 1e6:>7.2f} {len(elements.figures):>8} "
+                f"{len(elements.tables):>7} {best:>8.3f} {best / max(count, 1) * 1e6:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Stand-in for the `mineru` CLI
+
+Writes a fixed MinerU-style output for any input file instead of parsing
+it: <output>/<stem>/<method>/<stem>.md, <stem>_content_list.json and
+images/. The benchmark harness puts a `mineru` shim for this script first
+on PATH.
+
+Fixture shape (environment):
+    BENCH_MINERU_SECONDS   simulated parse time (default 0)
+    BENCH_MINERU_FIGURES   figures per document (default 3)
+    BENCH_MINERU_PAGES     pages of text per document (default 10)
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import argparse
+from pathlib import Path
+
+
+def _figure(path: Path, seed: int):
+    from PIL import Image
+    # Flat diagram-like figure: white background with colored bars, distinct
+    # per document so image caches behave as with real papers
+    image = Image.new("RGB", (1600, 1000), "white")
+    for bar in range(6):
+        color = ((seed + bar * 40) % 255, (seed // 7) % 255, 200 - bar * 25)
+        image.paste(color, (100 + bar * 240, 900 - (bar + 1) * 120, 260 + bar * 240, 900))
+    image.save(path, format="JPEG", quality=90)
+
+
+def write_fixture(input_path: Path, output_dir: Path, method: str):
+    figures = int(os.getenv("BENCH_MINERU_FIGURES", "3"))
+    pages = int(os.getenv("BENCH_MINERU_PAGES", "10"))
+    stem = input_path.stem
+    out = output_dir / stem / method
+    images = out / "images"
+    images.mkdir(parents=True, exist_ok=True)
+
+    md = [f"# Benchmark Document {stem}", "", "Abstract", "", "We study a problem and propose a method.", ""]
+    content_list = [{"type": "text", "text": f"Benchmark Document {stem}", "text_level": 1, "page_idx": 0}]
+    paragraph = "This paragraph describes the method, the experiments and the results in detail. " * 8
+
+    for page in range(pages):
+        md += [f"## Section {page + 1}", "", paragraph, ""]
+        content_list.append({"type": "text", "text": paragraph, "page_idx": page})
+        if page < figures:
+            name = f"fig{page + 1}.jpg"
+            _figure(images / name, zlib.crc32(f"{stem}/{page}".encode("utf-8")))
+            md += [f"![](images/{name})", f"Figure {page + 1}: Overview of component {page + 1}.", ""]
+            content_list.append({
+                "type": "image", "img_path": f"images/{name}",
+                "image_caption": [f"Figure {page + 1}: Overview of component {page + 1}."],
+                "image_footnote": [], "page_idx": page,
+            })
+        if page == 1:
+            table = "<table><tr><td>Method</td><td>Score</td></tr><tr><td>Ours</td><td>91.2</td></tr></table>"
+            md += ["Table 1: Main results.", "", table, ""]
+            content_list.append({
+                "type": "table", "table_body": table, "table_caption": ["Table 1: Main results."],
+                "table_footnote": [], "img_path": "", "page_idx": page,
+            })
+
+    (out / f"{stem}.md").write_text("\n".join(md), encoding="utf-8")
+    (out / f"{stem}_content_list.json").write_text(json.dumps(content_list), encoding="utf-8")
+
+
+def main():
+    if "--version" in sys.argv:
+        print("mineru 2.0.0 (benchmark stub)")
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--path", required=True)
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("-m", "--method", default="auto")
+    args, _ = parser.parse_known_args()
+
+    time.sleep(float(os.getenv("BENCH_MINERU_SECONDS", "0")))
+    write_fixture(Path(args.path), Path(args.output), args.method)
+    print(f"Parsed {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Local stand-in for an OpenAI-compatible API (stdlib only)
+
+Serves the endpoints the pipeline uses, with configurable latency, jitter,
+error rate and response size:
+- POST /v1/chat/completions: text answers, or an image (OpenRouter-style
+  message.images) when the request asks for image modalities
+- POST /v1/embeddings: deterministic vectors
+
+Text answers contain a ```json block that satisfies every JSON consumer
+(content analysis, slide planning, style processing), so one response
+works for all pipeline LLM calls.
+
+Run standalone:
+    python benchmarks/mock_openai.py --port 8765 --latency 0.5 --error-rate 0.05
+"""
+import io
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server."""
+    latency: float = 0.0
+    """Base seconds per text/embedding request"""
+
+    image_latency: float = 0.0
+    """Base seconds per image request"""
+
+    jitter: float = 0.0
+    """Uniform +/- seconds added to every latency"""
+
+    error_rate: float = 0.0
+    """Fraction of requests answered with 429 (retry-after-ms) or 503"""
+
+    text_bytes: int = 2000
+    """Approximate size of text answers"""
+
+    image_size: Tuple[int, int] = (1376, 768)
+    """Generated slide size in pixels (noise PNG, so close to worst-case bytes)"""
+
+    slides: int = 8
+    """Slides in the planning answer"""
+
+    embedding_dim: int = 3072
+
+
+class _State:
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.requests: Dict[str, int] = {"chat": 0, "image": 0, "embeddings": 0, "errors": 0}
+        self._image: Optional[str] = None
+        self._text: Optional[str] = None
+
+    def count(self, name: str):
+        with self.lock:
+            self.requests[name] += 1
+
+    @property
+    def image_data_url(self) -> str:
+        if self._image is None:
+            from PIL import Image
+            import base64
+            buffer = io.BytesIO()
+            Image.effect_noise(self.config.image_size, 64).convert("RGB").save(buffer, format="PNG")
+            self._image = "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+        return self._image
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            slides = [
+                {
+                    "id": f"slide_{i + 1:02d}",
+                    "title": f"Slide {i + 1}",
+                    "content": f"Key point {i + 1} of the paper.",
+                    "figures": [{"figure_id": "Figure 1", "focus": "overview"}] if i % 2 else [],
+                    "tables": [{"table_id": "Table 1", "extract": "", "focus": "results"}] if i % 3 == 2 else [],
+                }
+                for i in range(self.config.slides)
+            ]
+            payload = {
+                "title": "Benchmark Paper",
+                "authors": "A. Author (Institute)",
+                "content_elements": {
+                    name: {"present": True, "description": "present"}
+                    for name in ("problem_or_motivation", "proposed_approach", "results", "conclusions_or_contributions")
+                },
+                "slides": slides,
+                "sections": slides,
+                "style_name": "Clean academic style",
+                "color_tone": "light",
+                "special_elements": "",
+                "decorations": "",
+                "valid": True,
+            }
+            prose = "The paper proposes a method and evaluates it on standard benchmarks. "
+            padding = prose * max(1, self.config.text_bytes // len(prose))
+            self._text = f"{padding}\n\n```json\n{json.dumps(payload)}\n```"
+        return self._text
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: _State = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _sleep(self, base: float):
+        config = self.state.config
+        delay = base + random.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _maybe_fail(self) -> bool:
+        if random.random() >= self.state.config.error_rate:
+            return False
+        self.state.count("errors")
+        if random.random() < 0.5:
+            self._send(429, {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}}, {"retry-after-ms": "200"})
+        else:
+            self._send(503, {"error": {"message": "Service unavailable", "type": "server_error"}})
+        return True
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            with self.state.lock:
+                self._send(200, dict(self.state.requests))
+        else:
+            self._send(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.rstrip("/")
+
+        if path.endswith("/chat/completions"):
+            wants_image = "image" in (body.get("modalities") or [])
+            self._sleep(self.state.config.image_latency if wants_image else self.state.config.latency)
+            if self._maybe_fail():
+                return
+            self.state.count("image" if wants_image else "chat")
+            self._send(200, self._completion(body, wants_image))
+        elif path.endswith("/embeddings"):
+            self._sleep(self.state.config.latency)
+            if self._maybe_fail():
+                return
+            self.state.count("embeddings")
+            self._send(200, self._embeddings(body))
+        else:
+            self._send(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+
+    def _completion(self, body: Dict, wants_image: bool) -> Dict:
+        message = {"role": "assistant", "content": "Here is the slide." if wants_image else self.state.text}
+        if wants_image:
+            message["images"] = [{"type": "image_url", "image_url": {"url": self.state.image_data_url}}]
+        prompt_chars = len(json.dumps(body.get("messages", [])))
+        completion_tokens = len(message["content"]) // 4
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_chars // 4 + completion_tokens,
+            },
+        }
+
+    def _embeddings(self, body: Dict) -> Dict:
+        inputs = body.get("input") or []
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dim = self.state.config.embedding_dim
+        data = []
+        for i, text in enumerate(inputs):
+            rng = random.Random(hashlib.sha256(str(text).encode("utf-8")).digest())
+            data.append({"object": "embedding", "index": i, "embedding": [rng.uniform(-1, 1) for _ in range(dim)]})
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "mock"),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+
+class MockOpenAIServer:
+    """Threaded mock server; use as a context manager or start()/stop()."""
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.state = _State(self.config)
+        handler = type("Handler", (_Handler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def requests(self) -> Dict[str, int]:
+        with self.state.lock:
+            return dict(self.state.requests)
+
+    def start(self) -> "MockOpenAIServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--image-latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--text-bytes", type=int, default=2000)
+    parser.add_argument("--image-size", default="1376x768", help="WIDTHxHEIGHT of generated slides")
+    parser.add_argument("--slides", type=int, default=8)
+    parser.add_argument("--embedding-dim", type=int, default=3072)
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.image_size.lower().split("x"))
+    config = MockConfig(
+        latency=args.latency, image_latency=args.image_latency, jitter=args.jitter,
+        error_rate=args.error_rate, text_bytes=args.text_bytes, image_size=(width, height),
+        slides=args.slides, embedding_dim=args.embedding_dim,
+    )
+    server = MockOpenAIServer(config, args.host, args.port)
+    print(f"Mock OpenAI server on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+End-to-end pipeline benchmark against a local mock API
+
+Runs run_pipeline for a batch of synthetic documents without real API
+quota:
+- LLM, image and embedding calls go to a local OpenAI-compatible mock
+  (benchmarks/mock_openai.py) with configurable latency, jitter, error rate
+  and response size
+- `mineru` is replaced by a stub that writes a fixed MinerU output
+  (benchmarks/fake_mineru.py)
+
+Each concurrency setting runs in a fresh process (so peak RSS is per
+setting) and reports per-stage latencies, p50/p95 end-to-end time, peak
+RSS and docs/hour. Use --json to save results and compare commits.
+
+Usage:
+    python benchmarks/run_pipeline.py --docs 8 --concurrency 1,2,4 \\
+        --latency 0.2 --image-latency 1.0 --jitter 0.1 --error-rate 0.02 --json bench.json
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+STAGES = ["rag", "summary", "plan", "generate"]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# ---- Child: one concurrency setting ----
+
+async def _run_setting(args) -> Dict[str, Any]:
+    from paper2slides.core import run_pipeline, get_base_dir, get_config_dir, load_state
+    from paper2slides.utils import close_async_clients
+
+    work_dir = Path(args.work_dir)
+    inputs_dir = work_dir / "inputs"
+    inputs_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = work_dir / "outputs"
+
+    nonce = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run_doc(index: int) -> Dict[str, Any]:
+        # Unique bytes per document and run, so no checkpoint is reused
+        input_path = inputs_dir / f"doc{index:03d}_{nonce}.pdf"
+        input_path.write_bytes(f"%PDF-1.4\n% benchmark {nonce} {index}\n%%EOF\n".encode("ascii"))
+        config = {
+            "input_path": str(input_path),
+            "content_type": "paper",
+            "output_type": "slides",
+            "poster_format": "landscape",
+            "style": "academic",
+            "custom_style": None,
+            "slides_length": "medium",
+            "poster_density": "medium",
+            "language": "en",
+            "fast_mode": not args.normal,
+            "max_workers": args.image_workers,
+            "reuse_images": False,
+        }
+        base_dir = get_base_dir(str(output_dir), input_path.stem, "paper")
+        config_dir = get_config_dir(base_dir, config)
+
+        async with semaphore:
+            started = time.monotonic()
+            await run_pipeline(base_dir, config_dir, config, "rag")
+            seconds = time.monotonic() - started
+
+        state = load_state(config_dir) or {}
+        metrics = state.get("metrics", {})
+        calls = metrics.get("calls_by_stage", {})
+        return {
+            "seconds": seconds,
+            "ok": all(state.get("stages", {}).get(s) == "completed" for s in STAGES),
+            "stages": {s: m.get("wall_seconds", 0.0) for s, m in metrics.get("stages", {}).items()},
+            "retries": sum(t.get("retries", 0) for kinds in calls.values() for t in kinds.values()),
+            "calls": sum(t.get("calls", 0) for kinds in calls.values() for t in kinds.values()),
+        }
+
+    started = time.monotonic()
+    try:
+        docs = await asyncio.gather(*(run_doc(i) for i in range(args.docs)))
+    finally:
+        await close_async_clients()
+    wall = time.monotonic() - started
+
+    ok = [d for d in docs if d["ok"]]
+    latencies = [d["seconds"] for d in ok]
+    return {
+        "concurrency": args.concurrency,
+        "docs": args.docs,
+        "failed": len(docs) - len(ok),
+        "wall_seconds": round(wall, 3),
+        "p50_seconds": round(_percentile(latencies, 50), 3),
+        "p95_seconds": round(_percentile(latencies, 95), 3),
+        "docs_per_hour": round(len(ok) * 3600 / wall, 1) if wall else 0.0,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "stage_seconds": {
+            stage: {
+                "mean": round(statistics.mean(values), 3),
+                "p95": round(_percentile(values, 95), 3),
+            }
+            for stage in STAGES
+            if (values := [d["stages"][stage] for d in ok if stage in d["stages"]])
+        },
+        "calls": sum(d["calls"] for d in docs),
+        "retries": sum(d["retries"] for d in docs),
+    }
+
+
+def _child_main(args):
+    from paper2slides.utils import setup_logging
+    setup_logging(level=logging.DEBUG if args.verbose else logging.WARNING)
+    result = asyncio.run(_run_setting(args))
+    print("BENCH_RESULT " + json.dumps(result))
+
+
+# ---- Parent: mock server, stub MinerU, one child per setting ----
+
+def _install_mineru_stub(bin_dir: Path):
+    stub = bin_dir / "mineru"
+    stub.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{BENCH_DIR / "fake_mineru.py"}" "$@"\n')
+    stub.chmod(0o755)
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    """Run every concurrency setting and return the collected results."""
+    from mock_openai import MockConfig, MockOpenAIServer
+
+    width, height = (int(v) for v in args.image_size.lower().split("x"))
+    mock_config = MockConfig(
+        latency=args.latency, image_latency=args.image_latency, jitter=args.jitter,
+        error_rate=args.error_rate, text_bytes=args.text_bytes, image_size=(width, height),
+        slides=args.slides, embedding_dim=args.embedding_dim,
+    )
+    results = []
+    with tempfile.TemporaryDirectory(prefix="p2s-bench-") as tmp, MockOpenAIServer(mock_config) as server:
+        tmp = Path(tmp)
+        bin_dir = tmp / "bin"
+        bin_dir.mkdir()
+        _install_mineru_stub(bin_dir)
+
+        env = dict(os.environ)
+        env.update({
+            "PATH": f"{bin_dir}{os.pathsep}{env.get('PATH', '')}",
+            "RAG_LLM_API_KEY": "mock",
+            "RAG_LLM_BASE_URL": server.base_url,
+            "IMAGE_GEN_PROVIDER": "openrouter",
+            "IMAGE_GEN_API_KEY": "mock",
+            "IMAGE_GEN_BASE_URL": server.base_url,
+            "EMBEDDING_DIM": str(args.embedding_dim),
+            "BENCH_MINERU_SECONDS": str(args.parse_seconds),
+            "BENCH_MINERU_FIGURES": str(args.figures),
+            "BENCH_MINERU_PAGES": str(args.pages),
+            "CHECKPOINT_STORE_DIR": str(tmp / "cas"),
+        })
+
+        for concurrency in args.concurrency:
+            for repeat in range(args.repeat):
+                work_dir = tmp / f"c{concurrency}-r{repeat}"
+                cmd = [
+                    sys.executable, str(Path(__file__).resolve()), "--child",
+                    "--work-dir", str(work_dir),
+                    "--docs", str(args.docs),
+                    "--concurrency", str(concurrency),
+                    "--image-workers", str(args.image_workers),
+                ]
+                if args.normal:
+                    cmd.append("--normal")
+                if args.verbose:
+                    cmd.append("--verbose")
+                before = server.requests
+                proc = subprocess.run(cmd, env=env, capture_output=not args.verbose, text=True)
+                line = next((l for l in reversed((proc.stdout or "").splitlines()) if l.startswith("BENCH_RESULT ")), None)
+                if proc.returncode != 0 or line is None:
+                    sys.stderr.write(proc.stderr or "")
+                    raise RuntimeError(f"Benchmark run failed (concurrency={concurrency})")
+                result = json.loads(line[len("BENCH_RESULT "):])
+                after = server.requests
+                result["repeat"] = repeat
+                result["mock_requests"] = {k: after[k] - before.get(k, 0) for k in after}
+                results.append(result)
+                _print_row(result)
+
+    return {
+        "git_rev": _git_rev(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("child", "work_dir", "json")},
+        "results": results,
+    }
+
+
+def _print_row(result: Dict[str, Any]):
+    stages = " ".join(f"{s}={m['mean']:.2f}s" for s, m in result["stage_seconds"].items())
+    print(
+        f"concurrency={result['concurrency']:<3} docs={result['docs']:<3} failed={result['failed']:<2} "
+        f"wall={result['wall_seconds']:.2f}s p50={result['p50_seconds']:.2f}s p95={result['p95_seconds']:.2f}s "
+        f"docs/h={result['docs_per_hour']:.0f} rss={result['peak_rss_mb']:.0f}MB "
+        f"retries={result['retries']} | {stages}",
+        flush=True,
+    )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark run_pipeline against a local mock API")
+    parser.add_argument("--docs", type=int, default=4, help="Documents per setting")
+    parser.add_argument("--concurrency", default="1,2,4",
+                        help="Comma-separated numbers of documents run at once")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per setting")
+    parser.add_argument("--image-workers", type=int, default=4, help="Concurrent slides per document")
+    parser.add_argument("--normal", action="store_true", help="Normal mode (LightRAG indexing) instead of fast mode")
+    # Mock API
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per LLM/embedding request")
+    parser.add_argument("--image-latency", type=float, default=0.2, help="Seconds per image request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 429/503 responses")
+    parser.add_argument("--text-bytes", type=int, default=2000, help="Size of text answers")
+    parser.add_argument("--image-size", default="1376x768", help="WIDTHxHEIGHT of generated slides")
+    parser.add_argument("--slides", type=int, default=8, help="Slides per planned deck")
+    parser.add_argument("--embedding-dim", type=int, default=256)
+    # Stub MinerU
+    parser.add_argument("--parse-seconds", type=float, default=0.0, help="Simulated MinerU time per document")
+    parser.add_argument("--figures", type=int, default=3, help="Figures per document")
+    parser.add_argument("--pages", type=int, default=10, help="Pages per document")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs")
+    # Internal: run one setting in this process
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if not args.child:
+        args.concurrency = [int(c) for c in str(args.concurrency).split(",") if c.strip()]
+    else:
+        args.concurrency = int(args.concurrency)
+    return args
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    if args.child:
+        _child_main(args)
+        return
+
+    report = run_benchmark(args)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
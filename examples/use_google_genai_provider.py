@@ -34,7 +34,7 @@ def example_1_using_environment():
     print(f"✓ Using model: {generator.model}")
 
     # Now use generator normally...
-    # generator.generate(plan, gen_input)
+    # await generator.generate(plan, gen_input)
 
 
 def example_2_explicit_provider():
@@ -60,7 +60,7 @@ def example_2_explicit_provider():
     print(f"✓ Generator initialized with custom provider")
 
     # Now use generator normally...
-    # generator.generate(plan, gen_input)
+    # await generator.generate(plan, gen_input)
 
 
 def example_3_using_factory():
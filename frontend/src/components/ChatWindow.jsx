@@ -34,7 +34,9 @@ const ChatWindow = () => {
   const messagesEndRef = useRef(null)
   const abortControllerRef = useRef(null)
   
-  // Session-level polling intervals: Map<sessionId, intervalId>
+  // Session-level progress streams: Map<sessionId, EventSource>
+  const eventSourcesRef = useRef(new Map())
+  // Session-level polling intervals (fallback when streaming fails): Map<sessionId, intervalId>
   const pollIntervalsRef = useRef(new Map())
   // Track sessions that are currently fetching results to prevent duplicates
   const fetchingResultsRef = useRef(new Set())
@@ -79,9 +81,14 @@ const ChatWindow = () => {
     }
   }, [conversations])
 
-  // Cleanup polling intervals when component unmounts
+  // Cleanup progress streams and polling intervals when component unmounts
   useEffect(() => {
     return () => {
+      // Close all progress streams
+      eventSourcesRef.current.forEach((source) => {
+        source.close()
+      })
+      eventSourcesRef.current.clear()
       // Clear all polling intervals
       pollIntervalsRef.current.forEach((intervalId) => {
         clearInterval(intervalId)
@@ -331,13 +338,9 @@ const ChatWindow = () => {
             await fetch(`/api/cancel/${sessionId}`, { method: 'POST' })
             console.log('Cancellation request sent to backend')
             
-            // Clear polling interval for this session
-            const intervalId = pollIntervalsRef.current.get(sessionId)
-            if (intervalId) {
-              clearInterval(intervalId)
-              pollIntervalsRef.current.delete(sessionId)
-              console.log(`Cleared polling for session ${sessionId}`)
-            }
+            // Stop following this session
+            stopTracking(sessionId)
+            console.log(`Stopped tracking session ${sessionId}`)
           } catch (error) {
             console.error('Failed to send cancellation request:', error)
           }
@@ -353,6 +356,68 @@ const ChatWindow = () => {
     }
   }, [currentConversation, conversationFiles])
 
+  // Add the finished output to the conversation and clear the workflow
+  const showFinalResult = (resultData, convId) => {
+    // Add assistant message with results
+    const assistantMessage = {
+      id: generateId(),
+      role: 'assistant',
+      content: resultData.message || '',  // Empty string to not show success message
+      slides: resultData.slides || [],
+      pptUrl: resultData.ppt_url || null,
+      posterUrl: resultData.poster_url || null,
+      config: { content, style, output, length, density, fastMode },
+      timestamp: new Date().toISOString()
+    }
+    
+    addMessage(convId, assistantMessage)
+    
+    // Add generated output to conversation (check for duplicates first)
+    const conv = conversations.find(c => c.id === convId)
+    const generatedOutput = {
+      id: generateId(),
+      outputType: output,
+      style: style,
+      content: content,
+      length: output === 'slides' ? length : undefined,
+      density: output === 'poster' ? density : undefined,
+      pptUrl: resultData.ppt_url || null,
+      posterUrl: resultData.poster_url || null,
+      slides: resultData.slides || [],
+      sourceFiles: (conv?.files || []).map(f => f.name),
+      timestamp: new Date().toISOString()
+    }
+    
+    setConversations(prev => prev.map(conv => {
+      if (conv.id === convId) {
+        // Check if this output already exists (based on pptUrl/posterUrl)
+        const existingOutputs = conv.generatedOutputs || []
+        const isDuplicate = existingOutputs.some(existing => {
+          // Check if URLs match (for either ppt or poster)
+          const samePptUrl = existing.pptUrl && generatedOutput.pptUrl && existing.pptUrl === generatedOutput.pptUrl
+          const samePosterUrl = existing.posterUrl && generatedOutput.posterUrl && existing.posterUrl === generatedOutput.posterUrl
+          return samePptUrl || samePosterUrl
+        })
+        
+        if (isDuplicate) {
+          console.log('Duplicate output detected, skipping...')
+          return conv
+        }
+        
+        return {
+          ...conv,
+          generatedOutputs: [...existingOutputs, generatedOutput],
+          updatedAt: new Date().toISOString()
+        }
+      }
+      return conv
+    }))
+    
+    // Clear workflow and loading immediately
+    setCurrentWorkflow(null)
+    setIsLoading(false)
+  }
+
   // Fetch final result when pipeline completes
   const fetchFinalResult = async (sessionId, convId) => {
     // Prevent duplicate calls for the same session
@@ -367,68 +432,10 @@ const ChatWindow = () => {
       const resultResponse = await fetch(`/api/result/${sessionId}`)
       if (resultResponse.ok) {
         const resultData = await resultResponse.json()
-        
-        // Add assistant message with results
-        const assistantMessage = {
-          id: generateId(),
-          role: 'assistant',
-          content: resultData.message || '',  // Empty string to not show success message
-          slides: resultData.slides || [],
-          pptUrl: resultData.ppt_url || null,
-          posterUrl: resultData.poster_url || null,
-          config: { content, style, output, length, density, fastMode },
-          timestamp: new Date().toISOString()
-        }
-        
-        addMessage(convId, assistantMessage)
-        
-        // Add generated output to conversation (check for duplicates first)
-        const conv = conversations.find(c => c.id === convId)
-        const generatedOutput = {
-          id: generateId(),
-          outputType: output,
-          style: style,
-          content: content,
-          length: output === 'slides' ? length : undefined,
-          density: output === 'poster' ? density : undefined,
-          pptUrl: resultData.ppt_url || null,
-          posterUrl: resultData.poster_url || null,
-          slides: resultData.slides || [],
-          sourceFiles: (conv?.files || []).map(f => f.name),
-          timestamp: new Date().toISOString()
-        }
-        
-        setConversations(prev => prev.map(conv => {
-          if (conv.id === convId) {
-            // Check if this output already exists (based on pptUrl/posterUrl)
-            const existingOutputs = conv.generatedOutputs || []
-            const isDuplicate = existingOutputs.some(existing => {
-              // Check if URLs match (for either ppt or poster)
-              const samePptUrl = existing.pptUrl && generatedOutput.pptUrl && existing.pptUrl === generatedOutput.pptUrl
-              const samePosterUrl = existing.posterUrl && generatedOutput.posterUrl && existing.posterUrl === generatedOutput.posterUrl
-              return samePptUrl || samePosterUrl
-            })
-            
-            if (isDuplicate) {
-              console.log('Duplicate output detected, skipping...')
-              return conv
-            }
-            
-            return {
-              ...conv,
-              generatedOutputs: [...existingOutputs, generatedOutput],
-              updatedAt: new Date().toISOString()
-            }
-          }
-          return conv
-        }))
+        showFinalResult(resultData, convId)
         
         // Remove from fetching set after successful completion
         fetchingResultsRef.current.delete(sessionId)
-        
-        // Clear workflow and loading immediately
-        setCurrentWorkflow(null)
-        setIsLoading(false)
       } else if (resultResponse.status === 202) {
         // Still processing, wait a bit and try again
         console.log('Result not ready yet, retrying...')
@@ -455,6 +462,185 @@ const ChatWindow = () => {
     }
   }
 
+  // Map backend stage statuses onto the workflow panel
+  const applyStageStatuses = (stages, extra = {}) => {
+    setCurrentWorkflow(prev => {
+      // Don't clear workflow if prev is null - keep the last known state
+      // This can happen if there's a race condition with state updates
+      if (!prev) {
+        console.warn('Workflow state is null during progress update, skipping update')
+        return prev
+      }
+      
+      const newStages = prev.stages.map(stage => {
+        const backendStatus = stages[stage.id]
+        if (backendStatus === undefined) return stage
+        let status = 'pending'
+        if (backendStatus === 'completed') status = 'completed'
+        else if (backendStatus === 'running') status = 'active'
+        else if (backendStatus === 'failed') status = 'failed'
+        return { ...stage, status }
+      })
+      
+      // Determine current step
+      const activeStage = newStages.find(s => s.status === 'active')
+      const currentStep = activeStage ? `${activeStage.name}: ${activeStage.description}` : 'Processing...'
+      
+      return {
+        ...prev,
+        stages: newStages,
+        currentStep: currentStep,
+        ...extra
+      }
+    })
+  }
+
+  const showGenerationError = (error, convId) => {
+    const errorMessage = {
+      id: generateId(),
+      role: 'assistant',
+      content: `Generation failed: ${error || 'Unknown error occurred'}`,
+      isError: true,
+      timestamp: new Date().toISOString()
+    }
+    addMessage(convId, errorMessage)
+    setCurrentWorkflow(null)
+    setIsLoading(false)
+  }
+
+  // Stop streaming/polling progress for a session
+  const stopTracking = (sessionId) => {
+    const source = eventSourcesRef.current.get(sessionId)
+    if (source) {
+      source.close()
+      eventSourcesRef.current.delete(sessionId)
+    }
+    const intervalId = pollIntervalsRef.current.get(sessionId)
+    if (intervalId) {
+      clearInterval(intervalId)
+      pollIntervalsRef.current.delete(sessionId)
+    }
+  }
+
+  // Poll /api/status (fallback when the event stream is unavailable)
+  const startPolling = (sessionId, convId) => {
+    // Clear any existing polling for this session
+    if (pollIntervalsRef.current.has(sessionId)) {
+      clearInterval(pollIntervalsRef.current.get(sessionId))
+    }
+    
+    const statusPollInterval = setInterval(async () => {
+      try {
+        const statusResponse = await fetch(`/api/status/${sessionId}`)
+        if (statusResponse.ok) {
+          const statusData = await statusResponse.json()
+          const stages = statusData.stages || {}
+          
+          console.log('[Status Poll]', sessionId.substring(0, 8), 'stages:', stages)
+          
+          if (statusData.status === 'queued') {
+            setCurrentWorkflow(prev => prev && { ...prev, currentStep: `Queued (position ${statusData.queue_position})` })
+            return
+          }
+          applyStageStatuses(stages, { error: statusData.error })
+          
+          // Check if all completed or any failed
+          const allCompleted = Object.values(stages).every(s => s === 'completed')
+          const anyFailed = Object.values(stages).some(s => s === 'failed')
+          
+          if (allCompleted || anyFailed) {
+            // Clear only this session's polling interval FIRST
+            stopTracking(sessionId)
+            console.log(`Stopped polling for session ${sessionId.substring(0, 8)}`)
+            
+            // If all completed, fetch the final result (only if not already fetching)
+            if (allCompleted && !fetchingResultsRef.current.has(sessionId)) {
+              fetchFinalResult(sessionId, convId)
+            } else if (anyFailed) {
+              showGenerationError(statusData.error, convId)
+            }
+          }
+        }
+      } catch (err) {
+        console.error('Error polling status:', err)
+      }
+    }, 1500) // Poll every 1.5 seconds
+    
+    // Store interval for this specific session
+    pollIntervalsRef.current.set(sessionId, statusPollInterval)
+  }
+
+  // Follow a session's progress via Server-Sent Events; slides are shown as soon as they are saved
+  const trackSession = (sessionId, convId) => {
+    stopTracking(sessionId)
+    
+    if (typeof EventSource === 'undefined') {
+      startPolling(sessionId, convId)
+      return
+    }
+    
+    const source = new EventSource(`/api/events/${sessionId}`)
+    eventSourcesRef.current.set(sessionId, source)
+    let finished = false
+    const parse = (e) => JSON.parse(e.data)
+    
+    source.addEventListener('queued', (e) => {
+      const { position } = parse(e)
+      setCurrentWorkflow(prev => prev && { ...prev, currentStep: `Queued (position ${position})` })
+    })
+    source.addEventListener('started', () => {
+      setCurrentWorkflow(prev => prev && { ...prev, currentStep: 'Initializing...' })
+    })
+    source.addEventListener('stages', (e) => {
+      applyStageStatuses(parse(e).stages)
+    })
+    source.addEventListener('stage', (e) => {
+      const event = parse(e)
+      applyStageStatuses({ [event.stage]: event.status }, event.error ? { error: event.error } : {})
+      if (event.status === 'failed') {
+        finished = true
+        stopTracking(sessionId)
+        showGenerationError(event.error, convId)
+      }
+    })
+    source.addEventListener('slide', (e) => {
+      const event = parse(e)
+      setCurrentWorkflow(prev => {
+        if (!prev) return prev
+        const slides = [...(prev.slides || []).filter(s => s.index !== event.index), {
+          index: event.index,
+          title: `Slide ${event.index + 1}`,
+          imageUrl: event.image_url
+        }].sort((a, b) => a.index - b.index)
+        const stages = prev.stages.map(stage => (
+          stage.id === 'generate' ? { ...stage, details: `${slides.length}/${event.total} ready` } : stage
+        ))
+        return { ...prev, slides, stages }
+      })
+    })
+    source.addEventListener('done', (e) => {
+      finished = true
+      stopTracking(sessionId)
+      if (!fetchingResultsRef.current.has(sessionId)) {
+        showFinalResult(parse(e).result, convId)
+      }
+    })
+    // Named 'error' events carry a payload; connection errors do not
+    source.addEventListener('error', (e) => {
+      if (finished) return
+      if (e.data) {
+        finished = true
+        stopTracking(sessionId)
+        showGenerationError(parse(e).error, convId)
+        return
+      }
+      // Stream unavailable (e.g. proxy without SSE support) - fall back to polling
+      console.warn(`Event stream lost for session ${sessionId.substring(0, 8)}, falling back to polling`)
+      stopTracking(sessionId)
+      startPolling(sessionId, convId)
+    })
+  }
+
   const handleSendMessage = async (text, files) => {
     if (!text.trim() && files.length === 0) return
 
@@ -594,90 +780,9 @@ const ChatWindow = () => {
       // Get session_id from response
       const sessionId = data.session_id
       
-      // Start polling for status updates
+      // Follow progress (streamed events, polling as fallback)
       if (sessionId) {
-        // Clear any existing polling for this session
-        if (pollIntervalsRef.current.has(sessionId)) {
-          clearInterval(pollIntervalsRef.current.get(sessionId))
-        }
-        
-        const statusPollInterval = setInterval(async () => {
-          try {
-            const statusResponse = await fetch(`/api/status/${sessionId}`)
-            if (statusResponse.ok) {
-              const statusData = await statusResponse.json()
-              const stages = statusData.stages || {}
-              
-              console.log('[Status Poll]', sessionId.substring(0, 8), 'stages:', stages)
-              
-              // Update workflow based on backend stages
-              setCurrentWorkflow(prev => {
-                // Don't clear workflow if prev is null - keep the last known state
-                // This can happen if there's a race condition with state updates
-                if (!prev) {
-                  console.warn('Workflow state is null during polling, skipping update')
-                  return prev
-                }
-                
-                const newStages = prev.stages.map(stage => {
-                  const backendStatus = stages[stage.id]
-                  let status = 'pending'
-                  if (backendStatus === 'completed') status = 'completed'
-                  else if (backendStatus === 'running') status = 'active'
-                  else if (backendStatus === 'failed') status = 'failed'
-                  return { ...stage, status }
-                })
-                
-                // Determine current step
-                const activeStage = newStages.find(s => s.status === 'active')
-                const currentStep = activeStage ? `${activeStage.name}: ${activeStage.description}` : 'Processing...'
-                
-                return {
-                  ...prev,
-                  stages: newStages,
-                  currentStep: currentStep,
-                  error: statusData.error
-                }
-              })
-              
-              // Check if all completed or any failed
-              const allCompleted = Object.values(stages).every(s => s === 'completed')
-              const anyFailed = Object.values(stages).some(s => s === 'failed')
-              
-              if (allCompleted || anyFailed) {
-                // Clear only this session's polling interval FIRST
-                const intervalId = pollIntervalsRef.current.get(sessionId)
-                if (intervalId) {
-                  clearInterval(intervalId)
-                  pollIntervalsRef.current.delete(sessionId)
-                  console.log(`Stopped polling for session ${sessionId.substring(0, 8)}`)
-                }
-                
-                // If all completed, fetch the final result (only if not already fetching)
-                if (allCompleted && !fetchingResultsRef.current.has(sessionId)) {
-                  fetchFinalResult(sessionId, convId)
-                } else if (anyFailed) {
-                  // If failed, add error message and clear workflow
-                  const errorMessage = {
-                    id: generateId(),
-                    role: 'assistant',
-                    content: `Generation failed: ${statusData.error || 'Unknown error occurred'}`,
-                    isError: true,
-                    timestamp: new Date().toISOString()
-                  }
-                  addMessage(convId, errorMessage)
-                  setCurrentWorkflow(null)
-                  setIsLoading(false)
-                }
-              }
-            }
-          } catch (err) {
-            console.error('Error polling status:', err)
-          }
-        }, 1500) // Poll every 1.5 seconds
-        
-        // Store interval for this specific session
-        pollIntervalsRef.current.set(sessionId, statusPollInterval)
+        trackSession(sessionId, convId)
       }
 
       // Update conversation files and messages with URLs from backend
@@ -849,91 +954,9 @@ const ChatWindow = () => {
 
       const data = await response.json()
       
-      // Start polling for status updates using the sessionId
-      // Note: Don't clear the interval here! Let it run until all stages complete
+      // Follow progress (streamed events, polling as fallback)
       if (sessionId) {
-        // Clear any existing polling for this session
-        if (pollIntervalsRef.current.has(sessionId)) {
-          clearInterval(pollIntervalsRef.current.get(sessionId))
-        }
-        
-        const statusPollInterval = setInterval(async () => {
-          try {
-            const statusResponse = await fetch(`/api/status/${sessionId}`)
-            if (statusResponse.ok) {
-              const statusData = await statusResponse.json()
-              const stages = statusData.stages || {}
-              
-              console.log('[Regenerate Status Poll]', sessionId.substring(0, 8), 'stages:', stages)
-              
-              // Update workflow based on backend stages
-              setCurrentWorkflow(prev => {
-                // Don't clear workflow if prev is null - keep the last known state
-                // This can happen if there's a race condition with state updates
-                if (!prev) {
-                  console.warn('Workflow state is null during polling, skipping update')
-                  return prev
-                }
-                
-                const newStages = prev.stages.map(stage => {
-                  const backendStatus = stages[stage.id]
-                  let status = 'pending'
-                  if (backendStatus === 'completed') status = 'completed'
-                  else if (backendStatus === 'running') status = 'active'
-                  else if (backendStatus === 'failed') status = 'failed'
-                  return { ...stage, status }
-                })
-                
-                // Determine current step
-                const activeStage = newStages.find(s => s.status === 'active')
-                const currentStep = activeStage ? `${activeStage.name}: ${activeStage.description}` : 'Processing...'
-                
-                return {
-                  ...prev,
-                  stages: newStages,
-                  currentStep: currentStep,
-                  error: statusData.error
-                }
-              })
-              
-              // Check if all completed or any failed
-              const allCompleted = Object.values(stages).every(s => s === 'completed')
-              const anyFailed = Object.values(stages).some(s => s === 'failed')
-              
-              if (allCompleted || anyFailed) {
-                // Clear only this session's polling interval FIRST
-                const intervalId = pollIntervalsRef.current.get(sessionId)
-                if (intervalId) {
-                  clearInterval(intervalId)
-                  pollIntervalsRef.current.delete(sessionId)
-                  console.log(`Stopped polling for session ${sessionId.substring(0, 8)}`)
-                }
-                
-                // If all completed, fetch the final result (only if not already fetching)
-                if (allCompleted && !fetchingResultsRef.current.has(sessionId)) {
-                  fetchFinalResult(sessionId, currentConversationId)
-                } else if (anyFailed) {
-                  // If failed, add error message and clear workflow
-                  const errorMessage = {
-                    id: generateId(),
-                    role: 'assistant',
-                    content: `Generation failed: ${statusData.error || 'Unknown error occurred'}`,
-                    isError: true,
-                    timestamp: new Date().toISOString()
-                  }
-                  addMessage(currentConversationId, errorMessage)
-                  setCurrentWorkflow(null)
-                  setIsLoading(false)
-                }
-              }
-            }
-          } catch (err) {
-            console.error('Error polling status:', err)
-          }
-        }, 1500) // Poll every 1.5 seconds
-        
-        // Store interval for this specific session
-        pollIntervalsRef.current.set(sessionId, statusPollInterval)
+        trackSession(sessionId, currentConversationId)
       }
 
     } catch (error) {
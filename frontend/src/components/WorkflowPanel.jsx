@@ -165,6 +165,27 @@ const WorkflowPanel = ({ currentWorkflow, isLoading }) => {
               </div>
             </div>
 
+            {/* Slides streamed in as soon as they are saved */}
+            {workflow?.slides?.length > 0 && (
+              <div className="space-y-2">
+                <h3 className="text-xs font-semibold text-gray-700 dark:text-gray-300 uppercase tracking-wide">
+                  Ready
+                </h3>
+                <div className="grid grid-cols-2 gap-2">
+                  {workflow.slides.map((slide) => (
+                    <a key={slide.index} href={slide.imageUrl} target="_blank" rel="noopener noreferrer">
+                      <img
+                        src={slide.imageUrl}
+                        alt={slide.title}
+                        loading="lazy"
+                        className="w-full rounded border border-gray-200 dark:border-gray-700"
+                      />
+                    </a>
+                  ))}
+                </div>
+              </div>
+            )}
+
             {/* Additional Info */}
             {workflow && workflow.currentStep && (
               <div className="mt-4 pt-4 border-t border-gray-200 dark:border-gray-800">
@@ -16,7 +16,7 @@ export default defineConfig({
         proxyTimeout: 300000, 
         configure: (proxy, options) => {
           proxy.on('proxyReq', (proxyReq, req, res) => {
-            if (req.url.includes('/api/chat')) {
+            if (req.url.includes('/api/chat') || req.url.includes('/api/events')) {
               proxyReq.setTimeout(0)
             }
           })
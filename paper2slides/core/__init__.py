@@ -17,8 +17,13 @@ from .state import (
     save_state,
     create_state,
     detect_start_stage,
+    publish_checkpoint,
 )
-from .pipeline import run_pipeline, list_outputs
+from .checkpoint_store import CheckpointStore, get_checkpoint_store, get_stage_keys, hash_input
+from .pipeline import run_pipeline, run_stage, list_outputs
+from .batch import BatchDocument, run_batch_pipeline, DEFAULT_STAGE_WORKERS
+from .scheduler import JobScheduler, SchedulerLimits, STAGE_POOLS
+from .events import EventBus, EventCallback, TERMINAL_EVENTS
 
 __all__ = [
     # Path functions
@@ -36,8 +41,26 @@ __all__ = [
     "save_state",
     "create_state",
     "detect_start_stage",
+    "publish_checkpoint",
+    # Content-addressed checkpoint store
+    "CheckpointStore",
+    "get_checkpoint_store",
+    "get_stage_keys",
+    "hash_input",
     # Pipeline
     "run_pipeline",
+    "run_stage",
     "list_outputs",
+    "BatchDocument",
+    "run_batch_pipeline",
+    "DEFAULT_STAGE_WORKERS",
+    # Scheduling
+    "JobScheduler",
+    "SchedulerLimits",
+    "STAGE_POOLS",
+    # Progress events
+    "EventBus",
+    "EventCallback",
+    "TERMINAL_EVENTS",
 ]
 
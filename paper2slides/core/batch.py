@@ -0,0 +1,213 @@
+"""
+Multi-document pipeline runner
+
+Each stage is a pool of async workers; stages are joined by bounded queues,
+so parsing of document N+1 overlaps with planning/generation of document N.
+A full downstream queue blocks upstream workers (backpressure).
+"""
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils.metrics import RunMetrics
+from .state import STAGES, load_state, save_state, create_state
+from .pipeline import run_stage
+
+logger = logging.getLogger(__name__)
+
+# Default workers per stage: parsing is CPU/GPU heavy, summary/plan are
+# LLM-bound, generation is bound by image-generation quota.
+DEFAULT_STAGE_WORKERS: Dict[str, int] = {
+    "rag": 1,
+    "summary": 2,
+    "plan": 2,
+    "generate": 1,
+}
+
+_DONE = object()
+
+
+@dataclass
+class BatchDocument:
+    """One document in a batch run."""
+    name: str
+    base_dir: Path
+    config_dir: Path
+    config: Dict[str, Any]
+    from_stage: str = "rag"
+    status: str = "pending"
+    error: Optional[str] = None
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    enqueued_at: float = 0.0
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+
+
+@dataclass
+class StageMetrics:
+    """Throughput counters for one stage."""
+    workers: int = 0
+    processed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    busy_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    max_queue_depth: int = 0
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.last_end - self.first_start) if self.first_start and self.last_end else 0.0
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "avg_seconds": round(self.busy_seconds / self.processed, 2) if self.processed else 0.0,
+            "avg_queue_wait_seconds": round(self.wait_seconds / max(1, self.processed + self.failed), 2),
+            "max_queue_depth": self.max_queue_depth,
+            "utilization": round(self.busy_seconds / (elapsed * self.workers), 3) if elapsed and self.workers else 0.0,
+            "docs_per_hour": round(self.processed * 3600 / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+def _mark_state(doc: BatchDocument, stage: str, status: str, error: Optional[str] = None):
+    state = load_state(doc.config_dir) or create_state(doc.config)
+    state["stages"][stage] = status
+    if error:
+        state["error"] = error
+    state["metrics"] = doc.metrics.to_dict()
+    save_state(doc.config_dir, state)
+
+
+async def run_batch_pipeline(
+    documents: List[BatchDocument],
+    stage_workers: Optional[Dict[str, int]] = None,
+    queue_size: int = 2,
+) -> Dict[str, Any]:
+    """Run several documents through the pipeline with stage-level overlap.
+
+    Args:
+        documents: Documents to process (each with its own base/config dirs)
+        stage_workers: Workers per stage, defaults to DEFAULT_STAGE_WORKERS
+        queue_size: Capacity of each inter-stage queue (backpressure bound)
+
+    Returns:
+        Dict with per-stage metrics and per-document results
+    """
+    workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+    queues = [asyncio.Queue(maxsize=max(1, queue_size)) for _ in STAGES]
+    metrics = {stage: StageMetrics(workers=max(1, workers[stage])) for stage in STAGES}
+    started = time.time()
+
+    # Reset state of stages each document will run
+    for doc in documents:
+        state = load_state(doc.config_dir) or create_state(doc.config)
+        for stage in STAGES[STAGES.index(doc.from_stage):]:
+            state["stages"][stage] = "pending"
+        save_state(doc.config_dir, state)
+
+    async def worker(index: int, stage: str):
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(STAGES) else None
+        stats = metrics[stage]
+        while True:
+            doc = await inbox.get()
+            if doc is _DONE:
+                inbox.task_done()
+                return
+            try:
+                if doc.status == "failed" or STAGES.index(doc.from_stage) > index:
+                    stats.skipped += 1
+                else:
+                    queue_wait = time.time() - doc.enqueued_at
+                    stats.wait_seconds += queue_wait
+                    t0 = time.time()
+                    stats.first_start = stats.first_start or t0
+                    _mark_state(doc, stage, "running")
+                    logger.info(f"[{doc.name}] {stage} started")
+                    try:
+                        await run_stage(stage, doc.base_dir, doc.config_dir, doc.config, metrics=doc.metrics)
+                        doc.metrics.record_stage(stage, "completed", time.time() - t0, queue_wait)
+                        _mark_state(doc, stage, "completed")
+                        stats.processed += 1
+                    except Exception as e:
+                        doc.status = "failed"
+                        doc.error = f"{stage}: {e}"
+                        doc.metrics.record_stage(stage, "failed", time.time() - t0, queue_wait)
+                        _mark_state(doc, stage, "failed", str(e))
+                        stats.failed += 1
+                        logger.error(f"[{doc.name}] {stage} failed: {e}", exc_info=True)
+                    elapsed = time.time() - t0
+                    doc.stage_seconds[stage] = round(elapsed, 2)
+                    stats.busy_seconds += elapsed
+                    stats.last_end = time.time()
+                    logger.info(f"[{doc.name}] {stage} finished in {elapsed:.1f}s")
+
+                if outbox is not None:
+                    doc.enqueued_at = time.time()
+                    await outbox.put(doc)  # blocks while downstream is saturated
+                    next_stats = metrics[STAGES[index + 1]]
+                    next_stats.max_queue_depth = max(next_stats.max_queue_depth, outbox.qsize())
+                elif doc.status != "failed":
+                    doc.status = "completed"
+            finally:
+                inbox.task_done()
+
+    async def feed():
+        for doc in documents:
+            doc.enqueued_at = time.time()
+            await queues[0].put(doc)
+            metrics[STAGES[0]].max_queue_depth = max(metrics[STAGES[0]].max_queue_depth, queues[0].qsize())
+
+    pools = [
+        [asyncio.create_task(worker(i, stage)) for _ in range(metrics[stage].workers)]
+        for i, stage in enumerate(STAGES)
+    ]
+
+    try:
+        await feed()
+        # Drain stage by stage, then stop that stage's workers
+        for i, stage in enumerate(STAGES):
+            await queues[i].join()
+            for _ in pools[i]:
+                await queues[i].put(_DONE)
+            await asyncio.gather(*pools[i])
+    finally:
+        for pool in pools:
+            for task in pool:
+                task.cancel()
+
+    total = time.time() - started
+    completed = sum(1 for d in documents if d.status == "completed")
+    result = {
+        "total_seconds": round(total, 2),
+        "documents": len(documents),
+        "completed": completed,
+        "failed": len(documents) - completed,
+        "docs_per_hour": round(completed * 3600 / total, 2) if total else 0.0,
+        "stages": {stage: metrics[stage].to_dict() for stage in STAGES},
+        "results": [
+            {
+                "name": d.name,
+                "status": d.status,
+                "error": d.error,
+                "stage_seconds": d.stage_seconds,
+                "config_dir": str(d.config_dir),
+            }
+            for d in documents
+        ],
+    }
+
+    logger.info("")
+    logger.info(f"Batch finished: {completed}/{len(documents)} completed in {total:.1f}s")
+    for stage in STAGES:
+        m = result["stages"][stage]
+        logger.info(
+            f"  {stage:<9} workers={m['workers']} done={m['processed']} failed={m['failed']} "
+            f"avg={m['avg_seconds']}s util={m['utilization']:.0%} max_queue={m['max_queue_depth']}"
+        )
+    return result
@@ -0,0 +1,152 @@
+"""
+Content-addressed checkpoint store
+
+Stage checkpoints are keyed by the SHA-256 of the input bytes plus the config
+fields that affect that stage, so identical work is shared across projects,
+sessions and re-uploads regardless of file name.
+
+Layout: <root>/<stage>/<key[:2]>/<key>.json
+"""
+import os
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from ..utils import load_json, save_json, save_text
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every stored checkpoint after incompatible changes
+STORE_VERSION = 1
+
+# Stages whose checkpoints are shareable (generate output is per run)
+STORE_STAGES = ["rag", "summary", "plan"]
+
+# Config fields that change each stage's output (on top of upstream key)
+STAGE_CONFIG_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "rag": ("content_type", "fast_mode"),
+    "summary": (),
+    "plan": (
+        "output_type", "style", "custom_style", "slides_length",
+        "poster_density", "poster_format", "language",
+    ),
+}
+
+# Environment settings that change each stage's output
+STAGE_ENV_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "rag": ("PARSER", "PARSE_METHOD", "LLM_MODEL", "EMBEDDING_MODEL"),
+    "summary": (),
+    "plan": (),
+}
+
+_HASH_CHUNK = 1024 * 1024
+_hash_cache: Dict[Tuple[str, int, int], str] = {}
+_hash_lock = threading.Lock()
+
+
+def hash_file(path: Path) -> str:
+    """Streaming SHA-256 of a file, memoized by (path, size, mtime)."""
+    stat = path.stat()
+    cache_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _hash_lock:
+        cached = _hash_cache.get(cache_key)
+    if cached:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    result = digest.hexdigest()
+    with _hash_lock:
+        _hash_cache[cache_key] = result
+    return result
+
+
+def hash_input(input_path: str) -> str:
+    """SHA-256 over input bytes. Directories hash (relative path, file hash) pairs."""
+    path = Path(input_path)
+    if path.is_file():
+        return hash_file(path)
+
+    digest = hashlib.sha256()
+    for file_path in sorted(p for p in path.rglob("*") if p.is_file()):
+        rel = file_path.relative_to(path)
+        if any(part.startswith(".") for part in rel.parts):
+            continue
+        digest.update(rel.as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(hash_file(file_path).encode("ascii"))
+    return digest.hexdigest()
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def get_stage_keys(config: Dict) -> Dict[str, str]:
+    """Compute the content-addressed key for each shareable stage.
+
+    Each key chains the upstream stage key, so a change upstream
+    invalidates everything downstream.
+    """
+    keys = {}
+    upstream = hash_input(config["input_path"])
+    for stage in STORE_STAGES:
+        payload = {
+            "version": STORE_VERSION,
+            "stage": stage,
+            "upstream": upstream,
+            "config": {f: config.get(f) for f in STAGE_CONFIG_FIELDS[stage]},
+            "env": {f: os.getenv(f) for f in STAGE_ENV_FIELDS[stage]},
+        }
+        upstream = keys[stage] = _digest(payload)
+    return keys
+
+
+class CheckpointStore:
+    """Content-addressed stage checkpoints shared across projects."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.root / stage / key[:2] / f"{key}.json"
+
+    def get(self, stage: str, key: str) -> Optional[Dict]:
+        """Load a stored checkpoint, or None if missing or no longer valid."""
+        entry = load_json(self.path(stage, key))
+        if not entry:
+            return None
+        checkpoint = entry.get("checkpoint") or {}
+        # Parsed artifacts live in the producing project's rag_output
+        missing = [p for p in checkpoint.get("markdown_paths", []) if not Path(p).exists()]
+        if missing:
+            logger.info(f"Stored {stage} checkpoint {key[:12]} is stale ({len(missing)} missing file(s))")
+            return None
+        return entry
+
+    def put(self, stage: str, key: str, checkpoint: Dict, files: Optional[Dict[str, str]] = None):
+        """Store a stage checkpoint (and small text side files such as summary.md)."""
+        save_json(self.path(stage, key), {
+            "stage": stage,
+            "key": key,
+            "created_at": datetime.now().isoformat(),
+            "checkpoint": checkpoint,
+            "files": files or {},
+        })
+
+
+def get_checkpoint_store(base_dir: Path) -> CheckpointStore:
+    """Store shared by every project under the same output directory.
+
+    base_dir is <output_dir>/<project>/<content_type>; CHECKPOINT_STORE_DIR
+    overrides the location (e.g. to share across output directories).
+    """
+    root = os.getenv("CHECKPOINT_STORE_DIR") or Path(base_dir).parent.parent / ".cas"
+    return CheckpointStore(Path(root))
@@ -0,0 +1,140 @@
+"""
+Progress events - in-process pub/sub for pipeline progress
+
+Producers (run_pipeline, the generate stage save callback) publish small
+dict events to a channel (the session ID); consumers such as the API's SSE
+endpoint subscribe and receive the channel history followed by live events,
+so a late subscriber still sees every stage transition and saved slide.
+"""
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Event types that end a channel's stream
+TERMINAL_EVENTS = ("done", "error")
+
+# Callback signature used by the pipeline to report progress
+EventCallback = Callable[[Dict[str, Any]], None]
+
+
+class _Channel:
+    def __init__(self, max_history: int):
+        self.history: deque = deque(maxlen=max_history)
+        self.subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self.seq = 0
+        self.closed = False
+
+
+class EventBus:
+    """Per-channel event history plus live fan-out to subscribers.
+
+    publish() may be called from any thread or event loop: events are handed
+    to each subscriber's own loop with call_soon_threadsafe. Pipeline stages
+    (including slide events from the async image providers) publish from
+    the event loop they run on, which need not be the subscriber's.
+    """
+
+    def __init__(self, max_history: int = 500, max_channels: int = 200):
+        self.max_history = max_history
+        self.max_channels = max_channels
+        self._channels: Dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+
+    def _get_channel(self, channel: str) -> _Channel:
+        ch = self._channels.get(channel)
+        if ch is None:
+            ch = self._channels[channel] = _Channel(self.max_history)
+            self._prune()
+        return ch
+
+    def _prune(self):
+        """Drop the oldest finished channels without subscribers."""
+        excess = len(self._channels) - self.max_channels
+        if excess <= 0:
+            return
+        for name in [n for n, ch in self._channels.items() if ch.closed and not ch.subscribers][:excess]:
+            del self._channels[name]
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Append an event to the channel and deliver it to live subscribers."""
+        with self._lock:
+            ch = self._get_channel(channel)
+            ch.seq += 1
+            event = {**event, "seq": ch.seq, "ts": time.time()}
+            ch.history.append(event)
+            ch.closed = event.get("type") in TERMINAL_EVENTS
+            subscribers = list(ch.subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Subscriber's loop is closed
+                pass
+        return event
+
+    def reset(self, channel: str):
+        """Start a fresh stream for a channel (e.g. when a session is resubmitted)."""
+        with self._lock:
+            ch = self._channels.get(channel)
+            if ch is not None:
+                ch.history.clear()
+                ch.closed = False
+
+    def has_channel(self, channel: str) -> bool:
+        return channel in self._channels
+
+    def history(self, channel: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            ch = self._channels.get(channel)
+            return list(ch.history) if ch else []
+
+    async def subscribe(
+        self,
+        channel: str,
+        keepalive: Optional[float] = None,
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield past and live events until a terminal event.
+
+        Args:
+            channel: Channel to follow
+            keepalive: If set, yield None after this many idle seconds
+                (lets transports send heartbeats)
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            ch = self._get_channel(channel)
+            backlog = list(ch.history)
+            ch.subscribers.append(entry)
+        try:
+            last_seq = 0
+            for event in backlog:
+                last_seq = event["seq"]
+                yield event
+                if event.get("type") in TERMINAL_EVENTS:
+                    return
+            while True:
+                try:
+                    if keepalive:
+                        event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                    else:
+                        event = await queue.get()
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event["seq"] <= last_seq:
+                    # Already delivered from the backlog
+                    continue
+                last_seq = event["seq"]
+                yield event
+                if event.get("type") in TERMINAL_EVENTS:
+                    return
+        finally:
+            with self._lock:
+                if entry in ch.subscribers:
+                    ch.subscribers.remove(entry)
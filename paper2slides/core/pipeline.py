@@ -1,19 +1,75 @@
 """
 Pipeline execution and output listing
 """
+import time
+import asyncio
 import logging
+import contextlib
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
-from ..utils import log_section
-from .state import STAGES, load_state, save_state, create_state
+from ..utils import log_section, figure_cache_scope, current_figure_cache
+from ..utils.metrics import RunMetrics, metrics_scope, stage_scope
+from .state import STAGES, load_state, save_state, create_state, publish_checkpoint
 from .paths import get_rag_checkpoint, get_summary_checkpoint, get_plan_checkpoint
+from .checkpoint_store import get_checkpoint_store
 from .stages import run_rag_stage, run_summary_stage, run_plan_stage, run_generate_stage
+from .events import EventCallback
 
 logger = logging.getLogger(__name__)
 
 
-async def run_pipeline(base_dir: Path, config_dir: Path, config: Dict, from_stage: str, session_id: str = None, session_manager = None):
+async def run_stage(
+    stage: str,
+    base_dir: Path,
+    config_dir: Path,
+    config: Dict,
+    on_event: Optional[EventCallback] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> Dict:
+    """Run a single pipeline stage and publish its checkpoint to the shared store.
+
+    on_event, if given, receives progress events from inside the stage
+    (currently one "slide" event per saved image in the generate stage).
+    Provider calls made by the stage are tagged with it and reported to
+    metrics, or to the collector of the enclosing metrics_scope if None.
+    Outside a figure_cache_scope (batch runs), the stage gets its own figure
+    cache backed by the checkpoint store's images directory.
+    """
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage: {stage}")
+    
+    if current_figure_cache() is None:
+        figure_scope = figure_cache_scope(get_checkpoint_store(base_dir).root / "images")
+    else:
+        figure_scope = contextlib.nullcontext()
+    run_scope = metrics_scope(metrics) if metrics is not None else contextlib.nullcontext()
+    with figure_scope, run_scope, stage_scope(stage):
+        if stage == "rag":
+            result = await run_rag_stage(base_dir, config)
+        elif stage == "summary":
+            result = await run_summary_stage(base_dir, config)
+        elif stage == "plan":
+            result = await run_plan_stage(base_dir, config_dir, config)
+        else:
+            result = await run_generate_stage(base_dir, config_dir, config, on_event=on_event)
+    
+    try:
+        publish_checkpoint(stage, base_dir, config_dir, config)
+    except Exception as e:
+        logger.warning(f"Failed to store {stage} checkpoint: {e}")
+    return result
+
+
+async def run_pipeline(
+    base_dir: Path,
+    config_dir: Path,
+    config: Dict,
+    from_stage: str,
+    session_id: str = None,
+    session_manager = None,
+    on_event: Optional[EventCallback] = None,
+):
     """Run pipeline from specified stage.
     
     Args:
@@ -22,8 +78,24 @@ async def run_pipeline(base_dir: Path, config_dir: Path, config: Dict, from_stag
         config: Pipeline configuration
         from_stage: Stage to start from
         session_id: Session ID for cancellation tracking
-        session_manager: Session manager to check cancellation status
+        session_manager: Session manager to check cancellation status; if it
+            provides stage_slot(session_id, stage), each stage runs inside it
+            (used by JobScheduler for per-stage concurrency limits)
+        on_event: Optional callback receiving progress events as they happen:
+            {"type": "stages", "stages": {...}} once at start,
+            {"type": "stage", "stage", "status"} on every transition and
+            {"type": "slide", "index", "total", "section_id", "path"} per saved image
+    
+    Stage timings, per-call metrics of LLM/image/embedding requests and cache
+    counters of this run are stored as state["metrics"] (see utils.metrics).
     """
+    def emit(event: Dict):
+        if on_event:
+            try:
+                on_event(event)
+            except Exception as e:
+                logger.warning(f"Progress event handler failed: {e}")
+    
     
     # Initialize or load state
     state = load_state(config_dir)
@@ -44,41 +116,69 @@ async def run_pipeline(base_dir: Path, config_dir: Path, config: Dict, from_stag
     start_idx = STAGES.index(from_stage)
     logger.info("")
     logger.info(f"Starting from stage: {from_stage}")
+    emit({"type": "stages", "stages": dict(state["stages"])})
+    
+    metrics = RunMetrics()
+    
+    def save():
+        state["metrics"] = metrics.to_dict()
+        save_state(config_dir, state)
     
-    for i in range(start_idx, len(STAGES)):
-        # Check if cancelled before starting each stage
-        if session_manager and session_id and session_manager.is_cancelled(session_id):
-            logger.info(f"Pipeline cancelled at stage: {STAGES[i]}")
-            state["stages"][STAGES[i]] = "cancelled"
-            state["error"] = "Cancelled by user"
-            save_state(config_dir, state)
-            raise Exception("Pipeline cancelled by user")
+    # One figure cache per run: plan and generate stages read the same figures;
+    # prepared (resized/re-encoded) figures persist next to the checkpoint store.
+    # Run metrics (stage timings, provider calls, cache hits) go to state.json.
+    with figure_cache_scope(get_checkpoint_store(base_dir).root / "images"), metrics_scope(metrics):
+        for i in range(start_idx, len(STAGES)):
+            # Check if cancelled before starting each stage
+            if session_manager and session_id and session_manager.is_cancelled(session_id):
+                logger.info(f"Pipeline cancelled at stage: {STAGES[i]}")
+                state["stages"][STAGES[i]] = "cancelled"
+                state["error"] = "Cancelled by user"
+                save()
+                emit({"type": "stage", "stage": STAGES[i], "status": "cancelled"})
+                raise Exception("Pipeline cancelled by user")
         
-        stage = STAGES[i]
-        log_section(f"STAGE: {stage.upper()}")
+            stage = STAGES[i]
         
-        state["stages"][stage] = "running"
-        save_state(config_dir, state)
+            if session_manager and session_id and hasattr(session_manager, "stage_slot"):
+                slot = session_manager.stage_slot(session_id, stage)
+            else:
+                slot = contextlib.nullcontext()
         
-        try:
-            if stage == "rag":
-                await run_rag_stage(base_dir, config)
-            elif stage == "summary":
-                await run_summary_stage(base_dir, config)
-            elif stage == "plan":
-                await run_plan_stage(base_dir, config_dir, config)
-            elif stage == "generate":
-                await run_generate_stage(base_dir, config_dir, config)
+            requested = started = time.monotonic()
+            try:
+                async with slot:
+                    started = time.monotonic()
+                    log_section(f"STAGE: {stage.upper()}")
+                
+                    state["stages"][stage] = "running"
+                    save()
+                    emit({"type": "stage", "stage": stage, "status": "running"})
+                
+                    await run_stage(stage, base_dir, config_dir, config, on_event=emit if on_event else None)
             
-            state["stages"][stage] = "completed"
-            save_state(config_dir, state)
+                metrics.record_stage(stage, "completed", time.monotonic() - started, started - requested)
+                state["stages"][stage] = "completed"
+                save()
+                emit({"type": "stage", "stage": stage, "status": "completed"})
             
-        except Exception as e:
-            state["stages"][stage] = "failed"
-            state["error"] = str(e)
-            save_state(config_dir, state)
-            logger.error(f"Stage failed: {e}", exc_info=True)
-            break
+            except asyncio.CancelledError:
+                # Cancelled mid-stage (e.g. in-flight image requests)
+                logger.info(f"Pipeline cancelled during stage: {stage}")
+                metrics.record_stage(stage, "cancelled", time.monotonic() - started, started - requested)
+                state["stages"][stage] = "cancelled"
+                state["error"] = "Cancelled by user"
+                save()
+                emit({"type": "stage", "stage": stage, "status": "cancelled"})
+                raise
+            except Exception as e:
+                metrics.record_stage(stage, "failed", time.monotonic() - started, started - requested)
+                state["stages"][stage] = "failed"
+                state["error"] = str(e)
+                save()
+                emit({"type": "stage", "stage": stage, "status": "failed", "error": str(e)})
+                logger.error(f"Stage failed: {e}", exc_info=True)
+                break
     
     # Print summary
     log_section("SUMMARY")
@@ -97,7 +197,7 @@ def list_outputs(output_dir: str):
     
     found = False
     for project_dir in sorted(output_path.iterdir()):
-        if not project_dir.is_dir():
+        if not project_dir.is_dir() or project_dir.name.startswith("."):
             continue
         
         for content_dir in sorted(project_dir.iterdir()):
@@ -0,0 +1,259 @@
+"""
+Job scheduler - queued pipeline runs with global and per-stage concurrency limits
+"""
+import os
+import time
+import asyncio
+import logging
+import itertools
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stage -> resource pool. Parsing is CPU/GPU bound, summary and plan are
+# bound by LLM quota, generate by image-generation quota.
+STAGE_POOLS: Dict[str, str] = {
+    "rag": "parse",
+    "summary": "llm",
+    "plan": "llm",
+    "generate": "image",
+}
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+@dataclass
+class SchedulerLimits:
+    """Concurrency limits for the job scheduler."""
+    max_jobs: int = 4
+    """Jobs admitted (running) at once"""
+
+    parse: int = 1
+    """Jobs allowed in the rag (parse/index) stage at once"""
+
+    llm: int = 4
+    """Jobs allowed in summary/plan stages at once"""
+
+    image: int = 2
+    """Jobs allowed in the generate stage at once"""
+
+    @classmethod
+    def from_env(cls) -> "SchedulerLimits":
+        """Load limits from MAX_CONCURRENT_JOBS / MAX_PARSE_JOBS / MAX_LLM_JOBS / MAX_IMAGE_JOBS."""
+        defaults = cls()
+        return cls(
+            max_jobs=_env_int("MAX_CONCURRENT_JOBS", defaults.max_jobs),
+            parse=_env_int("MAX_PARSE_JOBS", defaults.parse),
+            llm=_env_int("MAX_LLM_JOBS", defaults.llm),
+            image=_env_int("MAX_IMAGE_JOBS", defaults.image),
+        )
+
+    def pool_size(self, pool: str) -> int:
+        return getattr(self, pool)
+
+
+@dataclass
+class Job:
+    """A scheduled pipeline run."""
+    job_id: str
+    factory: Callable[[], Awaitable[Any]]
+    priority: int = 0
+    seq: int = 0
+    resource_key: Optional[str] = None
+    status: str = JOB_QUEUED
+    stage: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "priority": self.priority,
+            "stage": self.stage,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobScheduler:
+    """Priority/FIFO job queue with a global admission limit and per-stage pools.
+
+    Jobs are admitted in (priority desc, submission order). Jobs sharing a
+    resource_key (e.g. the same output project) never run concurrently.
+    While running, a job acquires the pool for each stage through
+    stage_slot(), so e.g. only N jobs parse at once while others are planning
+    or generating images.
+    """
+
+    def __init__(self, limits: Optional[SchedulerLimits] = None, max_history: int = 200):
+        self.limits = limits or SchedulerLimits.from_env()
+        self.max_history = max_history
+        self._jobs: Dict[str, Job] = {}
+        self._queue: List[Job] = []
+        self._running: Dict[str, Job] = {}
+        self._cancelled: set = set()
+        self._seq = itertools.count()
+        self._pools = {
+            pool: asyncio.Semaphore(self.limits.pool_size(pool))
+            for pool in set(STAGE_POOLS.values())
+        }
+
+    # ---- Submission / admission ----
+
+    def submit(
+        self,
+        job_id: str,
+        factory: Callable[[], Awaitable[Any]],
+        priority: int = 0,
+        resource_key: Optional[str] = None,
+    ) -> Job:
+        """Queue a job. Raises ValueError if a job with this ID is still active."""
+        existing = self._jobs.get(job_id)
+        if existing and existing.active:
+            raise ValueError(f"Job {job_id} is already {existing.status}")
+
+        job = Job(
+            job_id=job_id,
+            factory=factory,
+            priority=priority,
+            seq=next(self._seq),
+            resource_key=resource_key,
+        )
+        self._jobs[job_id] = job
+        self._cancelled.discard(job_id)
+        self._queue.append(job)
+        self._queue.sort(key=lambda j: (-j.priority, j.seq))
+        self._dispatch()
+        return job
+
+    def _dispatch(self):
+        """Start queued jobs while global capacity is available."""
+        while len(self._running) < self.limits.max_jobs:
+            busy_keys = {j.resource_key for j in self._running.values() if j.resource_key}
+            job = next((j for j in self._queue if j.resource_key not in busy_keys), None)
+            if job is None:
+                return
+            self._queue.remove(job)
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            self._running[job.job_id] = job
+            job.task = asyncio.get_running_loop().create_task(self._run(job))
+            logger.info(f"Job {job.job_id[:8]} started ({len(self._running)}/{self.limits.max_jobs} running, {len(self._queue)} queued)")
+
+    async def _run(self, job: Job):
+        try:
+            await job.factory()
+            job.status = JOB_CANCELLED if job.job_id in self._cancelled else JOB_COMPLETED
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+        except Exception as e:
+            job.status = JOB_CANCELLED if job.job_id in self._cancelled else JOB_FAILED
+            job.error = str(e)
+            logger.error(f"Job {job.job_id[:8]} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            job.stage = None
+            self._running.pop(job.job_id, None)
+            self._prune_history()
+            self._dispatch()
+
+    def _prune_history(self):
+        finished = [j for j in self._jobs.values() if not j.active]
+        if len(finished) <= self.max_history:
+            return
+        finished.sort(key=lambda j: j.finished_at or 0)
+        for job in finished[: len(finished) - self.max_history]:
+            self._jobs.pop(job.job_id, None)
+            self._cancelled.discard(job.job_id)
+
+    # ---- Stage pools ----
+
+    @asynccontextmanager
+    async def stage_slot(self, job_id: str, stage: str):
+        """Hold the concurrency pool for a pipeline stage."""
+        pool = STAGE_POOLS.get(stage)
+        job = self._jobs.get(job_id)
+        if pool is None:
+            yield
+            return
+        if job:
+            job.stage = f"waiting:{stage}"
+        async with self._pools[pool]:
+            if job:
+                job.stage = stage
+            yield
+
+    # ---- Cancellation ----
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns True if the job was active.
+
+        Queued jobs are dropped immediately; running jobs have their task
+        cancelled, which interrupts in-flight requests of the current stage.
+        """
+        job = self._jobs.get(job_id)
+        if not job or not job.active:
+            return False
+        self._cancelled.add(job_id)
+        if job.status == JOB_QUEUED:
+            self._queue.remove(job)
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+        elif job.task is not None:
+            job.task.cancel()
+        logger.info(f"Job {job_id[:8]} marked for cancellation")
+        return True
+
+    def is_cancelled(self, job_id: str) -> bool:
+        return job_id in self._cancelled
+
+    # ---- Introspection ----
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position in the admission queue, or None if not queued."""
+        for i, job in enumerate(self._queue, 1):
+            if job.job_id == job_id:
+                return i
+        return None
+
+    def running_jobs(self) -> List[Job]:
+        return list(self._running.values())
+
+    def queued_jobs(self) -> List[Job]:
+        return list(self._queue)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limits": {
+                "max_jobs": self.limits.max_jobs,
+                **{pool: self.limits.pool_size(pool) for pool in self._pools},
+            },
+            "running": [j.to_dict() for j in self._running.values()],
+            "queued": [j.to_dict() for j in self._queue],
+        }
@@ -2,22 +2,47 @@
 Generate Stage - Image generation
 """
 import logging
+from dataclasses import asdict
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, Optional
 
-from ...utils import load_json
+from ...utils import load_json, save_json
 from ..paths import get_summary_checkpoint, get_plan_checkpoint, get_output_dir
 
 logger = logging.getLogger(__name__)
 
+MANIFEST_NAME = "fingerprints.json"
 
-async def run_generate_stage(base_dir: Path, config_dir: Path, config: Dict) -> Dict:
-    """Stage 4: Generate images."""
+
+def _load_previous_manifest(config_dir: Path) -> Optional[Dict]:
+    """Load the image manifest of the most recent output directory, with absolute image paths."""
+    for output_dir in sorted((d for d in config_dir.iterdir() if d.is_dir()), reverse=True):
+        manifest = load_json(output_dir / MANIFEST_NAME)
+        if not manifest:
+            continue
+        for entry in manifest.get("images", {}).values():
+            entry["path"] = str(output_dir / entry.get("file", ""))
+        logger.info(f"Found previous output for incremental generation: {output_dir.name}")
+        return manifest
+    return None
+
+
+async def run_generate_stage(
+    base_dir: Path,
+    config_dir: Path,
+    config: Dict,
+    on_event: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """Stage 4: Generate images.
+
+    on_event receives a "slide" event as soon as each image is written.
+    """
     from paper2slides.summary import PaperContent, GeneralContent, TableInfo, FigureInfo, OriginalElements
     from paper2slides.generator import GenerationConfig, GenerationInput
     from paper2slides.generator.config import OutputType, PosterDensity, PosterFormat, SlidesLength, StyleType
     from paper2slides.generator.content_planner import ContentPlan, Section, TableRef, FigureRef
-    from paper2slides.generator.image_generator import ImageGenerator, save_images_as_pdf
+    from paper2slides.generator.image_generator import ImageGenerator
+    from paper2slides.generator.pdf_writer import StreamingPDFWriter
     
     plan_data = load_json(get_plan_checkpoint(config_dir))
     summary_data = load_json(get_summary_checkpoint(base_dir, config))
@@ -87,6 +112,11 @@ async def run_generate_stage(base_dir: Path, config_dir: Path, config: Dict) ->
     output_subdir.mkdir(parents=True, exist_ok=True)
     ext_map = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp"}
     
+    # Slides PDF is built page by page as images arrive (pages ordered by index)
+    output_type = config.get("output_type", "slides")
+    pdf_path = output_subdir / "slides.pdf"
+    pdf_writer = StreamingPDFWriter(pdf_path) if output_type == "slides" else None
+    
     # Save callback: save each image immediately after generation
     def save_image_callback(img, index, total):
         ext = ext_map.get(img.mime_type, ".png")
@@ -94,18 +124,57 @@ async def run_generate_stage(base_dir: Path, config_dir: Path, config: Dict) ->
         with open(filepath, "wb") as f:
             f.write(img.image_data)
         logger.info(f"  [{index+1}/{total}] Saved: {filepath.name}")
+        if pdf_writer:
+            pdf_writer.add_page(index, img.image_data, img.mime_type)
+        if on_event:
+            on_event({
+                "type": "slide",
+                "index": index,
+                "total": total,
+                "section_id": img.section_id,
+                "path": str(filepath),
+                "reused": img.reused,
+            })
+    
+    # Reuse images of unchanged sections from the previous run
+    previous = _load_previous_manifest(config_dir) if config.get("reuse_images", True) else None
     
     generator = ImageGenerator()
     max_workers = config.get("max_workers", 1)
-    images = generator.generate(plan, gen_input, max_workers=max_workers, save_callback=save_image_callback)
-    logger.info(f"  Generated {len(images)} images")
+    # Slides are requested concurrently on this event loop (max_workers in flight)
+    try:
+        images = await generator.generate(
+            plan, gen_input, max_workers=max_workers,
+            save_callback=save_image_callback, previous=previous,
+        )
+    except BaseException:
+        if pdf_writer:
+            pdf_writer.abort()
+        raise
+    reused = sum(1 for img in images if img.reused)
+    logger.info(f"  Generated {len(images) - reused} images, reused {reused} unchanged")
     
-    # Generate PDF for slides
-    output_type = config.get("output_type", "slides")
-    if output_type == "slides" and len(images) > 1:
-        pdf_path = output_subdir / "slides.pdf"
-        save_images_as_pdf(images, str(pdf_path))
-        logger.info(f"  Saved: slides.pdf")
+    save_json(output_subdir / MANIFEST_NAME, {
+        "custom_style": gen_config.custom_style,
+        "processed_style": asdict(generator.processed_style) if generator.processed_style else None,
+        "images": {
+            img.section_id: {
+                "fingerprint": img.fingerprint,
+                "file": f"{img.section_id}{ext_map.get(img.mime_type, '.png')}",
+                "mime_type": img.mime_type,
+                "reused": img.reused,
+            }
+            for img in images
+        },
+    })
+    
+    # Finish PDF for slides
+    if pdf_writer:
+        if len(images) > 1:
+            pdf_writer.close()
+            logger.info(f"  Saved: slides.pdf")
+        else:
+            pdf_writer.abort()
     
     logger.info("")
     logger.info(f"Output: {output_subdir}")
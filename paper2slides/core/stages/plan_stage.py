@@ -1,12 +1,11 @@
 """
 Plan Stage - Content planning
 """
-import os
 import logging
 from pathlib import Path
 from typing import Dict
 
-from ...utils import load_json, save_json
+from ...utils import load_json, save_json, get_async_client
 from ..paths import get_summary_checkpoint, get_plan_checkpoint
 
 logger = logging.getLogger(__name__)
@@ -59,11 +58,8 @@ async def run_plan_stage(base_dir: Path, config_dir: Path, config: Dict) -> Dict
     gen_input = GenerationInput(config=gen_config, content=content, origin=origin)
     
     logger.info("Planning content...")
-    api_key = os.getenv("RAG_LLM_API_KEY", "")
-    base_url = os.getenv("RAG_LLM_BASE_URL")
-    
-    planner = ContentPlanner(api_key=api_key, base_url=base_url, model="gpt-5.1")
-    plan = planner.plan(gen_input)
+    planner = ContentPlanner(client=get_async_client(), model="gpt-5.1")
+    plan = await planner.plan(gen_input)
     
     logger.info(f"  Generated {len(plan.sections)} sections:")
     for i, section in enumerate(plan.sections):
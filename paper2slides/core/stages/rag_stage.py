@@ -3,45 +3,19 @@ RAG Stage - Document indexing and querying
 """
 import os
 import re
-import base64
+import hashlib
 import logging
 import asyncio
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from ...utils import save_json
+from ...utils import save_json, get_async_client, chat_completion, get_figure_cache
 from ..paths import get_rag_checkpoint
 
 logger = logging.getLogger(__name__)
 
 
-def _get_image_mime_type(image_path: str) -> str:
-    """Get MIME type for image file based on extension"""
-    ext = Path(image_path).suffix.lower()
-    mime_types = {
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif',
-        '.bmp': 'image/bmp',
-        '.webp': 'image/webp',
-        '.tiff': 'image/tiff',
-        '.tif': 'image/tiff',
-    }
-    return mime_types.get(ext, 'image/jpeg')  # Default to jpeg
-
-
-def _encode_image_to_base64(image_path: str) -> str:
-    """Encode image file to base64 string"""
-    try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-        return encoded_string
-    except Exception as e:
-        logger.error(f"Failed to encode image {image_path}: {e}")
-        return ""
-
-
 def _replace_images_with_base64(markdown_content: str, markdown_base_path: str) -> Tuple[List, int]:
     """
     Replace image references in markdown with base64 encoded images, preserving position
@@ -50,6 +24,7 @@ def _replace_images_with_base64(markdown_content: str, markdown_base_path: str)
         markdown_content: Markdown text content
         markdown_base_path: Directory where markdown file is located
     """
+    cache = get_figure_cache()
     content_parts = []
     last_pos = 0
     image_count = 0
@@ -76,21 +51,20 @@ def _replace_images_with_base64(markdown_content: str, markdown_base_path: str)
         if not Path(image_path).is_absolute():
             image_path = str(Path(markdown_base_path) / image_path)
         
-        # Try to encode image
+        # Try to encode image (shared with the planner via the run's figure cache)
         if Path(image_path).exists():
-            base64_str = _encode_image_to_base64(image_path)
-            if base64_str:
-                mime_type = _get_image_mime_type(image_path)
+            asset = cache.get(image_path)
+            if asset:
                 content_parts.append({
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:{mime_type};base64,{base64_str}"
+                        "url": asset.prepared("vision").data_url
                     }
                 })
                 image_count += 1
                 logger.debug(f"Embedded image at position {match.start()}: {image_path}")
             else:
-                # If encoding fails, keep original text
+                # If reading fails, keep original text
                 content_parts.append({
                     "type": "text",
                     "text": match.group(0)
@@ -117,29 +91,80 @@ def _replace_images_with_base64(markdown_content: str, markdown_base_path: str)
     return content_parts, image_count
 
 
-async def _run_fast_queries_by_category(
-    client,
-    markdown_content: str,
-    markdown_paths: List[str],
-    queries_by_category: Dict[str, List[str]],
-    model: str = "gpt-5.1",
-    max_concurrency: int = 10,
-) -> Dict[str, List[Dict]]:
+FAST_SYSTEM_PROMPT = "You are an expert at analyzing academic papers. Answer based on the provided content."
+
+# Prompt-prefix caching modes for fast mode (RAG_PROMPT_CACHE):
+#   off       - no cache hints (default)
+#   auto      - send a stable prompt_cache_key so OpenAI-style backends route
+#               repeated prefixes to the same cache
+#   ephemeral - mark the end of the document prefix with an explicit
+#               cache_control breakpoint (Anthropic/Gemini via OpenRouter)
+PROMPT_CACHE_MODES = ("off", "auto", "ephemeral")
+
+# Upper bound on serialized request bytes in flight at once. Every concurrent
+# request is serialized separately by the HTTP client, so the document prefix
+# is what dominates peak memory.
+DEFAULT_MAX_INFLIGHT_BYTES = 256 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class DocumentPrefix:
+    """Document payload shared by every fast-mode query.
+
+    Built once per run; queries only reference ``parts`` and append their
+    own question, so the base64 images are never copied per query.
     """
-    Fast mode: Direct GPT-4o queries with markdown content and images in original positions
+    parts: Tuple[Dict[str, Any], ...]
+    image_count: int
+    size_bytes: int
+    cache_key: str
+    cache_mode: str = "off"
+
+    def build_messages(self, question_text: str) -> List[Dict[str, Any]]:
+        """Build chat messages: system prompt, document prefix, then the question"""
+        return [
+            {"role": "system", "content": FAST_SYSTEM_PROMPT},
+            {"role": "user", "content": [*self.parts, {"type": "text", "text": question_text}]},
+        ]
+
+    def request_options(self) -> Dict[str, Any]:
+        """Extra request body for the selected prompt-cache mode"""
+        if self.cache_mode == "auto":
+            return {"extra_body": {"prompt_cache_key": self.cache_key}}
+        return {}
+
+    def max_concurrency(self, requested: int, max_inflight_bytes: int) -> int:
+        """Cap concurrency so in-flight serialized requests stay within budget"""
+        if self.size_bytes <= 0:
+            return requested
+        return max(1, min(requested, max_inflight_bytes // self.size_bytes))
+
+
+def _part_size(part: Dict[str, Any]) -> int:
+    """Approximate serialized size of a content part in bytes"""
+    if part.get("type") == "image_url":
+        return len(part["image_url"]["url"])
+    return len(part.get("text", "").encode("utf-8"))
+
+
+def _get_prompt_cache_mode() -> str:
+    """Read prompt-cache mode from RAG_PROMPT_CACHE"""
+    mode = os.getenv("RAG_PROMPT_CACHE", "off").strip().lower() or "off"
+    if mode not in PROMPT_CACHE_MODES:
+        logger.warning(f"Unknown RAG_PROMPT_CACHE={mode!r}, using 'off'")
+        return "off"
+    return mode
+
+
+def _build_document_prefix(markdown_paths: List[str], cache_mode: str = "off") -> DocumentPrefix:
+    """
+    Read markdown files once and build the shared document prefix
     
     Args:
-        client: OpenAI client
-        markdown_content: Complete markdown text
         markdown_paths: List of markdown file paths
-        queries_by_category: Queries organized by category
-        model: Model to use
-        max_concurrency: Max concurrent queries
+        cache_mode: Prompt-cache mode (see PROMPT_CACHE_MODES)
     """
-    # Process all markdown files and embed images at original positions
-    logger.info("Processing markdown files and embedding images...")
-    
-    all_content_parts = []
+    parts: List[Dict[str, Any]] = [{"type": "text", "text": "# Document Content\n\n"}]
     total_images = 0
     
     for md_path in markdown_paths:
@@ -147,7 +172,7 @@ async def _run_fast_queries_by_category(
         
         # Add document separator if multiple files
         if len(markdown_paths) > 1:
-            all_content_parts.append({
+            parts.append({
                 "type": "text",
                 "text": f"\n\n=== {Path(md_path).name} ===\n\n"
             })
@@ -157,64 +182,98 @@ async def _run_fast_queries_by_category(
         
         # Replace images with base64 at original positions
         content_parts, img_count = _replace_images_with_base64(content, base_path)
-        all_content_parts.extend(content_parts)
+        parts.extend(content_parts)
         total_images += img_count
         
         logger.info(f"  {Path(md_path).name}: embedded {img_count} images")
     
-    logger.info(f"Total embedded images: {total_images}")
+    if cache_mode == "ephemeral":
+        # Breakpoint on the last prefix part; everything before it is cacheable
+        parts[-1] = {**parts[-1], "cache_control": {"type": "ephemeral"}}
     
-    semaphore = asyncio.Semaphore(max_concurrency)
+    digest = hashlib.sha256()
+    for part in parts:
+        if part.get("type") == "image_url":
+            digest.update(part["image_url"]["url"].encode("utf-8"))
+        else:
+            digest.update(part.get("text", "").encode("utf-8"))
+    
+    return DocumentPrefix(
+        parts=tuple(parts),
+        image_count=total_images,
+        size_bytes=sum(_part_size(p) for p in parts),
+        cache_key=f"p2s-{digest.hexdigest()[:32]}",
+        cache_mode=cache_mode,
+    )
+
+
+async def _run_fast_queries_by_category(
+    client,
+    markdown_content: str,
+    markdown_paths: List[str],
+    queries_by_category: Dict[str, List[str]],
+    model: str = "gpt-5.1",
+    max_concurrency: int = 10,
+    prompt_cache: Optional[str] = None,
+    max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES,
+) -> Dict[str, List[Dict]]:
+    """
+    Fast mode: Direct GPT-4o queries with markdown content and images in original positions
+    
+    Args:
+        client: AsyncOpenAI client
+        markdown_content: Complete markdown text
+        markdown_paths: List of markdown file paths
+        queries_by_category: Queries organized by category
+        model: Model to use
+        max_concurrency: Max concurrent queries
+        prompt_cache: Prompt-cache mode, defaults to RAG_PROMPT_CACHE
+        max_inflight_bytes: Budget for serialized request bytes in flight
+    """
+    # Process all markdown files and embed images at original positions
+    logger.info("Processing markdown files and embedding images...")
+    
+    cache_mode = prompt_cache if prompt_cache is not None else _get_prompt_cache_mode()
+    prefix = _build_document_prefix(markdown_paths, cache_mode=cache_mode)
+    concurrency = prefix.max_concurrency(max_concurrency, max_inflight_bytes)
+    
+    logger.info(f"Total embedded images: {prefix.image_count}")
+    logger.info(
+        f"Document prefix: {prefix.size_bytes / (1024 * 1024):.1f} MB, "
+        f"concurrency {concurrency}, prompt cache: {cache_mode}"
+    )
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    request_options = prefix.request_options()
     
     async def query_one(category: str, idx: int, query: str):
         async with semaphore:
             try:
-                system_prompt = "You are an expert at analyzing academic papers. Answer based on the provided content."
-                
-                # Build message content
-                messages = [
-                    {"role": "system", "content": system_prompt}
-                ]
-                
-                # Build user message: document first, then query at the end
-                user_content = [
-                    {
-                        "type": "text",
-                        "text": "# Document Content\n\n"
-                    }
-                ]
-                
-                # Add all content parts (text and images in original order)
-                user_content.extend(all_content_parts)
-                
-                # Add query at the end
-                user_content.append({
-                    "type": "text",
-                    "text": f"""
+                messages = prefix.build_messages(f"""
 
 # Question
 
 {query}
 
-Please provide a detailed answer based on the content and images above."""
-                })
-                
-                messages.append({
-                    "role": "user",
-                    "content": user_content
-                })
+Please provide a detailed answer based on the content and images above.""")
                 
                 # Call OpenAI API
-                response = await asyncio.to_thread(
-                    lambda: client.chat.completions.create(
-                        model=model,
-                        messages=messages,
-                        temperature=0.3,
-                    )
+                response = await chat_completion(
+                    client,
+                    model=model,
+                    messages=messages,
+                    temperature=0.3,
+                    **request_options,
                 )
                 
                 answer = response.choices[0].message.content
                 
+                usage = getattr(response, "usage", None)
+                details = getattr(usage, "prompt_tokens_details", None)
+                cached_tokens = getattr(details, "cached_tokens", None)
+                if cached_tokens:
+                    logger.debug(f"Prompt cache hit: {cached_tokens} tokens")
+                
                 return (category, idx, {
                     "query": query,
                     "answer": answer,
@@ -235,10 +294,17 @@ Please provide a detailed answer based on the content and images above."""
     tasks = []
     for category, queries in queries_by_category.items():
         for idx, query in enumerate(queries):
-            tasks.append(query_one(category, idx, query))
+            tasks.append((category, idx, query))
+    
+    # With prompt caching, run one query first so the provider has the prefix
+    # cached before the rest fan out
+    all_results = []
+    if cache_mode != "off" and tasks:
+        all_results.append(await query_one(*tasks[0]))
+        tasks = tasks[1:]
     
     # Execute concurrently
-    all_results = await asyncio.gather(*tasks)
+    all_results.extend(await asyncio.gather(*(query_one(*t) for t in tasks)))
     
     # Group by category
     results_by_category = {cat: [] for cat in queries_by_category.keys()}
@@ -253,6 +319,59 @@ Please provide a detailed answer based on the content and images above."""
     return results_by_category
 
 
+def _parse_with_cache(batch_parser, input_path: str, output_dir: Path, storage_dir: Path) -> List[str]:
+    """
+    Parse documents for fast mode, reusing the parse cache normal mode keeps
+    in storage_dir; only files without a valid entry go through MinerU.
+    
+    Returns:
+        Markdown paths of all parsed documents
+    """
+    from paper2slides.raganything.parse_cache import (
+        ParseCacheFile, build_entry, find_markdown, parse_config, read_parser_output,
+    )
+    
+    cache = ParseCacheFile(storage_dir)
+    config = parse_config("mineru", "auto")
+    files = batch_parser.filter_supported_files([input_path], recursive=True)
+    
+    entries = {}
+    for file_path in files:
+        entry = cache.lookup(file_path, config)
+        if entry and entry.get("markdown_paths"):
+            entries[file_path] = entry
+    if entries:
+        logger.info(f"  Reusing cached parse output for {len(entries)} file(s)")
+    
+    to_parse = [f for f in files if f not in entries]
+    if to_parse:
+        parse_result = batch_parser.process_batch(
+            file_paths=to_parse,
+            output_dir=str(output_dir),
+            parse_method="auto",
+            recursive=True,
+        )
+        logger.info(f"  Parsing completed: {len(parse_result.successful_files)} successful")
+        
+        for file_path in parse_result.successful_files:
+            try:
+                content_list = read_parser_output(file_path, output_dir, "mineru", "auto")
+            except Exception as e:
+                logger.warning(f"Could not read parser output for {file_path}: {e}")
+                continue
+            entry = build_entry(
+                file_path, content_list, config, find_markdown(output_dir, Path(file_path).stem)
+            )
+            cache.store(file_path, config, entry)
+            entries[file_path] = entry
+    
+    markdown_paths = [p for f in files if f in entries for p in entries[f]["markdown_paths"]]
+    if not markdown_paths:
+        # Parser output outside the <stem>/ layout
+        markdown_paths = [str(f) for f in output_dir.rglob("*.md")]
+    return markdown_paths
+
+
 async def run_rag_stage(base_dir: Path, config: Dict) -> Dict:
     """Stage 1: Index document and run RAG queries.
     
@@ -287,8 +406,8 @@ async def run_rag_stage(base_dir: Path, config: Dict) -> Dict:
         # Parse documents to generate markdown
         batch_parser = BatchParser(
             parser_type="mineru",
-            max_workers=4,
             show_progress=True,
+            execution_mode=os.getenv("PARSER_EXECUTION_MODE", "thread"),
             skip_installation_check=True,
         )
         
@@ -297,19 +416,15 @@ async def run_rag_stage(base_dir: Path, config: Dict) -> Dict:
         else:
             logger.info(f"Parsing directory: {path.name}")
         
-        parse_result = batch_parser.process_batch(
-            file_paths=[input_path],
-            output_dir=str(output_dir),
-            parse_method="auto",
-            recursive=True,
+        # Parse in a worker thread so other documents/sessions keep running
+        markdown_paths = await asyncio.to_thread(
+            _parse_with_cache,
+            batch_parser,
+            input_path,
+            output_dir,
+            base_dir / "rag_storage",
         )
         
-        logger.info(f"  Parsing completed: {len(parse_result.successful_files)} successful")
-        
-        # Collect markdown files
-        md_files = list(output_dir.rglob("*.md"))
-        markdown_paths = [str(f) for f in md_files]
-        
         if not markdown_paths:
             raise ValueError("No markdown files generated")
         
@@ -319,11 +434,7 @@ async def run_rag_stage(base_dir: Path, config: Dict) -> Dict:
         logger.info("")
         logger.info(f"Running queries with GPT-4o and images ({content_type})...")
         
-        from openai import OpenAI
-        
-        api_key = os.getenv("RAG_LLM_API_KEY", "")
-        base_url = os.getenv("RAG_LLM_BASE_URL")
-        client = OpenAI(api_key=api_key, base_url=base_url)
+        client = get_async_client()
         
         # Execute queries (direct GPT-4o with images in original positions)
         if content_type == "paper":
@@ -389,7 +500,7 @@ async def run_rag_stage(base_dir: Path, config: Dict) -> Dict:
                 logger.info("  Getting document overview...")
                 overview = await get_general_overview(rag, mode="mix")
                 logger.info("  Generating queries from overview...")
-                queries = generate_general_queries(rag, overview, count=12)
+                queries = await generate_general_queries(rag, overview, count=12)
                 logger.info(f"  Executing {len(queries)} queries...")
                 query_results = await rag.batch_query(queries, mode="mix")
                 rag_results = {"content": query_results}
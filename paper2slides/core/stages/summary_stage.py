@@ -1,12 +1,11 @@
 """
 Summary Stage - Content extraction from RAG results
 """
-import os
 import logging
 from pathlib import Path
 from typing import Dict
 
-from ...utils import load_json, save_json, save_text
+from ...utils import load_json, save_json, save_text, get_async_client
 from ..paths import get_rag_checkpoint, get_summary_checkpoint, get_summary_md
 
 logger = logging.getLogger(__name__)
@@ -14,7 +13,6 @@ logger = logging.getLogger(__name__)
 
 async def run_summary_stage(base_dir: Path, config: Dict) -> Dict:
     """Stage 2: Extract content from RAG results."""
-    from openai import OpenAI
     from paper2slides.summary import extract_paper, extract_general, extract_tables_and_figures, OriginalElements
     from paper2slides.summary.paper import extract_paper_metadata_from_markdown
     
@@ -26,9 +24,7 @@ async def run_summary_stage(base_dir: Path, config: Dict) -> Dict:
     markdown_paths = rag_data.get("markdown_paths", [])
     content_type = rag_data.get("content_type", "paper")
     
-    api_key = os.getenv("RAG_LLM_API_KEY", "")
-    base_url = os.getenv("RAG_LLM_BASE_URL")
-    llm_client = OpenAI(api_key=api_key, base_url=base_url)
+    llm_client = get_async_client()
     
     logger.info(f"Extracting content from indexed documents ({content_type})...")
     
@@ -1,16 +1,21 @@
 """
 State management for pipeline execution
 """
+import logging
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional
 
-from ..utils import load_json, save_json
+from ..utils import load_json, save_json, save_text
 from .paths import (
     get_rag_checkpoint,
     get_summary_checkpoint,
+    get_summary_md,
     get_plan_checkpoint,
 )
+from .checkpoint_store import STORE_STAGES, get_stage_keys, get_checkpoint_store
+
+logger = logging.getLogger(__name__)
 
 STAGES = ["rag", "summary", "plan", "generate"]
 
@@ -40,18 +45,85 @@ def create_state(config: Dict) -> Dict:
     }
 
 
+def get_stage_checkpoint(stage: str, base_dir: Path, config_dir: Path, config: Dict) -> Path:
+    """Get project checkpoint path for a stage."""
+    if stage == "rag":
+        return get_rag_checkpoint(base_dir, config)
+    if stage == "summary":
+        return get_summary_checkpoint(base_dir, config)
+    if stage == "plan":
+        return get_plan_checkpoint(config_dir)
+    raise ValueError(f"Stage {stage} has no checkpoint")
+
+
+def _get_stage_keys(config: Dict) -> Optional[Dict[str, str]]:
+    if not config.get("input_path"):
+        return None
+    try:
+        return get_stage_keys(config)
+    except OSError as e:
+        logger.warning(f"Cannot hash input for checkpoint store: {e}")
+        return None
+
+
+def publish_checkpoint(stage: str, base_dir: Path, config_dir: Path, config: Dict):
+    """Tag a freshly written stage checkpoint with its key and add it to the shared store."""
+    if stage not in STORE_STAGES:
+        return
+    keys = _get_stage_keys(config)
+    path = get_stage_checkpoint(stage, base_dir, config_dir, config)
+    data = load_json(path)
+    if not keys or not data:
+        return
+    
+    data["cas_key"] = keys[stage]
+    save_json(path, data)
+    
+    files = {}
+    if stage == "summary":
+        summary_md = get_summary_md(base_dir, config)
+        if summary_md.exists():
+            files["summary.md"] = summary_md.read_text(encoding="utf-8")
+    get_checkpoint_store(base_dir).put(stage, keys[stage], data, files)
+
+
+def _restore_checkpoint(stage: str, entry: Dict, base_dir: Path, config_dir: Path, config: Dict):
+    """Materialize a stored checkpoint into the project directory."""
+    checkpoint = dict(entry["checkpoint"])
+    if stage == "rag":
+        checkpoint["input_path"] = config.get("input_path")
+    save_json(get_stage_checkpoint(stage, base_dir, config_dir, config), checkpoint)
+    if stage == "summary" and "summary.md" in entry.get("files", {}):
+        save_text(get_summary_md(base_dir, config), entry["files"]["summary.md"])
+
+
 def detect_start_stage(base_dir: Path, config_dir: Path, config: Dict) -> str:
-    """Detect which stage to start from based on existing checkpoints."""
-    # Check mode-specific checkpoints
-    if not get_rag_checkpoint(base_dir, config).exists():
-        return "rag"
+    """Detect which stage to start from based on existing checkpoints.
     
-    if not get_summary_checkpoint(base_dir, config).exists():
-        return "summary"
+    Project checkpoints are reused only if they were produced from the same
+    input bytes and stage config (cas_key matches). Otherwise the shared
+    content-addressed store is consulted and a hit is restored into the
+    project directory.
+    """
+    keys = _get_stage_keys(config)
+    store = get_checkpoint_store(base_dir)
     
-    # Check config-specific checkpoint
-    if not get_plan_checkpoint(config_dir).exists():
-        return "plan"
+    for stage in STORE_STAGES:
+        path = get_stage_checkpoint(stage, base_dir, config_dir, config)
+        data = load_json(path) if path.exists() else None
+        
+        # Checkpoints written before the store existed carry no key
+        if data is not None and (keys is None or data.get("cas_key") in (None, keys[stage])):
+            continue
+        
+        entry = store.get(stage, keys[stage]) if keys else None
+        if entry is None:
+            if data is not None:
+                logger.info(f"Existing {stage} checkpoint was built from different input/config")
+            return stage
+        
+        _restore_checkpoint(stage, entry, base_dir, config_dir, config)
+        logger.info(f"Reusing stored {stage} checkpoint {keys[stage][:12]}")
     
     # All checkpoints exist, only need to regenerate images
     return "generate"
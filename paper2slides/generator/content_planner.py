@@ -2,15 +2,15 @@
 Content Planner
 """
 import json
-import base64
 import re
 import logging
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from .config import GenerationInput, OutputType, PosterFormat
+from ..utils import chat_completion, get_figure_cache
 from ..summary import FigureInfo, TableInfo
 from ..prompts.content_planning import (
     # Stage 1: Content Analysis
@@ -129,19 +129,24 @@ class ContentPlanner:
         api_key: str = None,
         base_url: str = None,
         model: str = "gpt-5.1",
+        client: Optional[AsyncOpenAI] = None,
     ):
         import os
         self.api_key = api_key or os.getenv("RAG_LLM_API_KEY", "")
         self.base_url = base_url or os.getenv("RAG_LLM_BASE_URL")
         self.model = model
         self.logger = logging.getLogger(__name__)
+        self._client = client
 
-        kwargs = {"api_key": self.api_key}
-        if self.base_url:
-            kwargs["base_url"] = self.base_url
-        self.client = OpenAI(**kwargs)
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Injected client, or the shared pool client for the running loop."""
+        if self._client is None:
+            from ..utils import get_async_client
+            self._client = get_async_client(self.api_key, self.base_url)
+        return self._client
 
-    def plan(self, gen_input: GenerationInput) -> ContentPlan:
+    async def plan(self, gen_input: GenerationInput) -> ContentPlan:
         """Create a content plan from generation input using two-stage adaptive planning."""
         # Build tables index
         tables_index = {}
@@ -160,14 +165,14 @@ class ContentPlanner:
 
         # Stage 1: Analyze what content actually exists
         self.logger.info("Stage 1: Analyzing content structure...")
-        content_analysis = self._analyze_content(summary)
+        content_analysis = await self._analyze_content(summary)
         self.logger.info(f"Content analysis complete: {self._summarize_analysis(content_analysis)}")
 
         # Stage 2: Plan based on output type using adaptive prompts
         if gen_input.config.output_type == OutputType.POSTER:
-            sections = self._plan_poster_adaptive(gen_input, summary, tables_md, figure_images, content_analysis)
+            sections = await self._plan_poster_adaptive(gen_input, summary, tables_md, figure_images, content_analysis)
         else:
-            sections = self._plan_slides_adaptive(gen_input, summary, tables_md, figure_images, content_analysis)
+            sections = await self._plan_slides_adaptive(gen_input, summary, tables_md, figure_images, content_analysis)
 
         return ContentPlan(
             output_type=gen_input.config.output_type.value,
@@ -185,12 +190,13 @@ class ContentPlanner:
             },
         )
 
-    def _analyze_content(self, summary: str) -> Dict[str, Any]:
+    async def _analyze_content(self, summary: str) -> Dict[str, Any]:
         """Stage 1: Analyze what content elements actually exist in the document."""
         prompt = CONTENT_ANALYSIS_PROMPT.format(summary=self._truncate(summary, 12000))
 
         try:
-            response = self.client.chat.completions.create(
+            response = await chat_completion(
+                self.client,
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 max_completion_tokens=4000,
@@ -271,7 +277,7 @@ class ContentPlanner:
 
         return "\n".join(lines)
 
-    def _plan_slides_adaptive(
+    async def _plan_slides_adaptive(
         self,
         gen_input: GenerationInput,
         summary: str,
@@ -297,10 +303,10 @@ class ContentPlanner:
         )
 
         self.logger.info("Stage 2: Generating adaptive slides plan...")
-        result = self._call_multimodal_llm(prompt, figure_images)
+        result = await self._call_multimodal_llm(prompt, figure_images)
         return self._parse_sections(result, is_slides=True)
 
-    def _plan_poster_adaptive(
+    async def _plan_poster_adaptive(
         self,
         gen_input: GenerationInput,
         summary: str,
@@ -344,11 +350,11 @@ class ContentPlanner:
             )
 
         self.logger.info("Stage 2: Generating adaptive poster plan...")
-        result = self._call_multimodal_llm(prompt, figure_images)
+        result = await self._call_multimodal_llm(prompt, figure_images)
         return self._parse_sections(result, is_slides=False)
 
     # Keep legacy methods for backward compatibility (but they won't be called)
-    def _plan_slides(
+    async def _plan_slides(
         self,
         gen_input: GenerationInput,
         summary: str,
@@ -356,10 +362,10 @@ class ContentPlanner:
         figure_images: List[Dict],
     ) -> List[Section]:
         """Legacy method - redirects to adaptive planning."""
-        content_analysis = self._analyze_content(summary)
-        return self._plan_slides_adaptive(gen_input, summary, tables_md, figure_images, content_analysis)
+        content_analysis = await self._analyze_content(summary)
+        return await self._plan_slides_adaptive(gen_input, summary, tables_md, figure_images, content_analysis)
 
-    def _plan_poster(
+    async def _plan_poster(
         self,
         gen_input: GenerationInput,
         summary: str,
@@ -367,8 +373,8 @@ class ContentPlanner:
         figure_images: List[Dict],
     ) -> List[Section]:
         """Legacy method - redirects to adaptive planning."""
-        content_analysis = self._analyze_content(summary)
-        return self._plan_poster_adaptive(gen_input, summary, tables_md, figure_images, content_analysis)
+        content_analysis = await self._analyze_content(summary)
+        return await self._plan_poster_adaptive(gen_input, summary, tables_md, figure_images, content_analysis)
     
     def _build_assets_section(self, tables_md: str, has_figures: bool) -> str:
         """Build the tables/figures section based on available assets."""
@@ -395,7 +401,7 @@ class ContentPlanner:
         parts.append("")  # Trailing newline
         return "\n".join(parts)
     
-    def _call_multimodal_llm(self, text_prompt: str, figure_images: List[Dict]) -> str:
+    async def _call_multimodal_llm(self, text_prompt: str, figure_images: List[Dict]) -> str:
         """Call multimodal LLM with text and images inline."""
         import logging
         logger = logging.getLogger(__name__)
@@ -438,7 +444,8 @@ class ContentPlanner:
         
         try:
             logger.info(f"Calling {self.model} with max_completion_tokens=16000")
-            response = self.client.chat.completions.create(
+            response = await chat_completion(
+                self.client,
                 model=self.model,
                 messages=[{"role": "user", "content": content}],
                 max_completion_tokens=16000,
@@ -571,7 +578,8 @@ class ContentPlanner:
         ]
     
     def _load_figure_images(self, origin) -> List[Dict]:
-        """Load figure images as base64 with caption."""
+        """Load figure images as base64 with caption (from the run's figure cache)."""
+        cache = get_figure_cache()
         images = []
         for fig in origin.figures:
             # Build full path
@@ -580,27 +588,19 @@ class ContentPlanner:
             else:
                 img_path = Path(fig.image_path)
             
-            if not img_path.exists():
+            asset = cache.get(img_path)
+            if asset is None:
                 continue
+            prepared = asset.prepared("vision")
             
-            # Determine mime type
-            suffix = img_path.suffix.lower()
-            mime_map = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", 
-                       ".png": "image/png", ".webp": "image/webp", ".gif": "image/gif"}
-            mime_type = mime_map.get(suffix, "image/jpeg")
-            
-            # Read and encode
-            try:
-                with open(img_path, "rb") as f:
-                    img_data = base64.b64encode(f.read()).decode("utf-8")
-                images.append({
-                    "figure_id": fig.figure_id,
-                    "caption": fig.caption,
-                    "base64": img_data,
-                    "mime_type": mime_type,
-                })
-            except Exception:
-                continue
+            images.append({
+                "figure_id": fig.figure_id,
+                "caption": fig.caption,
+                "base64": prepared.base64,
+                "mime_type": prepared.mime_type,
+                "path": str(asset.path),
+                "profile": "vision",
+            })
         
         return images
     
@@ -6,16 +6,16 @@ Generate poster/slides images from ContentPlan.
 import os
 import json
 import base64
-import time
+import asyncio
+import hashlib
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
-from openai import OpenAI
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 
 from .config import GenerationInput, PosterFormat
 from .content_planner import ContentPlan, Section
+from .pdf_writer import StreamingPDFWriter
 from .providers import (
     ProviderFactory,
     ImageGenerationProvider,
@@ -41,6 +41,8 @@ from ..prompts.image_generation import (
     POSTER_FIGURE_HINT,
     get_language_hint,
 )
+from ..utils import get_async_client, chat_completion, get_rate_limiter, get_figure_cache
+from ..utils.metrics import incr
 
 
 @dataclass
@@ -49,6 +51,8 @@ class GeneratedImage:
     section_id: str
     image_data: bytes
     mime_type: str
+    fingerprint: str = ""  # Hash of the prompt inputs that produced this image
+    reused: bool = False   # True if copied from a previous run instead of generated
 
 
 @dataclass
@@ -62,7 +66,7 @@ class ProcessedStyle:
     error: Optional[str] = None
 
 
-def process_custom_style(user_style: str, model: str = None) -> ProcessedStyle:
+async def process_custom_style(user_style: str, model: str = None) -> ProcessedStyle:
     """Process user's custom style request with LLM."""
     model = model or os.getenv("LLM_MODEL", "gpt-5.1")
 
@@ -76,10 +80,11 @@ def process_custom_style(user_style: str, model: str = None) -> ProcessedStyle:
             valid=False, error="No LLM API key found for style processing"
         )
 
-    client = OpenAI(api_key=api_key, base_url=base_url)
+    client = get_async_client(api_key, base_url)
 
     try:
-        response = client.chat.completions.create(
+        response = await chat_completion(
+            client,
             model=model,
             messages=[{"role": "user", "content": STYLE_PROCESS_PROMPT.format(user_style=user_style)}],
             response_format={"type": "json_object"},
@@ -118,12 +123,13 @@ class ImageGenerator:
         logger = logging.getLogger(__name__)
         logger.info(f"ImageGenerator initialized with provider: {type(self.provider).__name__}, model: {self.model}")
     
-    def generate(
+    async def generate(
         self,
         plan: ContentPlan,
         gen_input: GenerationInput,
         max_workers: int = 1,
         save_callback = None,
+        previous: Optional[Dict[str, dict]] = None,
     ) -> List[GeneratedImage]:
         """
         Generate images from ContentPlan.
@@ -131,12 +137,17 @@ class ImageGenerator:
         Args:
             plan: ContentPlan from ContentPlanner
             gen_input: GenerationInput with config and origin
-            max_workers: Maximum parallel workers for slides (3rd+ slides run in parallel)
+            max_workers: Maximum in-flight model requests for slides (3rd+ slides run concurrently)
             save_callback: Optional callback function(generated_image, index, total) called after each image
+            previous: Manifest of an earlier run: {"images": {section_id: {"fingerprint", "path",
+                "mime_type"}}, "custom_style", "processed_style"}. Sections whose fingerprint is
+                unchanged reuse the earlier image instead of calling the model.
         
         Returns:
             List of GeneratedImage (1 for poster, N for slides)
         """
+        previous = previous or {}
+        self._previous = previous.get("images", {})
         figure_images = self._load_figure_images(plan, gen_input.origin.base_path)
         style_name = gen_input.config.style.value
         custom_style = gen_input.config.custom_style
@@ -146,15 +157,20 @@ class ImageGenerator:
         # Process custom style with LLM if needed
         processed_style = None
         if style_name == "custom" and custom_style:
-            processed_style = process_custom_style(custom_style)
+            # Reuse the earlier interpretation so unchanged slides keep their fingerprints
+            if previous.get("custom_style") == custom_style and previous.get("processed_style"):
+                processed_style = ProcessedStyle(**previous["processed_style"])
+            else:
+                processed_style = await process_custom_style(custom_style)
             if not processed_style.valid:
                 raise ValueError(f"Invalid custom style: {processed_style.error}")
+        self.processed_style = processed_style
 
         all_sections_md = self._format_sections_markdown(plan)
         all_images = self._filter_images(plan.sections, figure_images)
 
         if plan.output_type == "poster":
-            result = self._generate_poster(
+            result = await self._generate_poster(
                 style_name, processed_style, all_sections_md, all_images,
                 poster_format=poster_format,
                 density=gen_input.config.poster_density.value,
@@ -164,9 +180,9 @@ class ImageGenerator:
                 save_callback(result[0], 0, 1)
             return result
         else:
-            return self._generate_slides(plan, style_name, processed_style, all_sections_md, figure_images, max_workers, save_callback, language=language)
+            return await self._generate_slides(plan, style_name, processed_style, all_sections_md, figure_images, max_workers, save_callback, language=language)
     
-    def _generate_poster(
+    async def _generate_poster(
         self,
         style_name,
         processed_style: Optional[ProcessedStyle],
@@ -203,11 +219,10 @@ class ImageGenerator:
             aspect_ratio = "16:9"
             logger.info(f"Generating landscape poster (aspect_ratio={aspect_ratio}, language={language})")
 
-        image_data, mime_type = self._call_model(prompt, images, aspect_ratio=aspect_ratio)
-        return [GeneratedImage(section_id="poster", image_data=image_data, mime_type=mime_type)]
+        return [await self._render("poster", prompt, prompt, images, aspect_ratio=aspect_ratio)]
     
-    def _generate_slides(self, plan, style_name, processed_style: Optional[ProcessedStyle], all_sections_md, figure_images, max_workers: int, save_callback=None, language: str = "en") -> List[GeneratedImage]:
-        """Generate N slide images (slides 1-2 sequential, 3+ parallel)."""
+    async def _generate_slides(self, plan, style_name, processed_style: Optional[ProcessedStyle], all_sections_md, figure_images, max_workers: int, save_callback=None, language: str = "en") -> List[GeneratedImage]:
+        """Generate N slide images (slides 1-2 sequential, 3+ concurrent)."""
         results = []
         total = len(plan.sections)
 
@@ -221,84 +236,79 @@ class ImageGenerator:
 
         style_ref_image = None  # Store 2nd slide as reference for all subsequent slides
 
-        # Generate first 2 slides sequentially (slide 1: no ref, slide 2: becomes ref)
-        for i in range(min(2, total)):
-            section = plan.sections[i]
+        async def render_slide(i, section, style_ref_image):
             section_md = self._format_single_section_markdown(section, plan)
             layout_rule = layouts.get(section.section_type, layouts["content"])
 
-            prompt = self._build_slide_prompt(
-                style_name=style_name,
-                processed_style=processed_style,
-                sections_md=section_md,
-                layout_rule=layout_rule,
-                slide_info=f"Slide {i+1} of {total}",
-                context_md=all_sections_md,
-                language=language,
-            )
+            def build_prompt(slide_info, context_md):
+                return self._build_slide_prompt(
+                    style_name=style_name,
+                    processed_style=processed_style,
+                    sections_md=section_md,
+                    layout_rule=layout_rule,
+                    slide_info=slide_info,
+                    context_md=context_md,
+                    language=language,
+                )
+
+            prompt = build_prompt(f"Slide {i+1} of {total}", all_sections_md)
+            # Fingerprint covers this slide's own inputs (section, layout, style,
+            # references, model); the shared deck context and slide numbering are
+            # left out so editing one section does not invalidate every slide.
+            fingerprint_prompt = build_prompt("", "")
 
             section_images = self._filter_images([section], figure_images)
-            reference_images = []
-            if style_ref_image:
-                reference_images.append(style_ref_image)
+            reference_images = [style_ref_image] if style_ref_image else []
             reference_images.extend(section_images)
 
-            image_data, mime_type = self._call_model(prompt, reference_images)
+            return await self._render(section.id, prompt, fingerprint_prompt, reference_images)
+
+        # Generate first 2 slides sequentially (slide 1: no ref, slide 2: becomes ref)
+        for i in range(min(2, total)):
+            section = plan.sections[i]
+            generated_img = await render_slide(i, section, style_ref_image)
 
             # Save 2nd slide (i=1) as style reference
             if i == 1:
                 style_ref_image = {
                     "figure_id": "Reference Slide",
                     "caption": "STRICTLY MAINTAIN: same background color, same accent color, same font style, same chart/icon style. Keep visual consistency.",
-                    "base64": base64.b64encode(image_data).decode("utf-8"),
-                    "mime_type": mime_type,
+                    "base64": base64.b64encode(generated_img.image_data).decode("utf-8"),
+                    "mime_type": generated_img.mime_type,
                 }
 
-            generated_img = GeneratedImage(section_id=section.id, image_data=image_data, mime_type=mime_type)
             results.append(generated_img)
 
             # Save immediately if callback provided
             if save_callback:
                 save_callback(generated_img, i, total)
 
-        # Generate remaining slides in parallel (from 3rd onwards)
+        # Generate remaining slides concurrently (from 3rd onwards)
         if total > 2:
             results_dict = {}
+            limit = asyncio.Semaphore(max(1, max_workers))
 
-            def generate_single(i, section):
-                section_md = self._format_single_section_markdown(section, plan)
-                layout_rule = layouts.get(section.section_type, layouts["content"])
-
-                prompt = self._build_slide_prompt(
-                    style_name=style_name,
-                    processed_style=processed_style,
-                    sections_md=section_md,
-                    layout_rule=layout_rule,
-                    slide_info=f"Slide {i+1} of {total}",
-                    context_md=all_sections_md,
-                    language=language,
-                )
-
-                section_images = self._filter_images([section], figure_images)
-                reference_images = [style_ref_image] if style_ref_image else []
-                reference_images.extend(section_images)
+            async def generate_single(i, section):
+                async with limit:
+                    return i, await render_slide(i, section, style_ref_image)
 
-                image_data, mime_type = self._call_model(prompt, reference_images)
-                return i, GeneratedImage(section_id=section.id, image_data=image_data, mime_type=mime_type)
-
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {
-                    executor.submit(generate_single, i, plan.sections[i]): i
-                    for i in range(2, total)
-                }
-
-                for future in as_completed(futures):
-                    idx, generated_img = future.result()
+            tasks = [
+                asyncio.create_task(generate_single(i, plan.sections[i]))
+                for i in range(2, total)
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    idx, generated_img = await next_done
                     results_dict[idx] = generated_img
 
                     # Save immediately if callback provided
                     if save_callback:
                         save_callback(generated_img, idx, total)
+            finally:
+                # On failure or cancellation, stop the in-flight requests
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
 
             # Append in order
             for i in range(2, total):
@@ -306,6 +316,59 @@ class ImageGenerator:
         
         return results
     
+    def _fingerprint(self, prompt: str, reference_images: List[dict], aspect_ratio: str) -> str:
+        """Hash of everything that determines a generated image."""
+        digest = hashlib.sha256()
+        for part in (self.model, type(self.provider).__name__, aspect_ratio, prompt):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        for img in reference_images:
+            digest.update(f"{img.get('figure_id')}|{img.get('caption')}|{img.get('mime_type')}|".encode("utf-8"))
+            digest.update(hashlib.sha256(img.get("base64", "").encode("ascii")).digest())
+        return digest.hexdigest()
+
+    def _load_previous(self, section_id: str, fingerprint: str) -> Optional[GeneratedImage]:
+        """Load the previous run's image for a section if its inputs are unchanged."""
+        entry = self._previous.get(section_id)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        path = Path(entry.get("path", ""))
+        if not path.is_file():
+            return None
+        return GeneratedImage(
+            section_id=section_id,
+            image_data=path.read_bytes(),
+            mime_type=entry.get("mime_type", "image/png"),
+            fingerprint=fingerprint,
+            reused=True,
+        )
+
+    async def _render(
+        self,
+        section_id: str,
+        prompt: str,
+        fingerprint_prompt: str,
+        reference_images: List[dict],
+        aspect_ratio: str = "16:9",
+    ) -> GeneratedImage:
+        """Reuse the previous image if unchanged, otherwise call the model."""
+        logger = logging.getLogger(__name__)
+        fingerprint = self._fingerprint(fingerprint_prompt, reference_images, aspect_ratio)
+        previous = self._load_previous(section_id, fingerprint)
+        if previous:
+            logger.info(f"Reusing unchanged image for {section_id}")
+            incr("cache.slide_reuse.hits")
+            return previous
+
+        incr("cache.slide_reuse.misses")
+        image_data, mime_type = await self._call_model(prompt, reference_images, aspect_ratio=aspect_ratio)
+        return GeneratedImage(
+            section_id=section_id,
+            image_data=image_data,
+            mime_type=mime_type,
+            fingerprint=fingerprint,
+        )
+
     def _format_custom_style_for_poster(self, ps: ProcessedStyle, language: str = "en") -> str:
         """Format ProcessedStyle into style hints string for poster."""
         lang_hint = get_language_hint(language)
@@ -469,35 +532,28 @@ class ImageGenerator:
         return "\n".join(lines)
     
     def _load_figure_images(self, plan: ContentPlan, base_path: str) -> List[dict]:
-        """Load figure images as base64."""
+        """Load figure images as base64 (from the run's figure cache)."""
+        cache = get_figure_cache()
         images = []
-        mime_map = {
-            ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
-            ".png": "image/png", ".webp": "image/webp", ".gif": "image/gif"
-        }
-        
         for fig_id, fig in plan.figures_index.items():
             if base_path:
                 img_path = Path(base_path) / fig.image_path
             else:
                 img_path = Path(fig.image_path)
             
-            if not img_path.exists():
+            asset = cache.get(img_path)
+            if asset is None:
                 continue
+            prepared = asset.prepared("reference")
             
-            mime_type = mime_map.get(img_path.suffix.lower(), "image/jpeg")
-            
-            try:
-                with open(img_path, "rb") as f:
-                    img_data = base64.b64encode(f.read()).decode("utf-8")
-                images.append({
-                    "figure_id": fig_id,
-                    "caption": fig.caption,
-                    "base64": img_data,
-                    "mime_type": mime_type,
-                })
-            except Exception:
-                continue
+            images.append({
+                "figure_id": fig_id,
+                "caption": fig.caption,
+                "base64": prepared.base64,
+                "mime_type": prepared.mime_type,
+                "path": str(asset.path),
+                "profile": "reference",
+            })
         
         return images
     
@@ -509,8 +565,8 @@ class ImageGenerator:
                 used_ids.add(ref.figure_id)
         return [img for img in figure_images if img.get("figure_id") in used_ids]
     
-    def _call_model(self, prompt: str, reference_images: List[dict], aspect_ratio: str = "16:9") -> tuple:
-        """Call the image generation model with retry logic."""
+    async def _call_model(self, prompt: str, reference_images: List[dict], aspect_ratio: str = "16:9") -> tuple:
+        """Call the image generation model through the provider's rate limiter."""
         logger = logging.getLogger(__name__)
 
         # Create generation request
@@ -521,61 +577,43 @@ class ImageGenerator:
             aspect_ratio=aspect_ratio
         )
 
-        # Retry logic for API calls
-        max_retries = 3
-        retry_delay = 2  # seconds
-
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Calling image generation API (attempt {attempt + 1}/{max_retries})...")
-
-                # Call provider
-                response = self.provider.generate_image(request)
-
-                logger.info("Image generation successful")
-                return response.image_data, response.mime_type
-
-            except Exception as e:
-                logger.error(f"Error in API call (attempt {attempt + 1}/{max_retries}): {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (attempt + 1))
-                    continue
-                raise
-
-        raise RuntimeError("Image generation failed after all retry attempts")
+        # Throttling (429/5xx, Retry-After) and bad responses are retried by the limiter
+        limiter = get_rate_limiter(self.provider.get_provider_name(), self.model)
+        attempt = 0
+
+        async def call_provider():
+            nonlocal attempt
+            attempt += 1
+            logger.info(f"Calling image generation API (attempt {attempt})...")
+            return await self.provider.agenerate_image(request)
+
+        response = await limiter.call(
+            call_provider,
+            retry_unknown=True,
+            kind="image",
+            request_bytes=len(prompt) + sum(len(img.get("base64", "")) for img in reference_images),
+            describe=lambda r: {"model": request.model, "response_bytes": len(r.image_data)},
+        )
+        logger.info("Image generation successful")
+        return response.image_data, response.mime_type
 
 
 def save_images_as_pdf(images: List[GeneratedImage], output_path: str):
     """
     Save generated images as a single PDF file.
     
+    Pages are streamed to disk one at a time (see StreamingPDFWriter); to
+    build the PDF while slides are still being generated, use the writer
+    from a save_callback instead.
+    
     Args:
         images: List of GeneratedImage from ImageGenerator.generate()
         output_path: Output PDF file path
     """
-    from PIL import Image
-    import io
-    
-    pdf_images = []
-    
-    for img in images:
-        # Load image from bytes
-        pil_img = Image.open(io.BytesIO(img.image_data))
-        
-        # Convert RGBA to RGB (PDF doesn't support alpha)
-        if pil_img.mode == 'RGBA':
-            pil_img = pil_img.convert('RGB')
-        elif pil_img.mode != 'RGB':
-            pil_img = pil_img.convert('RGB')
-        
-        pdf_images.append(pil_img)
+    if not images:
+        return
     
-    if pdf_images:
-        # Save first image and append the rest
-        pdf_images[0].save(
-            output_path,
-            save_all=True,
-            append_images=pdf_images[1:] if len(pdf_images) > 1 else [],
-            resolution=100.0,
-        )
-        print(f"PDF saved: {output_path}")
+    with StreamingPDFWriter(output_path) as writer:
+        for index, img in enumerate(images):
+            writer.add_page(index, img.image_data, img.mime_type)
+    print(f"PDF saved: {output_path}")
@@ -0,0 +1,246 @@
+"""
+Streaming PDF writer for generated slides
+
+Pages are appended one at a time, as slides arrive, and written to disk
+immediately. JPEG data is embedded as-is (DCTDecode) and PNG data as its
+zlib stream with PNG predictors (FlateDecode), so images are never decoded.
+Only PNGs the PDF format cannot take directly (alpha channel, interlaced)
+are decoded, one at a time. Pages may be added in any order; the page tree
+written on close() follows the slide index.
+"""
+import os
+import io
+import zlib
+import struct
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# JPEG start-of-frame markers (baseline, extended, progressive, lossless...)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_JPEG_COLORSPACES = {1: "/DeviceGray", 3: "/DeviceRGB", 4: "/DeviceCMYK"}
+
+
+def _jpeg_info(data: bytes) -> Optional[Tuple[int, int, int, bool]]:
+    """(width, height, components, adobe_inverted) from JPEG markers, or None."""
+    if data[:2] != b"\xff\xd8":
+        return None
+    pos = 2
+    adobe = False
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        if marker == 0xEE and data[pos + 4:pos + 9] == b"Adobe":
+            adobe = True
+        if marker in _SOF_MARKERS:
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            return width, height, data[pos + 9], adobe
+        pos += 2 + length
+    return None
+
+
+def _png_chunks(data: bytes):
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IEND":
+            return
+
+
+class StreamingPDFWriter:
+    """Write an image-per-page PDF incrementally.
+
+    Usage:
+        writer = StreamingPDFWriter("slides.pdf")
+        writer.add_page(0, image_bytes, "image/png")   # any order
+        writer.close()   # or abort() to discard
+
+    The file is written to "<path>.part" and renamed on close().
+    """
+
+    def __init__(self, output_path: Union[str, Path], resolution: float = 100.0):
+        self.output_path = Path(output_path)
+        self.resolution = resolution
+        self._tmp_path = self.output_path.with_name(self.output_path.name + ".part")
+        self._file = open(self._tmp_path, "wb")
+        self._offsets: Dict[int, int] = {}
+        self._pages: Dict[int, int] = {}  # slide index -> page object number
+        # 1 = catalog, 2 = page tree; both written on close()
+        self._next_obj = 3
+        self._write(b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def num_pages(self) -> int:
+        return len(self._pages)
+
+    # ---- Low-level ----
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+
+    def _alloc(self) -> int:
+        num = self._next_obj
+        self._next_obj += 1
+        return num
+
+    def _write_object(self, num: int, body: bytes, stream: Optional[bytes] = None):
+        self._offsets[num] = self._file.tell()
+        self._write(f"{num} 0 obj\n".encode("ascii"))
+        self._write(body)
+        if stream is not None:
+            self._write(b"\nstream\n")
+            self._write(stream)
+            self._write(b"\nendstream")
+        self._write(b"\nendobj\n")
+
+    # ---- Images ----
+
+    def _image_object(self, data: bytes, mime_type: str) -> Tuple[str, bytes, int, int]:
+        """(dictionary entries, stream, width, height) for an image XObject."""
+        if data[:2] == b"\xff\xd8":
+            info = _jpeg_info(data)
+            if info and info[2] in _JPEG_COLORSPACES:
+                width, height, components, adobe = info
+                entries = f"/ColorSpace {_JPEG_COLORSPACES[components]} /BitsPerComponent 8 /Filter /DCTDecode"
+                if components == 4 and adobe:
+                    # Adobe CMYK JPEGs are stored inverted
+                    entries += " /Decode [1 0 1 0 1 0 1 0]"
+                return entries, data, width, height
+        elif data[:8] == PNG_SIGNATURE:
+            embedded = self._png_object(data)
+            if embedded:
+                return embedded
+        else:
+            logger.debug(f"Unrecognized {mime_type} page image, decoding")
+        return self._decoded_object(data)
+
+    def _png_object(self, data: bytes) -> Optional[Tuple[str, bytes, int, int]]:
+        """Embed a PNG's IDAT stream directly, if the PDF can represent it."""
+        header = None
+        palette = None
+        idat = []
+        for kind, body in _png_chunks(data):
+            if kind == b"IHDR":
+                header = struct.unpack(">IIBBBBB", body)
+            elif kind == b"PLTE":
+                palette = body
+            elif kind == b"IDAT":
+                idat.append(body)
+        if not header or not idat:
+            return None
+
+        width, height, bits, color_type, _, _, interlace = header
+        if interlace or color_type in (4, 6):
+            # Interlaced rows and alpha channels have no direct PDF equivalent
+            return None
+        if color_type == 0:
+            colorspace, colors = "/DeviceGray", 1
+        elif color_type == 2:
+            colorspace, colors = "/DeviceRGB", 3
+        elif color_type == 3 and palette:
+            hival = len(palette) // 3 - 1
+            colorspace, colors = f"[/Indexed /DeviceRGB {hival} <{palette.hex()}>]", 1
+        else:
+            return None
+
+        entries = (
+            f"/ColorSpace {colorspace} /BitsPerComponent {bits} /Filter /FlateDecode "
+            f"/DecodeParms << /Predictor 15 /Colors {colors} /BitsPerComponent {bits} /Columns {width} >>"
+        )
+        return entries, b"".join(idat), width, height
+
+    def _decoded_object(self, data: bytes) -> Tuple[str, bytes, int, int]:
+        """Fallback: decode one image to RGB and store it Flate-compressed."""
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as img:
+            if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+                # Flatten onto white, as a viewer would show the slide
+                rgba = img.convert("RGBA")
+                rgb = Image.new("RGB", rgba.size, "white")
+                rgb.paste(rgba, mask=rgba.getchannel("A"))
+            else:
+                rgb = img.convert("RGB")
+        stream = zlib.compress(rgb.tobytes(), 6)
+        return "/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode", stream, rgb.width, rgb.height
+
+    # ---- Pages ----
+
+    def add_page(self, index: int, image_data: bytes, mime_type: str = "image/png"):
+        """Append one slide image as the page at position index."""
+        if index in self._pages:
+            raise ValueError(f"Page {index} already added")
+        entries, stream, width, height = self._image_object(image_data, mime_type)
+
+        image_num = self._alloc()
+        self._write_object(
+            image_num,
+            f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} {entries} /Length {len(stream)} >>".encode("ascii"),
+            stream,
+        )
+
+        page_w = width * 72.0 / self.resolution
+        page_h = height * 72.0 / self.resolution
+        content = f"q {page_w:.4f} 0 0 {page_h:.4f} 0 0 cm /Im0 Do Q".encode("ascii")
+        content_num = self._alloc()
+        self._write_object(content_num, f"<< /Length {len(content)} >>".encode("ascii"), content)
+
+        page_num = self._alloc()
+        self._write_object(
+            page_num,
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_w:.4f} {page_h:.4f}] "
+                f"/Resources << /XObject << /Im0 {image_num} 0 R >> >> /Contents {content_num} 0 R >>"
+            ).encode("ascii"),
+        )
+        self._pages[index] = page_num
+        self._file.flush()
+
+    def close(self):
+        """Write the page tree, cross-reference table and trailer; finalize the file."""
+        kids: List[int] = [self._pages[i] for i in sorted(self._pages)]
+        self._write_object(
+            2, f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>".encode("ascii")
+        )
+        self._write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref_offset = self._file.tell()
+        size = self._next_obj
+        lines = [f"xref\n0 {size}\n".encode("ascii"), b"0000000000 65535 f \n"]
+        for num in range(1, size):
+            lines.append(f"{self._offsets[num]:010d} 00000 n \n".encode("ascii"))
+        self._write(b"".join(lines))
+        self._write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+        self._file.close()
+        os.replace(self._tmp_path, self.output_path)
+
+    def abort(self):
+        """Discard the partial file."""
+        self._file.close()
+        try:
+            self._tmp_path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self) -> "StreamingPDFWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
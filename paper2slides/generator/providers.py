@@ -5,6 +5,7 @@ Support multiple image generation backends (OpenRouter, Google GenAI, etc.)
 """
 import os
 import base64
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from typing import List, Dict, Tuple
@@ -14,11 +15,22 @@ from dataclasses import dataclass
 logger = logging.getLogger(__name__)
 
 
+def _reference_asset(img: Dict):
+    """Cached (prepared) FigureAsset behind a reference image dict, if it came from a file."""
+    if not img.get("path"):
+        return None
+    from ..utils.image_cache import get_figure_cache
+    asset = get_figure_cache().get(img["path"])
+    if asset is not None and img.get("profile"):
+        asset = asset.prepared(img["profile"])
+    return asset
+
+
 @dataclass
 class ImageGenerationRequest:
     """Request for image generation."""
     prompt: str
-    reference_images: List[Dict]  # List of {figure_id, caption, base64, mime_type}
+    reference_images: List[Dict]  # List of {figure_id, caption, base64, mime_type, path?, profile?}
     model: str = None
     aspect_ratio: str = "16:9"  # Default to landscape, use "9:16" for portrait
 
@@ -38,11 +50,23 @@ class ImageGenerationProvider(ABC):
         """Generate an image from prompt and reference images."""
         pass
 
+    async def agenerate_image(self, request: ImageGenerationRequest) -> ImageGenerationResponse:
+        """Async variant of generate_image.
+
+        Providers with a native async client override this; the default runs
+        the blocking call in a worker thread.
+        """
+        return await asyncio.to_thread(self.generate_image, request)
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model name for this provider."""
         pass
 
+    def get_provider_name(self) -> str:
+        """Provider key used for rate limiting (see utils.rate_limit)."""
+        return type(self).__name__
+
 
 class OpenRouterProvider(ImageGenerationProvider):
     """OpenRouter provider for Gemini image generation."""
@@ -68,10 +92,12 @@ class OpenRouterProvider(ImageGenerationProvider):
     def get_default_model(self) -> str:
         return self.default_model
 
-    def generate_image(self, request: ImageGenerationRequest) -> ImageGenerationResponse:
-        """Generate image using OpenRouter API."""
-        model = request.model or self.default_model
+    def get_provider_name(self) -> str:
+        from ..utils.rate_limit import provider_name
+        return provider_name(self.base_url)
 
+    def _build_content(self, request: ImageGenerationRequest) -> List[Dict]:
+        """Build the chat message content: prompt, then labeled reference images."""
         # Build message content
         content = [{"type": "text", "text": request.prompt}]
 
@@ -82,20 +108,13 @@ class OpenRouterProvider(ImageGenerationProvider):
                 caption = img.get("caption", "")
                 label = f"[{fig_id}]: {caption}" if caption else f"[{fig_id}]"
                 content.append({"type": "text", "text": label})
-                content.append({
-                    "type": "image_url",
-                    "image_url": {"url": f"data:{img['mime_type']};base64,{img['base64']}"}
-                })
-
-        logger.debug(f"Calling OpenRouter API with model: {model}, aspect_ratio: {request.aspect_ratio}")
-
-        # Call API
-        response = self.client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": content}],
-            extra_body={"modalities": ["image", "text"]}
-        )
+                asset = _reference_asset(img)
+                url = asset.data_url if asset is not None else f"data:{img['mime_type']};base64,{img['base64']}"
+                content.append({"type": "image_url", "image_url": {"url": url}})
+        return content
 
+    def _parse_response(self, response) -> ImageGenerationResponse:
+        """Extract the generated image from a chat completion."""
         # Extract image from response
         if not response or not hasattr(response, 'choices') or not response.choices:
             raise RuntimeError(f"Invalid API response: {response}")
@@ -116,6 +135,33 @@ class OpenRouterProvider(ImageGenerationProvider):
         logger.info(f"Image generated successfully via OpenRouter ({len(image_data)} bytes)")
         return ImageGenerationResponse(image_data=image_data, mime_type=mime_type)
 
+    def generate_image(self, request: ImageGenerationRequest) -> ImageGenerationResponse:
+        """Generate image using OpenRouter API."""
+        model = request.model or self.default_model
+        logger.debug(f"Calling OpenRouter API with model: {model}, aspect_ratio: {request.aspect_ratio}")
+
+        # Call API
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": self._build_content(request)}],
+            extra_body={"modalities": ["image", "text"]}
+        )
+        return self._parse_response(response)
+
+    async def agenerate_image(self, request: ImageGenerationRequest) -> ImageGenerationResponse:
+        """Generate image using OpenRouter API on the shared async client pool."""
+        from ..utils import get_async_client
+
+        model = request.model or self.default_model
+        logger.debug(f"Calling OpenRouter API (async) with model: {model}, aspect_ratio: {request.aspect_ratio}")
+
+        response = await get_async_client(self.api_key, self.base_url).chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": self._build_content(request)}],
+            extra_body={"modalities": ["image", "text"]}
+        )
+        return self._parse_response(response)
+
 
 class GoogleGenAIProvider(ImageGenerationProvider):
     """Google GenAI provider for Gemini image generation."""
@@ -149,10 +195,11 @@ class GoogleGenAIProvider(ImageGenerationProvider):
     def get_default_model(self) -> str:
         return self.default_model
 
-    def generate_image(self, request: ImageGenerationRequest) -> ImageGenerationResponse:
-        """Generate image using Google GenAI API."""
-        model_name = request.model or self.default_model
+    def get_provider_name(self) -> str:
+        return "google-genai"
 
+    def _build_request(self, request: ImageGenerationRequest):
+        """Build (contents, config) for generate_content."""
         # Build content list
         content_parts = []
 
@@ -168,17 +215,16 @@ class GoogleGenAIProvider(ImageGenerationProvider):
                 label = f"[{fig_id}]: {caption}" if caption else f"[{fig_id}]"
                 content_parts.append(label)
 
-                # Decode base64 to bytes
-                image_bytes = base64.b64decode(img['base64'])
-
-                # Create PIL Image from bytes
-                from PIL import Image
-                import io
-                pil_image = Image.open(io.BytesIO(image_bytes))
+                # Decoded once per run and shared across slides via the figure cache
+                asset = _reference_asset(img)
+                if asset is not None:
+                    pil_image = asset.image()
+                else:
+                    from PIL import Image
+                    import io
+                    pil_image = Image.open(io.BytesIO(base64.b64decode(img['base64'])))
                 content_parts.append(pil_image)
 
-        logger.debug(f"Calling Google GenAI API with model: {model_name}, aspect_ratio: {request.aspect_ratio}")
-
         # Configure generation with image output (following official example)
         # Use aspect_ratio from request (default 16:9 for slides, 9:16 for portrait posters)
         config = self.types.GenerateContentConfig(
@@ -188,48 +234,28 @@ class GoogleGenAIProvider(ImageGenerationProvider):
                 image_size="4K"       # High quality: "1K", "2K", "4K"
             )
         )
+        return content_parts, config
 
-        # Generate content using the new API
-        response = self.client.models.generate_content(
-            model=model_name,
-            contents=content_parts,
-            config=config
-        )
-
-        # Extract image from response.parts (following official example)
+    def _parse_response(self, response) -> ImageGenerationResponse:
+        """Extract the generated image from a generate_content response."""
+        # Take the encoded bytes straight from the inline data part: no
+        # re-encode through PIL and no temp file
         image_data = None
         mime_type = "image/png"
 
-        for part in response.parts:
+        for part in response.parts or []:
             # Check if this part has text
             if part.text is not None:
                 logger.debug(f"Response text: {part.text[:100]}...")
 
             # Check if this part has an image
-            try:
-                image = part.as_image()
-                if image:
-                    # Save to a temporary file path first (following official example pattern)
-                    import tempfile
-                    import os
-                    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                        tmp_path = tmp.name
-
-                    # Save using the pattern from official example
-                    image.save(tmp_path)
-
-                    # Read the file content
-                    with open(tmp_path, 'rb') as f:
-                        image_data = f.read()
-
-                    # Clean up
-                    os.unlink(tmp_path)
-
-                    mime_type = "image/png"
-                    break
-            except Exception as e:
-                logger.warning(f"Failed to extract image from part: {e}")
-                continue
+            inline = getattr(part, "inline_data", None)
+            if inline is not None and inline.data:
+                image_data = inline.data
+                if isinstance(image_data, str):
+                    image_data = base64.b64decode(image_data)
+                mime_type = inline.mime_type or mime_type
+                break
 
         if not image_data:
             raise RuntimeError("No image data in API response")
@@ -237,6 +263,33 @@ class GoogleGenAIProvider(ImageGenerationProvider):
         logger.info(f"Image generated successfully via Google GenAI ({len(image_data)} bytes)")
         return ImageGenerationResponse(image_data=image_data, mime_type=mime_type)
 
+    def generate_image(self, request: ImageGenerationRequest) -> ImageGenerationResponse:
+        """Generate image using Google GenAI API."""
+        model_name = request.model or self.default_model
+        logger.debug(f"Calling Google GenAI API with model: {model_name}, aspect_ratio: {request.aspect_ratio}")
+
+        content_parts, config = self._build_request(request)
+        # Generate content using the new API
+        response = self.client.models.generate_content(
+            model=model_name,
+            contents=content_parts,
+            config=config
+        )
+        return self._parse_response(response)
+
+    async def agenerate_image(self, request: ImageGenerationRequest) -> ImageGenerationResponse:
+        """Generate image using the Google GenAI async client."""
+        model_name = request.model or self.default_model
+        logger.debug(f"Calling Google GenAI API (async) with model: {model_name}, aspect_ratio: {request.aspect_ratio}")
+
+        content_parts, config = self._build_request(request)
+        response = await self.client.aio.models.generate_content(
+            model=model_name,
+            contents=content_parts,
+            config=config
+        )
+        return self._parse_response(response)
+
 
 class ProviderFactory:
     """Factory for creating image generation providers."""
@@ -6,9 +6,11 @@ import os
 import logging
 import argparse
 import asyncio
+from collections import Counter
 from pathlib import Path
+from typing import List
 
-from paper2slides.utils import setup_logging
+from paper2slides.utils import setup_logging, close_async_clients
 from paper2slides.utils.path_utils import (
     normalize_input_path,
     get_project_name,
@@ -19,6 +21,8 @@ from paper2slides.core import (
     get_config_dir,
     detect_start_stage,
     run_pipeline,
+    run_batch_pipeline,
+    BatchDocument,
     list_outputs,
     STAGES,
 )
@@ -66,6 +70,12 @@ def main():
                         help="Fast mode: parse only, no RAG indexing (direct LLM query)")
     parser.add_argument("--parallel", type=int, nargs='?', const=2, default=None,
                         help="Enable parallel slide generation with N workers (default: 2 if specified)")
+    parser.add_argument("--no-reuse", action="store_true",
+                        help="Regenerate every image instead of reusing unchanged slides from the previous run")
+    parser.add_argument("--batch", action="store_true",
+                        help="Treat each document in the input directory as a separate project and pipeline stages across them")
+    parser.add_argument("--stage-workers", type=_parse_stage_workers, default=None,
+                        help="Workers per stage for --batch, e.g. rag=1,summary=2,plan=2,generate=1")
     
     args = parser.parse_args()
     
@@ -106,8 +116,13 @@ def main():
         "language": args.language,
         "fast_mode": args.fast,
         "max_workers": args.parallel if args.parallel else 1,
+        "reuse_images": not args.no_reuse,
     }
     
+    if args.batch:
+        _run_batch(args, config)
+        return
+    
     # Determine paths
     project_name = get_project_name(args.input)
     base_dir = get_base_dir(args.output_dir, project_name, args.content)
@@ -128,7 +143,85 @@ def main():
         logger.info(f"Reusing existing checkpoints, starting from: {from_stage}")
     
     # Run pipeline (CLI mode: no session_id or session_manager for cancellation)
-    asyncio.run(run_pipeline(base_dir, config_dir, config, from_stage))
+    async def _run():
+        try:
+            await run_pipeline(base_dir, config_dir, config, from_stage)
+        finally:
+            await close_async_clients()
+    
+    asyncio.run(_run())
+
+
+BATCH_SUFFIXES = {".pdf", ".doc", ".docx", ".ppt", ".pptx", ".md", ".txt"}
+
+
+def _parse_stage_workers(spec: str) -> dict:
+    """Parse 'rag=1,summary=2' into a stage -> workers dict (argparse type)."""
+    workers = {}
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        stage, _, count = item.partition("=")
+        if stage not in STAGES or not count.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"invalid stage worker spec {item!r} (expected e.g. rag=1,summary=2)"
+            )
+        workers[stage] = int(count)
+    return workers
+
+
+def _batch_project_names(files: List[Path]) -> List[str]:
+    """Project name per batch file; files sharing a stem get their suffix appended.
+
+    paper.pdf and paper.md would otherwise share one output directory (and
+    rag storage and state.json) while running concurrently.
+    """
+    names = [get_project_name(str(f)) for f in files]
+    counts = Counter(name.lower() for name in names)
+    return [
+        f"{name}_{f.suffix.lstrip('.').lower()}" if counts[name.lower()] > 1 else name
+        for name, f in zip(names, files)
+    ]
+
+
+def _run_batch(args, config: dict):
+    """Run every document in a directory through the pipelined batch runner."""
+    input_dir = Path(config["input_path"])
+    if not input_dir.is_dir():
+        logger.error("--batch requires a directory input")
+        return
+    
+    files = sorted(p for p in input_dir.iterdir() if p.is_file() and p.suffix.lower() in BATCH_SUFFIXES)
+    if not files:
+        logger.error(f"No documents found in {input_dir}")
+        return
+    
+    documents = []
+    for file_path, project_name in zip(files, _batch_project_names(files)):
+        doc_config = {**config, "input_path": str(file_path)}
+        base_dir = get_base_dir(args.output_dir, project_name, args.content)
+        config_dir = get_config_dir(base_dir, doc_config)
+        from_stage = args.from_stage or detect_start_stage(base_dir, config_dir, doc_config)
+        documents.append(BatchDocument(
+            name=project_name,
+            base_dir=base_dir,
+            config_dir=config_dir,
+            config=doc_config,
+            from_stage=from_stage,
+        ))
+        logger.info(f"  {file_path.name}: start from {from_stage}")
+    
+    # Concurrent stages of two documents must never share a directory
+    shared = [d for d, n in Counter(str(doc.base_dir).lower() for doc in documents).items() if n > 1]
+    if shared:
+        logger.error(f"Documents would share an output directory: {', '.join(shared)}")
+        return
+    
+    async def _run():
+        try:
+            await run_batch_pipeline(documents, stage_workers=args.stage_workers)
+        finally:
+            await close_async_clients()
+    
+    asyncio.run(_run())
 
 
 if __name__ == "__main__":
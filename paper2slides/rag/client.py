@@ -15,6 +15,17 @@ from lightrag.llm.openai import openai_complete_if_cache, openai_embed
 from lightrag.utils import EmbeddingFunc
 
 from .config import RAGConfig
+from paper2slides.utils.rate_limit import get_rate_limiter, provider_name, estimate_tokens
+from paper2slides.utils.metrics import payload_bytes
+
+# LightRAG's OpenAI helpers already retry internally; the limiter adds
+# budgets, AIMD concurrency and Retry-After pauses, with one extra retry
+_LIGHTRAG_EXTRA_RETRIES = 1
+
+
+def _describe_text(result) -> Dict[str, Any]:
+    """Run-metrics fields of a LightRAG completion (a string unless streaming)."""
+    return {"response_bytes": len(result)} if isinstance(result, str) else {}
 
 
 class RAGClient:
@@ -61,18 +72,28 @@ class RAGClient:
             kwargs["base_url"] = api.llm_base_url
         return kwargs
     
+    def _get_llm_limiter(self, model: str):
+        return get_rate_limiter(provider_name(self.config.api.llm_base_url), model)
+    
     def _create_llm_func(self) -> Callable:
         api = self.config.api
         api_kwargs = self._get_api_kwargs()
+        limiter = self._get_llm_limiter(api.llm_model)
         
-        def func(prompt: str, system_prompt: Optional[str] = None,
-                 history_messages: List = None, **kwargs):
-            return openai_complete_if_cache(
-                api.llm_model, prompt,
-                system_prompt=system_prompt,
-                history_messages=history_messages or [],
-                **api_kwargs,
-                **kwargs,
+        async def func(prompt: str, system_prompt: Optional[str] = None,
+                       history_messages: List = None, **kwargs):
+            return await limiter.call(
+                lambda: openai_complete_if_cache(
+                    api.llm_model, prompt,
+                    system_prompt=system_prompt,
+                    history_messages=history_messages or [],
+                    **api_kwargs,
+                    **kwargs,
+                ),
+                tokens=estimate_tokens([system_prompt, history_messages, prompt]),
+                max_retries=_LIGHTRAG_EXTRA_RETRIES,
+                request_bytes=payload_bytes([system_prompt, history_messages, prompt]),
+                describe=_describe_text,
             )
         return func
     
@@ -80,23 +101,31 @@ class RAGClient:
         api = self.config.api
         api_kwargs = self._get_api_kwargs()
         llm_func = self._create_llm_func()
+        limiter = self._get_llm_limiter(api.llm_model)
         
-        def func(prompt: str, system_prompt: Optional[str] = None,
-                 history_messages: List = None, image_data: Optional[str] = None,
-                 messages: Optional[List] = None, **kwargs):
-            if messages:
-                return openai_complete_if_cache(
+        def complete(messages: List, **kwargs):
+            return limiter.call(
+                lambda: openai_complete_if_cache(
                     api.llm_model, "",
                     system_prompt=None, history_messages=[],
                     messages=messages,
                     **api_kwargs,
                     **kwargs,
-                )
+                ),
+                tokens=estimate_tokens(messages),
+                max_retries=_LIGHTRAG_EXTRA_RETRIES,
+                request_bytes=payload_bytes(messages),
+                describe=_describe_text,
+            )
+        
+        def func(prompt: str, system_prompt: Optional[str] = None,
+                 history_messages: List = None, image_data: Optional[str] = None,
+                 messages: Optional[List] = None, **kwargs):
+            if messages:
+                return complete(messages, **kwargs)
             elif image_data:
-                return openai_complete_if_cache(
-                    api.llm_model, "",
-                    system_prompt=None, history_messages=[],
-                    messages=[
+                return complete(
+                    [
                         {"role": "system", "content": system_prompt} if system_prompt else None,
                         {
                             "role": "user",
@@ -106,7 +135,6 @@ class RAGClient:
                             ],
                         } if image_data else {"role": "user", "content": prompt},
                     ],
-                    **api_kwargs,
                     **kwargs,
                 )
             else:
@@ -116,12 +144,19 @@ class RAGClient:
     def _create_embedding_func(self) -> EmbeddingFunc:
         api = self.config.api
         api_kwargs = self._get_api_kwargs()
+        limiter = self._get_llm_limiter(api.embedding_model)
         return EmbeddingFunc(
             embedding_dim=api.embedding_dim,
             max_token_size=api.embedding_max_tokens,
-            func=lambda texts: openai_embed(
-                texts, model=api.embedding_model,
-                **api_kwargs,
+            func=lambda texts: limiter.call(
+                lambda: openai_embed(
+                    texts, model=api.embedding_model,
+                    **api_kwargs,
+                ),
+                tokens=estimate_tokens(texts, max_output=0),
+                max_retries=_LIGHTRAG_EXTRA_RETRIES,
+                kind="embedding",
+                request_bytes=payload_bytes(texts),
             ),
         )
     
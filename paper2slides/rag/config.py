@@ -99,6 +99,14 @@ class ParserConfig:
     enable_equation_processing: bool = field(
         default_factory=lambda: os.getenv("ENABLE_EQUATION_PROCESSING", "true").lower() == "true"
     )
+    description_batch_size: int = field(
+        default_factory=lambda: int(os.getenv("DESCRIPTION_BATCH_SIZE", "1"))
+    )
+    """Images, tables or equations described per LLM request (1 = one request per item)."""
+    enable_description_cache: bool = field(
+        default_factory=lambda: os.getenv("ENABLE_DESCRIPTION_CACHE", "true").lower() == "true"
+    )
+    """Reuse descriptions of identical images, tables and equations across documents."""
 
 
 @dataclass
@@ -124,6 +132,36 @@ class BatchConfig:
     """Whether to recursively process subfolders in batch mode."""
 
 
+@dataclass
+class ConcurrencyConfig:
+    """Per-phase concurrency of multimodal indexing. Aligned with RAGAnythingConfig defaults."""
+    
+    description_max_async: int = field(
+        default_factory=lambda: int(os.getenv("DESCRIPTION_MAX_ASYNC", "8"))
+    )
+    """Maximum concurrent multimodal description (vision/LLM) requests."""
+    
+    adaptive_description_concurrency: bool = field(
+        default_factory=lambda: os.getenv("ADAPTIVE_DESCRIPTION_CONCURRENCY", "true").lower() == "true"
+    )
+    """Tune description concurrency up to description_max_async from observed latency."""
+    
+    extraction_max_async: int = field(
+        default_factory=lambda: int(os.getenv("EXTRACTION_MAX_ASYNC", "0"))
+    )
+    """Concurrent entity-extraction LLM calls per document (0 = LightRAG's llm_model_max_async)."""
+    
+    merge_max_async: int = field(
+        default_factory=lambda: int(os.getenv("MERGE_MAX_ASYNC", "0"))
+    )
+    """Concurrent entity/relation merges per document (0 = LightRAG's default)."""
+    
+    max_concurrent_merges: int = field(
+        default_factory=lambda: int(os.getenv("MAX_CONCURRENT_MERGES", "0"))
+    )
+    """Documents merging into the knowledge graph at once (0 = LightRAG's max_parallel_insert)."""
+
+
 @dataclass
 class ContextConfig:
     """Context extraction settings. Aligned with RAGAnythingConfig defaults."""
@@ -180,6 +218,7 @@ class RAGConfig:
     parser: ParserConfig = field(default_factory=ParserConfig)
     batch: BatchConfig = field(default_factory=BatchConfig)
     context: ContextConfig = field(default_factory=ContextConfig)
+    concurrency: ConcurrencyConfig = field(default_factory=ConcurrencyConfig)
     verbose: bool = field(
         default_factory=lambda: os.getenv("VERBOSE", "false").lower() == "true"
     )
@@ -220,6 +259,15 @@ class RAGConfig:
             enable_image_processing=self.parser.enable_image_processing,
             enable_table_processing=self.parser.enable_table_processing,
             enable_equation_processing=self.parser.enable_equation_processing,
+            description_batch_size=self.parser.description_batch_size,
+            enable_description_cache=self.parser.enable_description_cache,
+            description_cache_model=self.api.llm_model,
+            # Concurrency
+            description_max_async=self.concurrency.description_max_async,
+            adaptive_description_concurrency=self.concurrency.adaptive_description_concurrency,
+            extraction_max_async=self.concurrency.extraction_max_async,
+            merge_max_async=self.concurrency.merge_max_async,
+            max_concurrent_merges=self.concurrency.max_concurrent_merges,
             # Batch
             max_concurrent_files=self.batch.max_concurrent_files,
             supported_file_extensions=self.batch.supported_file_extensions,
@@ -158,7 +158,7 @@ def _parse_queries_from_response(text: str) -> List[str]:
     
     return queries
 
-def generate_general_queries(
+async def generate_general_queries(
     rag_client: "RAGClient",
     overview: str,
     count: int = 20,
@@ -171,7 +171,7 @@ def generate_general_queries(
         overview: Document overview text
         count: Number of queries to generate
     """
-    from openai import OpenAI
+    from ..utils import get_async_client, chat_completion
     
     prompt = _GENERATE_GENERAL_QUERIES_PROMPT.format(
         overview=_truncate_overview(overview),
@@ -181,12 +181,13 @@ def generate_general_queries(
     try:
         config = rag_client.config.api
         
-        client = OpenAI(
+        client = get_async_client(
             api_key=config.llm_api_key,
             base_url=config.llm_base_url,
         )
         
-        response = client.chat.completions.create(
+        response = await chat_completion(
+            client,
             model=config.llm_model,
             messages=[{
                 "role": "user",
@@ -11,6 +11,7 @@ from typing import List, Dict, Any, Optional, TYPE_CHECKING
 import time
 
 from .batch_parser import BatchParser, BatchProcessingResult
+from .parse_cache import find_markdown, read_parser_output
 
 if TYPE_CHECKING:
     from .config import RAGAnythingConfig
@@ -26,6 +27,10 @@ class BatchMixin:
     # Type hints for methods that will be available from other mixins
     async def _ensure_lightrag_initialized(self) -> None: ...
     async def process_document_complete(self, file_path: str, **kwargs) -> None: ...
+    def _generate_cache_key(self, file_path: Path, *args, **kwargs) -> str: ...
+    def _generate_content_based_doc_id(self, content_list: List[Dict[str, Any]]) -> str: ...
+    async def _get_cached_result(self, cache_key: str, *args, **kwargs): ...
+    async def _store_cached_result(self, cache_key: str, *args, **kwargs) -> None: ...
 
     # ==========================================
     # ORIGINAL BATCH PROCESSING METHOD (RESTORED)
@@ -280,6 +285,35 @@ class BatchMixin:
         batch_parser = BatchParser(parser_type=self.config.parser)
         return batch_parser.filter_supported_files(file_paths, recursive)
 
+    async def _cache_parser_output(
+        self, file_path: str, output_dir: str, parse_method: str, **kwargs
+    ) -> None:
+        """Store the parser output of a batch-parsed file in the parse cache"""
+        try:
+            content_list = read_parser_output(
+                file_path,
+                output_dir,
+                self.config.parser,
+                parse_method,
+                kwargs.get("backend"),
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not read parser output for {file_path}: {e}")
+            return
+        if not content_list:
+            return
+
+        file_path = Path(file_path)
+        await self._store_cached_result(
+            self._generate_cache_key(file_path, parse_method, **kwargs),
+            content_list,
+            self._generate_content_based_doc_id(content_list),
+            file_path,
+            parse_method,
+            markdown_paths=find_markdown(output_dir, file_path.stem),
+            **kwargs,
+        )
+
     async def process_documents_with_rag_batch(
         self,
         file_paths: List[str],
@@ -323,21 +357,55 @@ class BatchMixin:
 
         self.logger.info("Starting batch processing with RAG integration")
 
-        # Step 1: Parse documents in batch
-        parse_result = self.process_documents_batch(
-            file_paths=file_paths,
+        # Initialize RAG system first: its parse cache decides what to parse
+        await self._ensure_lightrag_initialized()
+
+        # Step 1: Parse documents in batch, skipping files with a valid cache entry
+        cached_files = []
+        files_to_parse = []
+        for file_path in self.filter_supported_files(file_paths, recursive):
+            cache_key = self._generate_cache_key(Path(file_path), parse_method, **kwargs)
+            if await self._get_cached_result(
+                cache_key, Path(file_path), parse_method, **kwargs
+            ):
+                cached_files.append(file_path)
+            else:
+                files_to_parse.append(file_path)
+
+        if cached_files:
+            self.logger.info(
+                f"Skipping parse for {len(cached_files)} file(s) with cached results"
+            )
+
+        parse_result = BatchProcessingResult(
+            successful_files=[],
+            failed_files=[],
+            total_files=0,
+            processing_time=0.0,
+            errors={},
             output_dir=output_dir,
-            parse_method=parse_method,
-            max_workers=max_workers,
-            recursive=recursive,
-            show_progress=show_progress,
-            **kwargs,
         )
+        if files_to_parse:
+            parse_result = self.process_documents_batch(
+                file_paths=files_to_parse,
+                output_dir=output_dir,
+                parse_method=parse_method,
+                max_workers=max_workers,
+                recursive=recursive,
+                show_progress=show_progress,
+                **kwargs,
+            )
+            # Record the batch output so process_document_complete reuses it
+            # instead of parsing every document a second time
+            for file_path in parse_result.successful_files:
+                await self._cache_parser_output(
+                    file_path, output_dir, parse_method, **kwargs
+                )
 
-        # Step 2: Process with RAG
-        # Initialize RAG system
-        await self._ensure_lightrag_initialized()
+        parse_result.successful_files = cached_files + parse_result.successful_files
+        parse_result.total_files += len(cached_files)
 
+        # Step 2: Process with RAG
         # Then, process each successful file with RAG
         rag_results = {}
 
@@ -5,11 +5,16 @@ This module provides functionality for processing multiple documents in parallel
 with progress reporting and error handling.
 """
 
+import os
+import signal
 import asyncio
 import logging
+import multiprocessing
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from multiprocessing.connection import wait
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import time
 
@@ -48,6 +53,107 @@ class BatchProcessingResult:
         )
 
 
+DEFAULT_THREAD_WORKERS = 4
+DEFAULT_MEMORY_PER_WORKER_MB = 2048
+# A newly started job keeps its memory reservation this long, until its
+# model loads show up in the available-memory figure
+ADMISSION_WARMUP_SECONDS = 15.0
+
+
+def _meminfo_mb(field_name: str) -> Optional[int]:
+    """Memory figure in MB from psutil or /proc/meminfo, None if unknown"""
+    try:
+        import psutil
+
+        memory = psutil.virtual_memory()
+        return int(getattr(memory, "available" if field_name == "MemAvailable" else "total") / 2**20)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith(field_name + ":"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def _make_parser(parser_type: str):
+    if parser_type == "mineru":
+        return MineruParser()
+    if parser_type == "docling":
+        return DoclingParser()
+    raise ValueError(f"Unsupported parser type: {parser_type}")
+
+
+def _process_worker_loop(conn, parser_type: str):
+    """Entry point of a process-mode worker: parse files sent over conn until None."""
+    from .mineru_worker import parse_inline
+
+    if hasattr(os, "setsid"):
+        # Own process group, so a timeout also stops parser subprocesses (mineru CLI)
+        os.setsid()
+    # This process is long-lived itself: run MinerU here instead of nesting a worker pool
+    parse_inline()
+    parser = _make_parser(parser_type)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        file_path, output_dir, parse_method, kwargs = job
+        try:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            parser.parse_document(
+                file_path=file_path, output_dir=output_dir, method=parse_method, **kwargs
+            )
+            conn.send((True, None))
+        except Exception as e:
+            conn.send((False, f"Failed to process {file_path}: {str(e)}"))
+
+
+class _ProcessWorker:
+    """One long-lived parser process and the job it is running."""
+
+    def __init__(self, context, parser_type: str):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_process_worker_loop, args=(child_conn, parser_type)
+        )
+        self.process.start()
+        child_conn.close()
+        self.file_path: Optional[str] = None
+        self.started_at = 0.0
+
+    def submit(self, job: Tuple[str, str, str, Dict[str, Any]]):
+        self.file_path = job[0]
+        self.started_at = time.monotonic()
+        self.conn.send(job)
+
+    def stop(self, kill: bool = False):
+        if kill:
+            try:
+                if hasattr(os, "killpg"):
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                else:
+                    self.process.kill()
+            except (ProcessLookupError, PermissionError):
+                self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
 class BatchParser:
     """
     Batch document parser with parallel processing capabilities
@@ -59,34 +165,43 @@ class BatchParser:
     def __init__(
         self,
         parser_type: str = "mineru",
-        max_workers: int = 4,
+        max_workers: Optional[int] = None,
         show_progress: bool = True,
         timeout_per_file: int = 300,
         skip_installation_check: bool = False,
+        execution_mode: str = "thread",
+        memory_per_worker_mb: Optional[int] = None,
     ):
         """
         Initialize batch parser
 
         Args:
             parser_type: Type of parser to use ("mineru" or "docling")
-            max_workers: Maximum number of parallel workers
+            max_workers: Maximum number of parallel workers (default: sized to the host)
             show_progress: Whether to show progress bars
             timeout_per_file: Timeout in seconds for each file
             skip_installation_check: Skip parser installation check (useful for testing)
+            execution_mode: "thread" (parsers running external processes) or
+                "process" (long-lived worker processes, for CPU-bound parsing and
+                post-processing)
+            memory_per_worker_mb: Expected peak memory of one process-mode worker,
+                used to size the pool and to admit jobs only while that much memory
+                is available (default PARSER_WORKER_MEMORY_MB or 2048)
         """
+        if execution_mode not in ("thread", "process"):
+            raise ValueError(f"Unsupported execution mode: {execution_mode}")
         self.parser_type = parser_type
-        self.max_workers = max_workers
+        self.execution_mode = execution_mode
+        self.memory_per_worker_mb = memory_per_worker_mb or int(
+            os.getenv("PARSER_WORKER_MEMORY_MB", DEFAULT_MEMORY_PER_WORKER_MB)
+        )
+        self.max_workers = max_workers or self._default_workers()
         self.show_progress = show_progress
         self.timeout_per_file = timeout_per_file
         self.logger = logging.getLogger(__name__)
 
         # Initialize parser
-        if parser_type == "mineru":
-            self.parser = MineruParser()
-        elif parser_type == "docling":
-            self.parser = DoclingParser()
-        else:
-            raise ValueError(f"Unsupported parser type: {parser_type}")
+        self.parser = _make_parser(parser_type)
 
         # Check parser installation (optional)
         if not skip_installation_check:
@@ -98,6 +213,31 @@ class BatchParser:
                 )
                 # Don't raise an error, just warn - the parser might still work
 
+    def _default_workers(self) -> int:
+        """Worker count for this host"""
+        if self.execution_mode == "thread":
+            return DEFAULT_THREAD_WORKERS
+        cpus = os.cpu_count() or 1
+        workers = max(1, cpus - 1)
+        total_mb = _meminfo_mb("MemTotal")
+        if total_mb:
+            workers = min(workers, max(1, total_mb // self.memory_per_worker_mb))
+        return workers
+
+    def _admit(self, running: List[_ProcessWorker]) -> bool:
+        """Whether another job may start without exceeding available memory"""
+        if not running:
+            return True
+        available_mb = _meminfo_mb("MemAvailable")
+        if available_mb is None:
+            return True
+        now = time.monotonic()
+        # Jobs still loading models have not claimed their memory yet
+        warming = sum(
+            1 for w in running if now - w.started_at < ADMISSION_WARMUP_SECONDS
+        )
+        return available_mb - warming * self.memory_per_worker_mb >= self.memory_per_worker_mb
+
     def get_supported_extensions(self) -> List[str]:
         """Get list of supported file extensions"""
         return list(
@@ -198,6 +338,76 @@ class BatchParser:
             self.logger.error(error_msg)
             return False, file_path, error_msg
 
+    def _process_in_workers(
+        self,
+        files: List[str],
+        output_dir: str,
+        parse_method: str,
+        kwargs: Dict[str, Any],
+        successful_files: List[str],
+        failed_files: List[str],
+        errors: Dict[str, str],
+        pbar: Optional[tqdm],
+    ) -> None:
+        """
+        Parse files in long-lived worker processes
+
+        Workers start on demand up to max_workers, each new job only while
+        memory for another worker is available. A file running longer than
+        timeout_per_file has its worker killed (and replaced) and is reported
+        as failed.
+        """
+        context = multiprocessing.get_context("spawn")
+        pending = deque(files)
+        idle: List[_ProcessWorker] = []
+        running: List[_ProcessWorker] = []
+
+        def finish(worker: _ProcessWorker, success: bool, error_msg: Optional[str]):
+            running.remove(worker)
+            if success:
+                successful_files.append(worker.file_path)
+            else:
+                failed_files.append(worker.file_path)
+                errors[worker.file_path] = error_msg
+                self.logger.error(error_msg)
+            if pbar:
+                pbar.update(1)
+
+        try:
+            while pending or running:
+                # Admission: start jobs while workers and memory allow
+                while pending and len(running) < self.max_workers and self._admit(running):
+                    worker = idle.pop() if idle else _ProcessWorker(context, self.parser_type)
+                    worker.submit((pending.popleft(), str(output_dir), parse_method, kwargs))
+                    running.append(worker)
+
+                ready = wait([w.conn for w in running], timeout=0.5)
+                for worker in [w for w in running if w.conn in ready]:
+                    try:
+                        success, error_msg = worker.conn.recv()
+                    except (EOFError, OSError):
+                        finish(worker, False, f"Failed to process {worker.file_path}: worker process exited")
+                        worker.stop(kill=True)
+                        continue
+                    finish(worker, success, error_msg)
+                    idle.append(worker)
+
+                now = time.monotonic()
+                for worker in [w for w in running if now - w.started_at > self.timeout_per_file]:
+                    finish(
+                        worker,
+                        False,
+                        f"Failed to process {worker.file_path}: timed out after {self.timeout_per_file}s",
+                    )
+                    worker.stop(kill=True)
+        finally:
+            for worker in running:
+                failed_files.append(worker.file_path)
+                errors[worker.file_path] = f"Processing interrupted: {worker.file_path}"
+                worker.stop(kill=True)
+            for worker in idle:
+                worker.stop()
+
     def process_batch(
         self,
         file_paths: List[str],
@@ -255,49 +465,70 @@ class BatchParser:
                 unit="file",
             )
 
-        try:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_file = {
-                    executor.submit(
-                        self.process_single_file,
-                        file_path,
-                        output_dir,
-                        parse_method,
-                        **kwargs,
-                    ): file_path
-                    for file_path in supported_files
-                }
-
-                # Process completed tasks
-                for future in as_completed(
-                    future_to_file, timeout=self.timeout_per_file
-                ):
-                    success, file_path, error_msg = future.result()
-
-                    if success:
-                        successful_files.append(file_path)
-                    else:
+        if self.execution_mode == "process":
+            try:
+                self._process_in_workers(
+                    supported_files,
+                    output_dir,
+                    parse_method,
+                    kwargs,
+                    successful_files,
+                    failed_files,
+                    errors,
+                    pbar,
+                )
+            finally:
+                if pbar:
+                    pbar.close()
+        else:
+            if self.parser_type == "mineru":
+                # Each thread runs one MinerU job; keep as many worker processes
+                from .mineru_worker import reserve_workers
+
+                reserve_workers(min(self.max_workers, len(supported_files)))
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    # Submit all tasks
+                    future_to_file = {
+                        executor.submit(
+                            self.process_single_file,
+                            file_path,
+                            output_dir,
+                            parse_method,
+                            **kwargs,
+                        ): file_path
+                        for file_path in supported_files
+                    }
+
+                    # Process completed tasks
+                    for future in as_completed(
+                        future_to_file, timeout=self.timeout_per_file
+                    ):
+                        success, file_path, error_msg = future.result()
+
+                        if success:
+                            successful_files.append(file_path)
+                        else:
+                            failed_files.append(file_path)
+                            errors[file_path] = error_msg
+
+                        if pbar:
+                            pbar.update(1)
+
+            except Exception as e:
+                self.logger.error(f"Batch processing failed: {str(e)}")
+                # Mark remaining files as failed
+                for future in future_to_file:
+                    if not future.done():
+                        file_path = future_to_file[future]
                         failed_files.append(file_path)
-                        errors[file_path] = error_msg
-
-                    if pbar:
-                        pbar.update(1)
-
-        except Exception as e:
-            self.logger.error(f"Batch processing failed: {str(e)}")
-            # Mark remaining files as failed
-            for future in future_to_file:
-                if not future.done():
-                    file_path = future_to_file[future]
-                    failed_files.append(file_path)
-                    errors[file_path] = f"Processing interrupted: {str(e)}"
-                    if pbar:
-                        pbar.update(1)
+                        errors[file_path] = f"Processing interrupted: {str(e)}"
+                        if pbar:
+                            pbar.update(1)
 
-        finally:
-            if pbar:
-                pbar.close()
+            finally:
+                if pbar:
+                    pbar.close()
 
         processing_time = time.time() - start_time
 
@@ -370,7 +601,16 @@ def main():
         help="Parsing method",
     )
     parser.add_argument(
-        "--workers", type=int, default=4, help="Number of parallel workers"
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parallel workers (default: sized to the host)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["thread", "process"],
+        default="thread",
+        help="Run parsers in threads or in worker processes",
     )
     parser.add_argument(
         "--no-progress", action="store_true", help="Disable progress bar"
@@ -398,6 +638,7 @@ def main():
         batch_parser = BatchParser(
             parser_type=args.parser,
             max_workers=args.workers,
+            execution_mode=args.mode,
             show_progress=not args.no_progress,
             timeout_per_file=args.timeout,
         )
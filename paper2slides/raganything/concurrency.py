@@ -0,0 +1,153 @@
+"""
+Concurrency pools for the phases of multimodal indexing
+
+Description generation (vision/LLM calls), entity extraction and graph
+merges have different bottlenecks, so each gets its own limit instead of
+sharing LightRAG's max_parallel_insert. A pool can tune its limit from
+observed latency: it grows while call latency stays near the best seen and
+shrinks when latency climbs, which is how an overloaded endpoint shows up
+before it starts returning 429s. Provider budgets and 429 handling stay in
+the shared rate limiter (paper2slides.utils.rate_limit).
+"""
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Latency thresholds relative to the best smoothed latency seen
+_GROW_BELOW = 1.5
+_SHRINK_ABOVE = 2.0
+# Weight of the newest sample in the smoothed latency
+_EWMA_WEIGHT = 0.2
+# Starting limit of adaptive pools
+_ADAPTIVE_START = 4
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ConcurrencyPool:
+    """Concurrency limit for one phase, optionally adapted to latency.
+
+    State is plain counters guarded by a thread lock, like RateLimiter, so a
+    pool is not tied to the event loop it was first used on. Waiters park on
+    a future of their own loop and are woken by release, in FIFO order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        adaptive: bool = False,
+        min_limit: int = 1,
+    ):
+        self.name = name
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.adaptive = adaptive
+        self.limit = float(min(_ADAPTIVE_START, self.max_limit) if adaptive else self.max_limit)
+        self.in_flight = 0
+        self._latency: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.stats = {"calls": 0, "failed": 0, "wait_seconds": 0.0}
+
+    async def _acquire(self):
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                if self.in_flight < max(1, int(self.limit)):
+                    self.in_flight += 1
+                    self.stats["wait_seconds"] += time.monotonic() - start
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    else:
+                        # Woken but cancelled: pass the wake-up on
+                        self._wake()
+                raise
+
+    def _wake(self):
+        """Wake waiters for the free slots (caller holds the lock)"""
+        free = max(1, int(self.limit)) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            try:
+                waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+            except RuntimeError:
+                # Waiter's loop is closed
+                continue
+            free -= 1
+
+    def _release(self, latency: Optional[float]):
+        with self._lock:
+            self.in_flight -= 1
+            if latency is None:
+                self.stats["failed"] += 1
+            else:
+                self.stats["calls"] += 1
+                if self.adaptive:
+                    self._adapt(latency)
+            self._wake()
+
+    def _adapt(self, latency: float):
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += _EWMA_WEIGHT * (latency - self._latency)
+        if self._best_latency is None or self._latency < self._best_latency:
+            self._best_latency = self._latency
+
+        if self._latency <= self._best_latency * _GROW_BELOW:
+            # Additive increase: about +1 per `limit` calls at good latency
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / max(1.0, self.limit))
+        elif self._latency > self._best_latency * _SHRINK_ABOVE:
+            # Decrease at most once per smoothed call duration, so the calls
+            # already in flight count as one signal
+            now = time.monotonic()
+            if now - self._last_decrease >= self._latency:
+                old = int(self.limit)
+                self.limit = max(float(self.min_limit), self.limit * 0.75)
+                self._last_decrease = now
+                if int(self.limit) != old:
+                    logger.info(
+                        f"[{self.name}] latency {self._latency:.1f}s, concurrency limit -> {int(self.limit)}"
+                    )
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one slot of the pool for the duration of the block"""
+        await self._acquire()
+        start = time.monotonic()
+        latency = None
+        try:
+            yield
+            latency = time.monotonic() - start
+        finally:
+            self._release(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "max_limit": self.max_limit,
+                "adaptive": self.adaptive,
+                "in_flight": self.in_flight,
+                "latency": round(self._latency, 3) if self._latency is not None else None,
+                **self.stats,
+            }
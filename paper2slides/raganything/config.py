@@ -51,6 +51,46 @@ class RAGAnythingConfig:
     )
     """Enable equation content processing."""
 
+    description_batch_size: int = field(
+        default=get_env_value("DESCRIPTION_BATCH_SIZE", 1, int)
+    )
+    """Images, tables or equations described per LLM request (1 = one request per item)."""
+
+    enable_description_cache: bool = field(
+        default=get_env_value("ENABLE_DESCRIPTION_CACHE", True, bool)
+    )
+    """Reuse descriptions of identical images, tables and equations across documents."""
+
+    description_cache_model: str = field(
+        default=get_env_value("DESCRIPTION_CACHE_MODEL", "", str)
+    )
+    """Model name in description cache keys (empty = LightRAG's llm_model_name)."""
+
+    # Concurrency Configuration
+    # ---
+    description_max_async: int = field(
+        default=get_env_value("DESCRIPTION_MAX_ASYNC", 8, int)
+    )
+    """Maximum concurrent multimodal description (vision/LLM) requests."""
+
+    adaptive_description_concurrency: bool = field(
+        default=get_env_value("ADAPTIVE_DESCRIPTION_CONCURRENCY", True, bool)
+    )
+    """Tune description concurrency up to description_max_async from observed latency."""
+
+    extraction_max_async: int = field(
+        default=get_env_value("EXTRACTION_MAX_ASYNC", 0, int)
+    )
+    """Concurrent entity-extraction LLM calls per document (0 = LightRAG's llm_model_max_async)."""
+
+    merge_max_async: int = field(default=get_env_value("MERGE_MAX_ASYNC", 0, int))
+    """Concurrent entity/relation merges per document (0 = LightRAG's default, 2 x llm_model_max_async)."""
+
+    max_concurrent_merges: int = field(
+        default=get_env_value("MAX_CONCURRENT_MERGES", 0, int)
+    )
+    """Documents merging into the knowledge graph at once (0 = LightRAG's max_parallel_insert)."""
+
     # Batch Processing Configuration
     # ---
     max_concurrent_files: int = field(
@@ -0,0 +1,135 @@
+"""
+Persistent cache of multimodal item descriptions
+
+Descriptions of images, tables and equations are keyed by what the model
+actually sees rather than by document or file path: a hash of the item
+content (image bytes, table body, equation LaTeX plus captions), a hash of
+the surrounding context, the predefined entity name if any, and the model.
+The same figure in a revised preprint, or a paper indexed again in another
+session, is then described once. Entries live in a LightRAG KV storage
+namespace next to the parse cache.
+"""
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompts or the stored layout change so old entries are ignored
+CACHE_VERSION = 1
+
+
+def content_hash(*parts: Union[bytes, str, None]) -> str:
+    """sha256 over the given parts, each length-prefixed so boundaries count"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            part = b""
+        elif isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class DescriptionCache:
+    """Description lookups and stores over a LightRAG KV storage, with hit stats.
+
+    Writes are upserted in memory and persisted by flush(), so a document
+    with hundreds of items does not rewrite the storage file per item.
+    """
+
+    def __init__(self, storage, model: str = ""):
+        self.storage = storage
+        self.model = model
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    def key(
+        self,
+        content_type: str,
+        content_digest: str,
+        context: str = "",
+        entity_name: Optional[str] = None,
+    ) -> str:
+        """Cache key of one item; context is hashed, not stored"""
+        return "desc-" + content_hash(
+            str(CACHE_VERSION),
+            self.model,
+            content_type,
+            content_digest,
+            content_hash(context),
+            entity_name,
+        )
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    async def get(
+        self, key: str, count_miss: bool = True
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Cached (description, entity_info) for key, or None
+
+        Args:
+            key: Key from key()
+            count_miss: Whether a miss counts in the stats; callers that
+                retry the lookup later pass False to count each item once
+        """
+        try:
+            entry = await self.storage.get_by_id(key)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Error reading description cache: {e}")
+            return None
+
+        if entry and entry.get("description") and entry.get("entity_info"):
+            self._count("hits")
+            return entry["description"], dict(entry["entity_info"])
+        if count_miss:
+            self._count("misses")
+        return None
+
+    def count_miss(self):
+        """Record a miss for a lookup made with count_miss=False"""
+        self._count("misses")
+
+    async def put(self, key: str, description: str, entity_info: Dict[str, Any]):
+        """Store a generated description (persisted on the next flush)"""
+        try:
+            await self.storage.upsert(
+                {
+                    key: {
+                        "description": description,
+                        "entity_info": dict(entity_info),
+                        "model": self.model,
+                    }
+                }
+            )
+            self._dirty = True
+            self._count("stores")
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Error storing to description cache: {e}")
+
+    async def flush(self):
+        """Persist stored descriptions to disk"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            await self.storage.index_done_callback()
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Error persisting description cache: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "model": self.model,
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+            }
@@ -0,0 +1,315 @@
+"""
+Persistent MinerU worker processes
+
+Running the `mineru` CLI per document pays interpreter start-up and model
+loading (layout, OCR, formula, table) for every file. The workers here are
+long-lived processes that import MinerU once and call
+mineru.cli.common.do_parse for each job; MinerU keeps its models in
+process-wide singletons, so only the first job of each worker loads them.
+
+MineruParser dispatches to the pool when MinerU is importable in this
+environment and MINERU_WORKERS is not 0; BatchParser process-mode workers,
+being long-lived themselves, parse in-process instead (parse_inline). It
+falls back to the CLI when the pool is unavailable: MinerU not importable,
+a worker died, or the installed MinerU has a different in-process API
+(checked once per worker against do_parse's signature; errors raised while
+parsing a document are reported as that document's failure).
+
+Callers that parse several files at once (BatchParser threads, page-range
+shards) call reserve_workers() with their concurrency, and the pool grows
+to match, so they do not queue behind fewer processes than the mineru CLI
+runs they replace.
+
+Environment:
+    MINERU_WORKERS   minimum number of worker processes (default 1, 0 = always use the CLI)
+"""
+import os
+import atexit
+import inspect
+import logging
+import threading
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 1
+
+
+class MineruApiMismatch(Exception):
+    """The installed MinerU lacks the in-process API the workers call."""
+
+
+class WorkerUnavailable(Exception):
+    """The worker pool cannot run this job; the caller should use the CLI."""
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+# Why this process cannot use MinerU's in-process API (None if it can);
+# set by _init_worker in each worker, or in this process after parse_inline()
+_api_error: Optional[str] = None
+
+
+def _check_api() -> Optional[str]:
+    """Import do_parse and check it accepts the call _parse_job makes."""
+    try:
+        from mineru.cli.common import do_parse, read_fn  # noqa: F401
+
+        inspect.signature(do_parse).bind(
+            "output", ["name"], [b""], ["ch"],
+            backend="pipeline", parse_method="auto", formula_enable=True,
+            table_enable=True, server_url=None, start_page_id=0, end_page_id=None,
+        )
+    except (ImportError, AttributeError, TypeError, ValueError) as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _init_worker(device: Optional[str], source: Optional[str]):
+    """Worker initializer: same environment as `mineru -d/--source`, one import."""
+    global _api_error
+    if device:
+        os.environ["MINERU_DEVICE_MODE"] = device
+    if source:
+        os.environ["MINERU_MODEL_SOURCE"] = source
+    _api_error = _check_api()
+
+
+def _parse_job(
+    input_path: str,
+    output_dir: str,
+    method: str,
+    lang: Optional[str],
+    backend: Optional[str],
+    start_page: Optional[int],
+    end_page: Optional[int],
+    formula: bool,
+    table: bool,
+    vlm_url: Optional[str],
+):
+    """Parse one file in a worker; writes the same output layout as the CLI."""
+    if _api_error:
+        raise MineruApiMismatch(_api_error)
+    from mineru.cli.common import do_parse, read_fn
+
+    path = Path(input_path)
+    do_parse(
+        output_dir,
+        [path.stem],
+        [read_fn(path)],
+        [lang or "ch"],
+        backend=backend or "pipeline",
+        parse_method=method,
+        formula_enable=formula,
+        table_enable=table,
+        server_url=vlm_url,
+        start_page_id=start_page or 0,
+        end_page_id=end_page,
+    )
+
+
+class MineruWorkerPool:
+    """Long-lived MinerU processes for one device/model-source setting."""
+
+    def __init__(
+        self,
+        num_workers: int = DEFAULT_WORKERS,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+    ):
+        self.num_workers = num_workers
+        # spawn: workers must not inherit threads or CUDA state from the parent
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(device, source),
+        )
+
+    def parse(
+        self,
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        vlm_url: Optional[str] = None,
+    ):
+        """
+        Parse one file in a worker and wait for it.
+
+        Raises:
+            WorkerUnavailable: The job could not run in a worker
+            Exception: Errors raised by MinerU while parsing
+        """
+        try:
+            future = self._executor.submit(
+                _parse_job, str(input_path), str(output_dir), method, lang, backend,
+                start_page, end_page, formula, table, vlm_url,
+            )
+            future.result()
+        except BrokenProcessPool as e:
+            raise WorkerUnavailable(f"MinerU worker exited: {e}") from e
+        except MineruApiMismatch as e:
+            raise WorkerUnavailable(f"MinerU in-process API not usable: {e}", permanent=True) from e
+
+    def shutdown(self, cancel_pending: bool = True):
+        self._executor.shutdown(wait=False, cancel_futures=cancel_pending)
+
+
+_pools: Dict[Tuple[Optional[str], Optional[str]], MineruWorkerPool] = {}
+_lock = threading.Lock()
+_disabled = False
+_inline = False
+_importable: Optional[bool] = None
+_reserved = 0
+
+
+def parse_inline():
+    """
+    Run MinerU jobs in this process from now on.
+
+    For processes that are long-lived parser workers themselves (BatchParser
+    process mode): models then stay loaded in that process.
+    """
+    global _inline
+    _inline = True
+
+
+def reserve_workers(count: int):
+    """
+    Grow the pools to at least count workers, for a caller that submits up to
+    count jobs at once. Pools never shrink; MINERU_WORKERS=0 still uses the CLI.
+    """
+    global _reserved
+    with _lock:
+        _reserved = max(_reserved, count)
+
+
+def _worker_count() -> int:
+    value = os.getenv("MINERU_WORKERS")
+    if not value:
+        return DEFAULT_WORKERS
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid MINERU_WORKERS={value!r}, using {DEFAULT_WORKERS}")
+        return DEFAULT_WORKERS
+
+
+def _mineru_importable() -> bool:
+    global _importable
+    if _importable is None:
+        try:
+            _importable = importlib.util.find_spec("mineru") is not None
+        except (ImportError, ValueError):
+            _importable = False
+    return _importable
+
+
+def get_mineru_worker_pool(
+    device: Optional[str] = None, source: Optional[str] = None
+) -> Optional[MineruWorkerPool]:
+    """Shared worker pool for a device/model source, or None to use the CLI."""
+    num_workers = _worker_count()
+    if _disabled or num_workers <= 0 or not _mineru_importable():
+        return None
+    key = (device, source)
+    retired = None
+    with _lock:
+        num_workers = max(num_workers, _reserved)
+        pool = _pools.get(key)
+        if pool is not None and pool.num_workers < num_workers:
+            # Executors cannot grow; replace it and let its running jobs finish
+            retired, pool = pool, None
+        if pool is None:
+            logger.info(f"Starting {num_workers} persistent MinerU worker(s)")
+            pool = _pools[key] = MineruWorkerPool(num_workers, device, source)
+    if retired is not None:
+        retired.shutdown(cancel_pending=False)
+    return pool
+
+
+def _disable():
+    global _disabled
+    _disabled = True
+
+
+def _discard_pool(pool: MineruWorkerPool, permanent: bool):
+    with _lock:
+        for key, value in list(_pools.items()):
+            if value is pool:
+                del _pools[key]
+        if permanent:
+            _disable()
+    pool.shutdown()
+
+
+def run_in_worker(
+    input_path: Union[str, Path],
+    output_dir: Union[str, Path],
+    device: Optional[str] = None,
+    source: Optional[str] = None,
+    **kwargs,
+) -> bool:
+    """
+    Parse a file in the persistent worker pool (or in this process after
+    parse_inline()).
+
+    Args:
+        input_path: File to parse
+        output_dir: MinerU output directory
+        device: Inference device (MINERU_DEVICE_MODE of the workers)
+        source: Model source (MINERU_MODEL_SOURCE of the workers)
+        **kwargs: MineruWorkerPool.parse arguments
+
+    Returns:
+        True if parsed, False if the caller should run the CLI instead
+    """
+    if _inline and not _disabled and _mineru_importable():
+        _init_worker(device, source)
+        if _api_error:
+            logger.warning(f"MinerU in-process API not usable: {_api_error}; falling back to the mineru CLI")
+            _disable()
+            return False
+        _parse_job(
+            str(input_path), str(output_dir), kwargs.get("method", "auto"),
+            kwargs.get("lang"), kwargs.get("backend"), kwargs.get("start_page"),
+            kwargs.get("end_page"), kwargs.get("formula", True), kwargs.get("table", True),
+            kwargs.get("vlm_url"),
+        )
+        return True
+
+    pool = get_mineru_worker_pool(device, source)
+    if pool is None:
+        return False
+    try:
+        pool.parse(input_path, output_dir, **kwargs)
+        return True
+    except WorkerUnavailable as e:
+        logger.warning(f"{e}; falling back to the mineru CLI")
+        _discard_pool(pool, e.permanent)
+        return False
+
+
+def shutdown_mineru_workers():
+    """Stop all worker processes."""
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_mineru_workers)
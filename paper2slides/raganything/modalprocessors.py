@@ -12,10 +12,15 @@ Includes:
 import re
 import json
 import time
+import asyncio
+import heapq
+import bisect
 import base64
-from typing import Dict, Any, Tuple, List
+import contextvars
+from collections import OrderedDict
+from typing import Dict, Any, Tuple, List, Optional
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from lightrag.utils import (
     logger,
@@ -28,6 +33,13 @@ from lightrag.operate import extract_entities, merge_nodes_and_edges
 
 # Import prompt templates
 from raganything.prompt import PROMPTS
+from raganything.description_cache import DescriptionCache, content_hash
+
+# Set while generate_descriptions_batch describes items it already looked up,
+# so their single-item calls don't read the description cache a second time
+_cache_lookup_done: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "description_cache_lookup_done", default=False
+)
 
 
 @dataclass
@@ -46,9 +58,25 @@ class ContextConfig:
             self.filter_content_types = ["text"]
 
 
+@dataclass
+class PageIndex:
+    """Text blocks of one content list grouped by page, with per-page context cache"""
+
+    source: List[Dict]
+    signature: Tuple
+    # page_idx -> [(position in content list, text)]
+    pages: Dict[int, List[Tuple[int, str]]] = field(default_factory=dict)
+    sorted_pages: List[int] = field(default_factory=list)
+    # current page -> truncated context
+    contexts: Dict[int, str] = field(default_factory=dict)
+
+
 class ContextExtractor:
     """Universal context extractor supporting multiple content source formats"""
 
+    # Content lists whose page index is kept (one per document being processed)
+    MAX_PAGE_INDEXES = 8
+
     def __init__(self, config: ContextConfig = None, tokenizer=None):
         """Initialize context extractor
 
@@ -58,6 +86,7 @@ class ContextExtractor:
         """
         self.config = config or ContextConfig()
         self.tokenizer = tokenizer
+        self._page_indexes: "OrderedDict[int, PageIndex]" = OrderedDict()
 
     def extract_context(
         self,
@@ -135,6 +164,10 @@ class ContextExtractor:
     ) -> str:
         """Extract context based on page boundaries
 
+        Uses the document's page index, so the cost is proportional to the
+        window rather than the content list; items on the same page share
+        one cached context string.
+
         Args:
             content_list: List of content items
             current_item_info: Current item with page_idx
@@ -143,32 +176,74 @@ class ContextExtractor:
             Context text from surrounding pages
         """
         current_page = current_item_info.get("page_idx", 0)
-        window_size = self.config.context_window
+        index = self._get_page_index(content_list)
+        if current_page in index.contexts:
+            return index.contexts[current_page]
 
+        window_size = self.config.context_window
         start_page = max(0, current_page - window_size)
         end_page = current_page + window_size + 1
 
+        # Only pages inside the window; blocks keep their content-list order
+        lo = bisect.bisect_left(index.sorted_pages, start_page)
+        hi = bisect.bisect_left(index.sorted_pages, end_page)
+        window = [
+            [(pos, page, text) for pos, text in index.pages[page]]
+            for page in index.sorted_pages[lo:hi]
+        ]
+
         context_texts = []
+        for _, item_page, text_content in heapq.merge(*window):
+            # Add page marker for better context understanding
+            if item_page != current_page:
+                context_texts.append(f"[Page {item_page}] {text_content}")
+            else:
+                context_texts.append(text_content)
 
-        for item in content_list:
-            item_page = item.get("page_idx", 0)
-            item_type = item.get("type", "")
-
-            # Check if item is within context window and matches filter criteria
-            if (
-                start_page <= item_page < end_page
-                and item_type in self.config.filter_content_types
-            ):
-                text_content = self._extract_text_from_item(item)
-                if text_content and text_content.strip():
-                    # Add page marker for better context understanding
-                    if item_page != current_page:
-                        context_texts.append(f"[Page {item_page}] {text_content}")
-                    else:
-                        context_texts.append(text_content)
+        context = self._truncate_context("\n".join(context_texts))
+        index.contexts[current_page] = context
+        return context
 
-        context = "\n".join(context_texts)
-        return self._truncate_context(context)
+    def _get_page_index(self, content_list: List[Dict]) -> PageIndex:
+        """Page index of a content list, built once per document
+
+        Args:
+            content_list: List of content items
+
+        Returns:
+            PageIndex with the context text blocks of each page
+        """
+        config = self.config
+        signature = (
+            len(content_list),
+            id(self.tokenizer),
+            config.context_window,
+            config.max_context_tokens,
+            config.include_headers,
+            config.include_captions,
+            tuple(config.filter_content_types),
+        )
+        key = id(content_list)
+        index = self._page_indexes.get(key)
+        if index is not None and index.source is content_list and index.signature == signature:
+            self._page_indexes.move_to_end(key)
+            return index
+
+        index = PageIndex(source=content_list, signature=signature)
+        for pos, item in enumerate(content_list):
+            if item.get("type", "") not in config.filter_content_types:
+                continue
+            text_content = self._extract_text_from_item(item)
+            if text_content and text_content.strip():
+                index.pages.setdefault(item.get("page_idx", 0), []).append(
+                    (pos, text_content)
+                )
+        index.sorted_pages = sorted(index.pages)
+
+        self._page_indexes[key] = index
+        while len(self._page_indexes) > self.MAX_PAGE_INDEXES:
+            self._page_indexes.popitem(last=False)
+        return index
 
     def _extract_chunk_context(
         self, content_list: List[Dict], current_item_info: Dict
@@ -360,6 +435,13 @@ class ContextExtractor:
 class BaseModalProcessor:
     """Base class for modal processors"""
 
+    # PROMPTS key of the system prompt for batched descriptions; None if the
+    # processor does not support them
+    batch_system_prompt: Optional[str] = None
+
+    # Shared description cache, set by RAGAnything; None disables caching
+    description_cache: Optional[DescriptionCache] = None
+
     def __init__(
         self,
         lightrag: LightRAG,
@@ -462,6 +544,314 @@ class BaseModalProcessor:
         # Subclasses must implement this method
         raise NotImplementedError("Subclasses must implement this method")
 
+    @staticmethod
+    def _content_data(modal_content, text_key: str) -> Dict[str, Any]:
+        """Modal content as a dict; plain strings become {text_key: content}"""
+        if isinstance(modal_content, str):
+            try:
+                content_data = json.loads(modal_content)
+            except json.JSONDecodeError:
+                return {text_key: modal_content}
+            return content_data if isinstance(content_data, dict) else {text_key: modal_content}
+        return modal_content
+
+    def _description_content_digest(self, modal_content) -> str:
+        """Hash of the item content the description depends on
+
+        File paths and page numbers are left out so the same item in another
+        document or output directory hashes the same.
+        """
+        return content_hash(str(modal_content))
+
+    def _description_cache_key(
+        self,
+        modal_content,
+        content_type: str,
+        item_info: Dict[str, Any] = None,
+        entity_name: str = None,
+    ) -> Optional[str]:
+        """Description cache key of one item, or None when caching is off or the item has no stable content"""
+        if self.description_cache is None:
+            return None
+        try:
+            digest = self._description_content_digest(modal_content)
+        except Exception as e:
+            logger.debug(f"No description cache key for {content_type} item: {e}")
+            return None
+        context = self._get_context_for_item(item_info) if item_info else ""
+        return self.description_cache.key(content_type, digest, context, entity_name)
+
+    async def _cached_description(
+        self,
+        modal_content,
+        content_type: str,
+        item_info: Dict[str, Any],
+        entity_name: Optional[str],
+        describe,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Return the cached description of an item, or run describe() and cache its result
+
+        describe() returns (description, entity_info, parsed). Only parsed
+        results are cached: raw-response fallbacks and exceptions (which the
+        caller turns into fallbacks) leave the item to be described again.
+        """
+        key = self._description_cache_key(
+            modal_content, content_type, item_info, entity_name
+        )
+        if key:
+            if _cache_lookup_done.get():
+                self.description_cache.count_miss()
+            else:
+                cached = await self.description_cache.get(key)
+                if cached:
+                    return cached
+
+        description, entity_info, parsed = await describe()
+        if key and parsed:
+            await self.description_cache.put(key, description, entity_info)
+        return description, entity_info
+
+    async def cached_descriptions(
+        self,
+        modal_contents: List[Any],
+        content_type: str,
+        item_infos: List[Dict[str, Any]],
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Look up cached descriptions without calling the model. Misses are not
+        counted here; they are counted when the item is described.
+
+        Returns:
+            List of (description, entity_info) or None per item, in input order
+        """
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(
+            modal_contents
+        )
+        if self.description_cache is None:
+            return results
+        for index, (content, info) in enumerate(zip(modal_contents, item_infos)):
+            try:
+                key = self._description_cache_key(content, content_type, info)
+                if key:
+                    results[index] = await self.description_cache.get(
+                        key, count_miss=False
+                    )
+            except Exception as e:
+                logger.warning(f"Description cache lookup failed for {content_type} item {index}: {e}")
+        return results
+
+    def _build_description_request(
+        self, modal_content, item_info: Dict[str, Any] = None, entity_name: str = None
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Build the analysis prompt for one item, used by batched descriptions.
+
+        Returns:
+            Tuple of (prompt, base64 image data or None)
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def _description_from_result(
+        self, response_data: Dict[str, Any], entity_name: str = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Validate one parsed analysis result and build (description, entity_info)
+
+        Raises:
+            ValueError: Required fields are missing
+        """
+        description = response_data.get("detailed_description", "")
+        entity_data = response_data.get("entity_info", {})
+
+        if not description or not entity_data:
+            raise ValueError("Missing required fields in response")
+
+        if not all(
+            key in entity_data for key in ["entity_name", "entity_type", "summary"]
+        ):
+            raise ValueError("Missing required fields in entity_info")
+
+        entity_data["entity_name"] = (
+            entity_data["entity_name"] + f" ({entity_data['entity_type']})"
+        )
+        if entity_name:
+            entity_data["entity_name"] = entity_name
+
+        return description, entity_data
+
+    def _parse_analysis_response(
+        self, response: str, entity_name: str, entity_type: str
+    ) -> Tuple[str, Dict[str, Any], bool]:
+        """Parse an analysis response into (description, entity_info, parsed)
+
+        An unparseable response becomes a fallback built from the raw text,
+        with parsed False so it is not cached.
+        """
+        try:
+            response_data = self._robust_json_parse(response)
+            return (*self._description_from_result(response_data, entity_name), True)
+
+        except (json.JSONDecodeError, AttributeError, ValueError) as e:
+            logger.error(f"Error parsing {entity_type} analysis response: {e}")
+            logger.debug(f"Raw response: {response}")
+            fallback_entity = {
+                "entity_name": entity_name
+                if entity_name
+                else f"{entity_type}_{compute_mdhash_id(response)}",
+                "entity_type": entity_type,
+                "summary": response[:100] + "..." if len(response) > 100 else response,
+            }
+            return response, fallback_entity, False
+
+    async def generate_descriptions_batch(
+        self,
+        modal_contents: List[Any],
+        content_type: str,
+        item_infos: List[Dict[str, Any]],
+        cached: Optional[List[Optional[Tuple[str, Dict[str, Any]]]]] = None,
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Generate descriptions for several items of this processor's type with
+        one LLM request. Items found in the description cache are not sent;
+        items the batched response does not cover (parse failure, missing or
+        invalid entries) fall back to single-item calls.
+
+        Args:
+            modal_contents: Modal contents to process
+            content_type: Type of modal content
+            item_infos: Item information for context extraction, per item
+            cached: Result of cached_descriptions() for these items, if the
+                caller already looked them up
+
+        Returns:
+            List of (description, entity_info), in input order; None for
+            items that could not be described
+        """
+        if cached is None:
+            cached = await self.cached_descriptions(
+                modal_contents, content_type, item_infos
+            )
+        results = list(cached)
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        requests = []
+        if self.batch_system_prompt and len(pending) > 1:
+            for index in pending:
+                try:
+                    prompt, image = self._build_description_request(
+                        modal_contents[index], item_infos[index]
+                    )
+                    requests.append((index, prompt, image))
+                except Exception as e:
+                    logger.debug(f"Item {index} not batchable, described alone: {e}")
+
+        if len(requests) > 1:
+            try:
+                response = await self._request_batch_descriptions(requests, content_type)
+                for (index, _, _), result in zip(
+                    requests, self._split_batch_response(response, len(requests))
+                ):
+                    results[index] = result
+                    if result is not None:
+                        await self._store_batched_description(
+                            modal_contents[index], content_type, item_infos[index], result
+                        )
+            except Exception as e:
+                logger.warning(f"Batched {content_type} descriptions failed: {e}")
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing and len(missing) < len(pending):
+            logger.info(
+                f"Describing {len(missing)}/{len(results)} {content_type} items individually"
+            )
+        token = _cache_lookup_done.set(True)
+        try:
+            singles = await asyncio.gather(
+                *(
+                    self.generate_description_only(
+                        modal_contents[i], content_type, item_infos[i]
+                    )
+                    for i in missing
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            _cache_lookup_done.reset(token)
+        for i, result in zip(missing, singles):
+            if isinstance(result, Exception):
+                logger.error(f"Error describing {content_type} item {i}: {result}")
+                continue
+            results[i] = result
+        return results
+
+    async def _store_batched_description(
+        self,
+        modal_content,
+        content_type: str,
+        item_info: Dict[str, Any],
+        result: Tuple[str, Dict[str, Any]],
+    ):
+        """Count and cache one description produced by a batched request"""
+        key = self._description_cache_key(modal_content, content_type, item_info)
+        if key:
+            self.description_cache.count_miss()
+            await self.description_cache.put(key, *result)
+
+    async def _request_batch_descriptions(
+        self, requests: List[Tuple[int, str, Optional[str]]], content_type: str
+    ) -> str:
+        """Send one request describing all items (prompt per item, images inline)"""
+        header = PROMPTS["batch_description_prompt"].format(
+            count=len(requests), content_type=content_type
+        )
+        system_prompt = PROMPTS[self.batch_system_prompt]
+        item_prompts = [
+            PROMPTS["batch_description_item"].format(number=number, prompt=prompt)
+            for number, (_, prompt, _) in enumerate(requests, start=1)
+        ]
+
+        if not any(image for _, _, image in requests):
+            return await self.modal_caption_func(
+                "\n\n".join([header, *item_prompts]), system_prompt=system_prompt
+            )
+
+        content = [{"type": "text", "text": header}]
+        for item_prompt, (_, _, image) in zip(item_prompts, requests):
+            content.append({"type": "text", "text": item_prompt})
+            if image:
+                content.append(
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": f"data:image/jpeg;base64,{image}"},
+                    }
+                )
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": content},
+        ]
+        return await self.modal_caption_func(header, messages=messages)
+
+    def _split_batch_response(
+        self, response: str, count: int
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """Split a batched response into per-item results (None where unusable)"""
+        response_data = self._robust_json_parse(response)
+        entries = response_data.get("items") if isinstance(response_data, dict) else None
+        if not isinstance(entries, list):
+            raise ValueError("Batched response has no items list")
+
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * count
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            number = entry.get("item", position + 1)
+            if not isinstance(number, int) or not 1 <= number <= count:
+                continue
+            try:
+                results[number - 1] = self._description_from_result(entry)
+            except (AttributeError, ValueError) as e:
+                logger.debug(f"Batched result for item {number} unusable: {e}")
+        return results
+
     async def _create_entity_and_chunk(
         self,
         modal_chunk: str,
@@ -782,6 +1172,8 @@ class BaseModalProcessor:
 class ImageModalProcessor(BaseModalProcessor):
     """Processor specialized for image content"""
 
+    batch_system_prompt = "IMAGE_ANALYSIS_SYSTEM"
+
     def __init__(
         self,
         lightrag: LightRAG,
@@ -807,6 +1199,87 @@ class ImageModalProcessor(BaseModalProcessor):
             logger.error(f"Failed to encode image {image_path}: {e}")
             return ""
 
+    def _description_content_digest(self, modal_content) -> str:
+        """Hash of the image bytes, captions and footnotes"""
+        content_data = self._content_data(modal_content, "description")
+        image_path = content_data.get("img_path")
+        if not image_path:
+            raise ValueError("No image path to hash")
+        return content_hash(
+            Path(image_path).read_bytes(),
+            json.dumps(content_data.get("image_caption", content_data.get("img_caption", []))),
+            json.dumps(content_data.get("image_footnote", content_data.get("img_footnote", []))),
+        )
+
+    def _build_description_request(
+        self, modal_content, item_info: Dict[str, Any] = None, entity_name: str = None
+    ) -> Tuple[str, Optional[str]]:
+        """Build the analysis prompt and base64 image for one image item
+
+        Raises:
+            ValueError, FileNotFoundError, RuntimeError: The item cannot be described
+        """
+        # Parse image content (reuse existing logic)
+        if isinstance(modal_content, str):
+            try:
+                content_data = json.loads(modal_content)
+            except json.JSONDecodeError:
+                content_data = {"description": modal_content}
+        else:
+            content_data = modal_content
+
+        image_path = content_data.get("img_path")
+        captions = content_data.get(
+            "image_caption", content_data.get("img_caption", [])
+        )
+        footnotes = content_data.get(
+            "image_footnote", content_data.get("img_footnote", [])
+        )
+
+        # Validate image path
+        if not image_path:
+            raise ValueError(f"No image path provided in modal_content: {modal_content}")
+
+        # Convert to Path object and check if it exists
+        image_path_obj = Path(image_path)
+        if not image_path_obj.exists():
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+
+        # Extract context for current item
+        context = ""
+        if item_info:
+            context = self._get_context_for_item(item_info)
+
+        # Build detailed visual analysis prompt with context
+        if context:
+            vision_prompt = PROMPTS.get(
+                "vision_prompt_with_context", PROMPTS["vision_prompt"]
+            ).format(
+                context=context,
+                entity_name=entity_name
+                if entity_name
+                else "unique descriptive name for this image",
+                image_path=image_path,
+                captions=captions if captions else "None",
+                footnotes=footnotes if footnotes else "None",
+            )
+        else:
+            vision_prompt = PROMPTS["vision_prompt"].format(
+                entity_name=entity_name
+                if entity_name
+                else "unique descriptive name for this image",
+                image_path=image_path,
+                captions=captions if captions else "None",
+                footnotes=footnotes if footnotes else "None",
+            )
+
+        # Encode image to base64
+        image_base64 = self._encode_image_to_base64(image_path)
+        if not image_base64:
+            raise RuntimeError(f"Failed to encode image to base64: {image_path}")
+
+        return vision_prompt, image_base64
+
     async def generate_description_only(
         self,
         modal_content,
@@ -828,79 +1301,26 @@ class ImageModalProcessor(BaseModalProcessor):
             Tuple of (enhanced_caption, entity_info)
         """
         try:
-            # Parse image content (reuse existing logic)
-            if isinstance(modal_content, str):
-                try:
-                    content_data = json.loads(modal_content)
-                except json.JSONDecodeError:
-                    content_data = {"description": modal_content}
-            else:
-                content_data = modal_content
 
-            image_path = content_data.get("img_path")
-            captions = content_data.get(
-                "image_caption", content_data.get("img_caption", [])
-            )
-            footnotes = content_data.get(
-                "image_footnote", content_data.get("img_footnote", [])
-            )
-
-            # Validate image path
-            if not image_path:
-                raise ValueError(
-                    f"No image path provided in modal_content: {modal_content}"
+            async def describe():
+                vision_prompt, image_base64 = self._build_description_request(
+                    modal_content, item_info, entity_name
                 )
 
-            # Convert to Path object and check if it exists
-            image_path_obj = Path(image_path)
-            if not image_path_obj.exists():
-                raise FileNotFoundError(f"Image file not found: {image_path}")
-
-            # Extract context for current item
-            context = ""
-            if item_info:
-                context = self._get_context_for_item(item_info)
-
-            # Build detailed visual analysis prompt with context
-            if context:
-                vision_prompt = PROMPTS.get(
-                    "vision_prompt_with_context", PROMPTS["vision_prompt"]
-                ).format(
-                    context=context,
-                    entity_name=entity_name
-                    if entity_name
-                    else "unique descriptive name for this image",
-                    image_path=image_path,
-                    captions=captions if captions else "None",
-                    footnotes=footnotes if footnotes else "None",
-                )
-            else:
-                vision_prompt = PROMPTS["vision_prompt"].format(
-                    entity_name=entity_name
-                    if entity_name
-                    else "unique descriptive name for this image",
-                    image_path=image_path,
-                    captions=captions if captions else "None",
-                    footnotes=footnotes if footnotes else "None",
+                # Call vision model with encoded image
+                response = await self.modal_caption_func(
+                    vision_prompt,
+                    image_data=image_base64,
+                    system_prompt=PROMPTS["IMAGE_ANALYSIS_SYSTEM"],
                 )
 
-            # Encode image to base64
-            image_base64 = self._encode_image_to_base64(image_path)
-            if not image_base64:
-                raise RuntimeError(f"Failed to encode image to base64: {image_path}")
+                # Parse response (reuse existing logic)
+                return self._parse_analysis_response(response, entity_name, "image")
 
-            # Call vision model with encoded image
-            response = await self.modal_caption_func(
-                vision_prompt,
-                image_data=image_base64,
-                system_prompt=PROMPTS["IMAGE_ANALYSIS_SYSTEM"],
+            return await self._cached_description(
+                modal_content, content_type, item_info, entity_name, describe
             )
 
-            # Parse response (reuse existing logic)
-            enhanced_caption, entity_info = self._parse_response(response, entity_name)
-
-            return enhanced_caption, entity_info
-
         except Exception as e:
             logger.error(f"Error generating image description: {e}")
             # Fallback processing
@@ -980,43 +1400,75 @@ class ImageModalProcessor(BaseModalProcessor):
         self, response: str, entity_name: str = None
     ) -> Tuple[str, Dict[str, Any]]:
         """Parse model response"""
-        try:
-            response_data = self._robust_json_parse(response)
-
-            description = response_data.get("detailed_description", "")
-            entity_data = response_data.get("entity_info", {})
+        description, entity_info, _ = self._parse_analysis_response(
+            response, entity_name, "image"
+        )
+        return description, entity_info
 
-            if not description or not entity_data:
-                raise ValueError("Missing required fields in response")
 
-            if not all(
-                key in entity_data for key in ["entity_name", "entity_type", "summary"]
-            ):
-                raise ValueError("Missing required fields in entity_info")
+class TableModalProcessor(BaseModalProcessor):
+    """Processor specialized for table content"""
 
-            entity_data["entity_name"] = (
-                entity_data["entity_name"] + f" ({entity_data['entity_type']})"
-            )
-            if entity_name:
-                entity_data["entity_name"] = entity_name
+    batch_system_prompt = "TABLE_ANALYSIS_SYSTEM"
 
-            return description, entity_data
+    def _description_content_digest(self, modal_content) -> str:
+        """Hash of the table body, captions and footnotes"""
+        content_data = self._content_data(modal_content, "table_body")
+        return content_hash(
+            content_data.get("table_body", ""),
+            json.dumps(content_data.get("table_caption", [])),
+            json.dumps(content_data.get("table_footnote", [])),
+        )
 
-        except (json.JSONDecodeError, AttributeError, ValueError) as e:
-            logger.error(f"Error parsing image analysis response: {e}")
-            logger.debug(f"Raw response: {response}")
-            fallback_entity = {
-                "entity_name": entity_name
+    def _build_description_request(
+        self, modal_content, item_info: Dict[str, Any] = None, entity_name: str = None
+    ) -> Tuple[str, Optional[str]]:
+        """Build the analysis prompt for one table item (no image data)"""
+        # Parse table content (reuse existing logic)
+        if isinstance(modal_content, str):
+            try:
+                content_data = json.loads(modal_content)
+            except json.JSONDecodeError:
+                content_data = {"table_body": modal_content}
+        else:
+            content_data = modal_content
+
+        table_img_path = content_data.get("img_path")
+        table_caption = content_data.get("table_caption", [])
+        table_body = content_data.get("table_body", "")
+        table_footnote = content_data.get("table_footnote", [])
+
+        # Extract context for current item
+        context = ""
+        if item_info:
+            context = self._get_context_for_item(item_info)
+
+        # Build table analysis prompt with context
+        if context:
+            table_prompt = PROMPTS.get(
+                "table_prompt_with_context", PROMPTS["table_prompt"]
+            ).format(
+                context=context,
+                entity_name=entity_name
                 if entity_name
-                else f"image_{compute_mdhash_id(response)}",
-                "entity_type": "image",
-                "summary": response[:100] + "..." if len(response) > 100 else response,
-            }
-            return response, fallback_entity
-
+                else "descriptive name for this table",
+                table_img_path=table_img_path,
+                table_caption=table_caption if table_caption else "None",
+                table_body=table_body,
+                table_footnote=table_footnote if table_footnote else "None",
+            )
+        else:
+            table_prompt = PROMPTS["table_prompt"].format(
+                entity_name=entity_name
+                if entity_name
+                else "descriptive name for this table",
+                table_img_path=table_img_path,
+                table_caption=table_caption if table_caption else "None",
+                table_body=table_body,
+                table_footnote=table_footnote if table_footnote else "None",
+            )
 
-class TableModalProcessor(BaseModalProcessor):
-    """Processor specialized for table content"""
+        return table_prompt, None
 
     async def generate_description_only(
         self,
@@ -1039,63 +1491,25 @@ class TableModalProcessor(BaseModalProcessor):
             Tuple of (enhanced_caption, entity_info)
         """
         try:
-            # Parse table content (reuse existing logic)
-            if isinstance(modal_content, str):
-                try:
-                    content_data = json.loads(modal_content)
-                except json.JSONDecodeError:
-                    content_data = {"table_body": modal_content}
-            else:
-                content_data = modal_content
-
-            table_img_path = content_data.get("img_path")
-            table_caption = content_data.get("table_caption", [])
-            table_body = content_data.get("table_body", "")
-            table_footnote = content_data.get("table_footnote", [])
 
-            # Extract context for current item
-            context = ""
-            if item_info:
-                context = self._get_context_for_item(item_info)
-
-            # Build table analysis prompt with context
-            if context:
-                table_prompt = PROMPTS.get(
-                    "table_prompt_with_context", PROMPTS["table_prompt"]
-                ).format(
-                    context=context,
-                    entity_name=entity_name
-                    if entity_name
-                    else "descriptive name for this table",
-                    table_img_path=table_img_path,
-                    table_caption=table_caption if table_caption else "None",
-                    table_body=table_body,
-                    table_footnote=table_footnote if table_footnote else "None",
+            async def describe():
+                table_prompt, _ = self._build_description_request(
+                    modal_content, item_info, entity_name
                 )
-            else:
-                table_prompt = PROMPTS["table_prompt"].format(
-                    entity_name=entity_name
-                    if entity_name
-                    else "descriptive name for this table",
-                    table_img_path=table_img_path,
-                    table_caption=table_caption if table_caption else "None",
-                    table_body=table_body,
-                    table_footnote=table_footnote if table_footnote else "None",
+
+                # Call LLM for table analysis
+                response = await self.modal_caption_func(
+                    table_prompt,
+                    system_prompt=PROMPTS["TABLE_ANALYSIS_SYSTEM"],
                 )
 
-            # Call LLM for table analysis
-            response = await self.modal_caption_func(
-                table_prompt,
-                system_prompt=PROMPTS["TABLE_ANALYSIS_SYSTEM"],
-            )
+                # Parse response (reuse existing logic)
+                return self._parse_analysis_response(response, entity_name, "table")
 
-            # Parse response (reuse existing logic)
-            enhanced_caption, entity_info = self._parse_table_response(
-                response, entity_name
+            return await self._cached_description(
+                modal_content, content_type, item_info, entity_name, describe
             )
 
-            return enhanced_caption, entity_info
-
         except Exception as e:
             logger.error(f"Error generating table description: {e}")
             # Fallback processing
@@ -1174,43 +1588,68 @@ class TableModalProcessor(BaseModalProcessor):
         self, response: str, entity_name: str = None
     ) -> Tuple[str, Dict[str, Any]]:
         """Parse table analysis response"""
-        try:
-            response_data = self._robust_json_parse(response)
-
-            description = response_data.get("detailed_description", "")
-            entity_data = response_data.get("entity_info", {})
+        description, entity_info, _ = self._parse_analysis_response(
+            response, entity_name, "table"
+        )
+        return description, entity_info
 
-            if not description or not entity_data:
-                raise ValueError("Missing required fields in response")
 
-            if not all(
-                key in entity_data for key in ["entity_name", "entity_type", "summary"]
-            ):
-                raise ValueError("Missing required fields in entity_info")
+class EquationModalProcessor(BaseModalProcessor):
+    """Processor specialized for equation content"""
 
-            entity_data["entity_name"] = (
-                entity_data["entity_name"] + f" ({entity_data['entity_type']})"
-            )
-            if entity_name:
-                entity_data["entity_name"] = entity_name
+    batch_system_prompt = "EQUATION_ANALYSIS_SYSTEM"
 
-            return description, entity_data
+    def _description_content_digest(self, modal_content) -> str:
+        """Hash of the equation LaTeX and its format"""
+        content_data = self._content_data(modal_content, "equation")
+        return content_hash(
+            content_data.get("text") or content_data.get("equation", ""),
+            content_data.get("text_format", ""),
+        )
 
-        except (json.JSONDecodeError, AttributeError, ValueError) as e:
-            logger.error(f"Error parsing table analysis response: {e}")
-            logger.debug(f"Raw response: {response}")
-            fallback_entity = {
-                "entity_name": entity_name
+    def _build_description_request(
+        self, modal_content, item_info: Dict[str, Any] = None, entity_name: str = None
+    ) -> Tuple[str, Optional[str]]:
+        """Build the analysis prompt for one equation item (no image data)"""
+        # Parse equation content (reuse existing logic)
+        if isinstance(modal_content, str):
+            try:
+                content_data = json.loads(modal_content)
+            except json.JSONDecodeError:
+                content_data = {"equation": modal_content}
+        else:
+            content_data = modal_content
+
+        equation_text = content_data.get("text")
+        equation_format = content_data.get("text_format", "")
+
+        # Extract context for current item
+        context = ""
+        if item_info:
+            context = self._get_context_for_item(item_info)
+
+        # Build equation analysis prompt with context
+        if context:
+            equation_prompt = PROMPTS.get(
+                "equation_prompt_with_context", PROMPTS["equation_prompt"]
+            ).format(
+                context=context,
+                equation_text=equation_text,
+                equation_format=equation_format,
+                entity_name=entity_name
                 if entity_name
-                else f"table_{compute_mdhash_id(response)}",
-                "entity_type": "table",
-                "summary": response[:100] + "..." if len(response) > 100 else response,
-            }
-            return response, fallback_entity
-
+                else "descriptive name for this equation",
+            )
+        else:
+            equation_prompt = PROMPTS["equation_prompt"].format(
+                equation_text=equation_text,
+                equation_format=equation_format,
+                entity_name=entity_name
+                if entity_name
+                else "descriptive name for this equation",
+            )
 
-class EquationModalProcessor(BaseModalProcessor):
-    """Processor specialized for equation content"""
+        return equation_prompt, None
 
     async def generate_description_only(
         self,
@@ -1233,57 +1672,25 @@ class EquationModalProcessor(BaseModalProcessor):
             Tuple of (enhanced_caption, entity_info)
         """
         try:
-            # Parse equation content (reuse existing logic)
-            if isinstance(modal_content, str):
-                try:
-                    content_data = json.loads(modal_content)
-                except json.JSONDecodeError:
-                    content_data = {"equation": modal_content}
-            else:
-                content_data = modal_content
-
-            equation_text = content_data.get("text")
-            equation_format = content_data.get("text_format", "")
-
-            # Extract context for current item
-            context = ""
-            if item_info:
-                context = self._get_context_for_item(item_info)
 
-            # Build equation analysis prompt with context
-            if context:
-                equation_prompt = PROMPTS.get(
-                    "equation_prompt_with_context", PROMPTS["equation_prompt"]
-                ).format(
-                    context=context,
-                    equation_text=equation_text,
-                    equation_format=equation_format,
-                    entity_name=entity_name
-                    if entity_name
-                    else "descriptive name for this equation",
+            async def describe():
+                equation_prompt, _ = self._build_description_request(
+                    modal_content, item_info, entity_name
                 )
-            else:
-                equation_prompt = PROMPTS["equation_prompt"].format(
-                    equation_text=equation_text,
-                    equation_format=equation_format,
-                    entity_name=entity_name
-                    if entity_name
-                    else "descriptive name for this equation",
+
+                # Call LLM for equation analysis
+                response = await self.modal_caption_func(
+                    equation_prompt,
+                    system_prompt=PROMPTS["EQUATION_ANALYSIS_SYSTEM"],
                 )
 
-            # Call LLM for equation analysis
-            response = await self.modal_caption_func(
-                equation_prompt,
-                system_prompt=PROMPTS["EQUATION_ANALYSIS_SYSTEM"],
-            )
+                # Parse response (reuse existing logic)
+                return self._parse_analysis_response(response, entity_name, "equation")
 
-            # Parse response (reuse existing logic)
-            enhanced_caption, entity_info = self._parse_equation_response(
-                response, entity_name
+            return await self._cached_description(
+                modal_content, content_type, item_info, entity_name, describe
             )
 
-            return enhanced_caption, entity_info
-
         except Exception as e:
             logger.error(f"Error generating equation description: {e}")
             # Fallback processing
@@ -1358,39 +1765,10 @@ class EquationModalProcessor(BaseModalProcessor):
         self, response: str, entity_name: str = None
     ) -> Tuple[str, Dict[str, Any]]:
         """Parse equation analysis response with robust JSON handling"""
-        try:
-            response_data = self._robust_json_parse(response)
-
-            description = response_data.get("detailed_description", "")
-            entity_data = response_data.get("entity_info", {})
-
-            if not description or not entity_data:
-                raise ValueError("Missing required fields in response")
-
-            if not all(
-                key in entity_data for key in ["entity_name", "entity_type", "summary"]
-            ):
-                raise ValueError("Missing required fields in entity_info")
-
-            entity_data["entity_name"] = (
-                entity_data["entity_name"] + f" ({entity_data['entity_type']})"
-            )
-            if entity_name:
-                entity_data["entity_name"] = entity_name
-
-            return description, entity_data
-
-        except (json.JSONDecodeError, AttributeError, ValueError) as e:
-            logger.error(f"Error parsing equation analysis response: {e}")
-            logger.debug(f"Raw response: {response}")
-            fallback_entity = {
-                "entity_name": entity_name
-                if entity_name
-                else f"equation_{compute_mdhash_id(response)}",
-                "entity_type": "equation",
-                "summary": response[:100] + "..." if len(response) > 100 else response,
-            }
-            return response, fallback_entity
+        description, entity_info, _ = self._parse_analysis_response(
+            response, entity_name, "equation"
+        )
+        return description, entity_info
 
 
 class GenericModalProcessor(BaseModalProcessor):
@@ -1417,47 +1795,51 @@ class GenericModalProcessor(BaseModalProcessor):
             Tuple of (enhanced_caption, entity_info)
         """
         try:
-            # Extract context for current item
-            context = ""
-            if item_info:
-                context = self._get_context_for_item(item_info)
 
-            # Build generic analysis prompt with context
-            if context:
-                generic_prompt = PROMPTS.get(
-                    "generic_prompt_with_context", PROMPTS["generic_prompt"]
-                ).format(
-                    context=context,
-                    content_type=content_type,
-                    entity_name=entity_name
-                    if entity_name
-                    else f"descriptive name for this {content_type}",
-                    content=str(modal_content),
-                )
-            else:
-                generic_prompt = PROMPTS["generic_prompt"].format(
-                    content_type=content_type,
-                    entity_name=entity_name
-                    if entity_name
-                    else f"descriptive name for this {content_type}",
-                    content=str(modal_content),
+            async def describe():
+                # Extract context for current item
+                context = ""
+                if item_info:
+                    context = self._get_context_for_item(item_info)
+
+                # Build generic analysis prompt with context
+                if context:
+                    generic_prompt = PROMPTS.get(
+                        "generic_prompt_with_context", PROMPTS["generic_prompt"]
+                    ).format(
+                        context=context,
+                        content_type=content_type,
+                        entity_name=entity_name
+                        if entity_name
+                        else f"descriptive name for this {content_type}",
+                        content=str(modal_content),
+                    )
+                else:
+                    generic_prompt = PROMPTS["generic_prompt"].format(
+                        content_type=content_type,
+                        entity_name=entity_name
+                        if entity_name
+                        else f"descriptive name for this {content_type}",
+                        content=str(modal_content),
+                    )
+
+                # Call LLM for generic analysis
+                response = await self.modal_caption_func(
+                    generic_prompt,
+                    system_prompt=PROMPTS["GENERIC_ANALYSIS_SYSTEM"].format(
+                        content_type=content_type
+                    ),
                 )
 
-            # Call LLM for generic analysis
-            response = await self.modal_caption_func(
-                generic_prompt,
-                system_prompt=PROMPTS["GENERIC_ANALYSIS_SYSTEM"].format(
-                    content_type=content_type
-                ),
-            )
+                # Parse response (reuse existing logic)
+                return self._parse_analysis_response(
+                    response, entity_name, content_type
+                )
 
-            # Parse response (reuse existing logic)
-            enhanced_caption, entity_info = self._parse_generic_response(
-                response, entity_name, content_type
+            return await self._cached_description(
+                modal_content, content_type, item_info, entity_name, describe
             )
 
-            return enhanced_caption, entity_info
-
         except Exception as e:
             logger.error(f"Error generating {content_type} description: {e}")
             # Fallback processing
@@ -1520,36 +1902,7 @@ class GenericModalProcessor(BaseModalProcessor):
         self, response: str, entity_name: str = None, content_type: str = "content"
     ) -> Tuple[str, Dict[str, Any]]:
         """Parse generic analysis response"""
-        try:
-            response_data = self._robust_json_parse(response)
-
-            description = response_data.get("detailed_description", "")
-            entity_data = response_data.get("entity_info", {})
-
-            if not description or not entity_data:
-                raise ValueError("Missing required fields in response")
-
-            if not all(
-                key in entity_data for key in ["entity_name", "entity_type", "summary"]
-            ):
-                raise ValueError("Missing required fields in entity_info")
-
-            entity_data["entity_name"] = (
-                entity_data["entity_name"] + f" ({entity_data['entity_type']})"
-            )
-            if entity_name:
-                entity_data["entity_name"] = entity_name
-
-            return description, entity_data
-
-        except (json.JSONDecodeError, AttributeError, ValueError) as e:
-            logger.error(f"Error parsing {content_type} analysis response: {e}")
-            logger.debug(f"Raw response: {response}")
-            fallback_entity = {
-                "entity_name": entity_name
-                if entity_name
-                else f"{content_type}_{compute_mdhash_id(response)}",
-                "entity_type": content_type,
-                "summary": response[:100] + "..." if len(response) > 100 else response,
-            }
-            return response, fallback_entity
+        description, entity_info, _ = self._parse_analysis_response(
+            response, entity_name, content_type
+        )
+        return description, entity_info
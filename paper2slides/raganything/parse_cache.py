@@ -0,0 +1,236 @@
+"""
+Parse cache keys, entries and validation
+
+Parse results are keyed by a streaming SHA-256 of the file bytes plus the
+parser configuration, not by path and mtime, so re-uploads and copies of a
+document reuse earlier parser output. An entry is only valid while the
+files it references (images, tables, equations, markdown) still exist.
+
+Normal mode stores entries in RAGAnything's parse_cache KV storage; fast
+mode, which has no LightRAG instance, reads and writes the same JSON file
+through ParseCacheFile, so both modes reuse each other's parser output.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .parser import Parser, MineruParser, DoclingParser
+
+logger = logging.getLogger(__name__)
+
+# Bump when entries written by older versions must not be reused
+CACHE_VERSION = "2.0"
+
+# Parser kwargs that change the parse output
+PARSE_CONFIG_KWARGS = (
+    "lang",
+    "device",
+    "start_page",
+    "end_page",
+    "formula",
+    "table",
+    "backend",
+    "source",
+)
+
+_HASH_CHUNK = 1024 * 1024
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+_hash_lock = threading.Lock()
+
+
+def file_sha256(file_path: Union[str, Path]) -> str:
+    """Streaming SHA-256 of a file, memoized by (path, size, mtime)"""
+    path = Path(file_path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _hash_lock:
+        cached = _hash_memo.get(memo_key)
+    if cached:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    result = digest.hexdigest()
+    with _hash_lock:
+        _hash_memo[memo_key] = result
+    return result
+
+
+def parse_config(parser: str, parse_method: str, **kwargs) -> Dict[str, Any]:
+    """Parser configuration that affects the output"""
+    config = {"parser": parser, "parse_method": parse_method}
+    config.update({k: v for k, v in kwargs.items() if k in PARSE_CONFIG_KWARGS})
+    return config
+
+
+def parse_cache_key(file_hash: str, config: Dict[str, Any]) -> str:
+    """Cache key for file contents parsed with a configuration"""
+    payload = {"file_sha256": file_hash, "config": config, "version": CACHE_VERSION}
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def referenced_files(content_list: List[Dict[str, Any]]) -> List[str]:
+    """Image, table and equation files referenced by a content list"""
+    paths = []
+    for item in content_list:
+        if isinstance(item, dict):
+            for field_name in ("img_path", "table_img_path", "equation_img_path"):
+                if item.get(field_name):
+                    paths.append(item[field_name])
+    return paths
+
+
+def missing_files(entry: Dict[str, Any]) -> List[str]:
+    """Files referenced by a cache entry that no longer exist"""
+    paths = referenced_files(entry.get("content_list") or [])
+    paths.extend(entry.get("markdown_paths") or [])
+    return [p for p in paths if not Path(p).exists()]
+
+
+def entry_is_valid(
+    entry: Optional[Dict[str, Any]], file_hash: str, config: Dict[str, Any]
+) -> bool:
+    """Whether a stored entry can stand in for parsing this file"""
+    if not entry or entry.get("cache_version") != CACHE_VERSION:
+        return False
+    if entry.get("file_sha256") != file_hash or entry.get("parse_config") != config:
+        return False
+    return not missing_files(entry)
+
+
+def content_doc_id(content_list: List[Dict[str, Any]]) -> str:
+    """Content-based document ID (doc- prefix) of a parsed content list"""
+    from lightrag.utils import compute_mdhash_id
+
+    content_hash_data = []
+    for item in content_list:
+        if isinstance(item, dict):
+            # For text content, use the text
+            if item.get("type") == "text" and item.get("text"):
+                content_hash_data.append(item["text"].strip())
+            # For other content types, use key identifiers
+            elif item.get("type") == "image" and item.get("img_path"):
+                content_hash_data.append(f"image:{item['img_path']}")
+            elif item.get("type") == "table" and item.get("table_body"):
+                content_hash_data.append(f"table:{item['table_body']}")
+            elif item.get("type") == "equation" and item.get("text"):
+                content_hash_data.append(f"equation:{item['text']}")
+            else:
+                # For other types, use string representation
+                content_hash_data.append(str(item))
+
+    return compute_mdhash_id("\n".join(content_hash_data), prefix="doc-")
+
+
+def find_markdown(output_dir: Union[str, Path], file_stem: str) -> List[str]:
+    """Markdown files the parser wrote for a document (<output_dir>/<stem>/...)"""
+    stem_dir = Path(output_dir) / file_stem
+    if not stem_dir.is_dir():
+        return []
+    return [str(p) for p in sorted(stem_dir.rglob("*.md"))]
+
+
+def read_parser_output(
+    file_path: Union[str, Path],
+    output_dir: Union[str, Path],
+    parser: str,
+    parse_method: str,
+    backend: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Content list of a document already parsed into output_dir"""
+    file_path = Path(file_path)
+    if parser == "docling":
+        content_list, _ = DoclingParser()._read_output_files(
+            Path(output_dir), file_path.stem
+        )
+        return content_list
+    if file_path.suffix.lower() in Parser.IMAGE_FORMATS:
+        method = "ocr"
+    elif (backend or "").startswith("vlm-"):
+        method = "vlm"
+    else:
+        method = parse_method
+    content_list, _ = MineruParser._read_output_files(
+        Path(output_dir), file_path.stem, method=method
+    )
+    return content_list
+
+
+def build_entry(
+    file_path: Union[str, Path],
+    content_list: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    markdown_paths: Optional[List[str]] = None,
+    doc_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Cache entry for a parsed document"""
+    return {
+        "content_list": content_list,
+        "doc_id": doc_id or content_doc_id(content_list),
+        "file_sha256": file_sha256(file_path),
+        "source_path": str(Path(file_path).absolute()),
+        "markdown_paths": markdown_paths or [],
+        "parse_config": config,
+        "cached_at": time.time(),
+        "cache_version": CACHE_VERSION,
+    }
+
+
+class ParseCacheFile:
+    """
+    Synchronous access to RAGAnything's parse cache file
+
+    The file is LightRAG's JSON KV storage for the "parse_cache" namespace:
+    <working_dir>/[<workspace>/]kv_store_parse_cache.json.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, working_dir: Union[str, Path], workspace: Optional[str] = None):
+        workspace = os.getenv("WORKSPACE", "") if workspace is None else workspace
+        directory = Path(working_dir) / workspace if workspace else Path(working_dir)
+        self.path = directory / "kv_store_parse_cache.json"
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read parse cache {self.path}: {e}")
+            return {}
+
+    def lookup(
+        self, file_path: Union[str, Path], config: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Valid entry for this file and configuration, or None"""
+        file_hash = file_sha256(file_path)
+        with self._lock:
+            entry = self._load().get(parse_cache_key(file_hash, config))
+        return entry if entry_is_valid(entry, file_hash, config) else None
+
+    def store(
+        self, file_path: Union[str, Path], config: Dict[str, Any], entry: Dict[str, Any]
+    ):
+        """Add or replace the entry for this file and configuration"""
+        key = parse_cache_key(file_sha256(file_path), config)
+        now = int(time.time())
+        with self._lock:
+            data = self._load()
+            data[key] = dict(entry, _id=key, create_time=now, update_time=now)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
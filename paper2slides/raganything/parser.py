@@ -12,6 +12,7 @@ For Office documents (.doc, .docx, .ppt, .pptx), please convert them to PDF form
 from __future__ import annotations
 
 
+import os
 import json
 import argparse
 import base64
@@ -616,6 +617,30 @@ class MineruParser(Parser):
             source: Model source
             vlm_url: When the backend is `vlm-sglang-client`, you need to specify the server_url
         """
+        # Prefer the persistent worker pool: models stay loaded across documents
+        from .mineru_worker import run_in_worker
+
+        try:
+            if run_in_worker(
+                input_path,
+                output_dir,
+                device=device,
+                source=source,
+                method=method,
+                lang=lang,
+                backend=backend,
+                start_page=start_page,
+                end_page=end_page,
+                formula=formula,
+                table=table,
+                vlm_url=vlm_url,
+            ):
+                logging.info(f"[MinerU] Parsed {input_path} in worker process")
+                return
+        except Exception as e:
+            logging.error(f"[MinerU] Worker parse failed: {e}")
+            raise MineruExecutionError(1, [str(e)]) from e
+
         cmd = [
             "mineru",
             "-p",
@@ -853,6 +878,172 @@ class MineruParser(Parser):
 
         return content_list, md_content
 
+    @staticmethod
+    def _count_pdf_pages(pdf_path: Path) -> Optional[int]:
+        """Page count via pypdfium2 (a MinerU dependency) or pypdf; None if unavailable"""
+        try:
+            import pypdfium2
+
+            pdf = pypdfium2.PdfDocument(str(pdf_path))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except ImportError:
+            pass
+        try:
+            from pypdf import PdfReader
+
+            return len(PdfReader(str(pdf_path)).pages)
+        except ImportError:
+            return None
+
+    @classmethod
+    def _shard_ranges(
+        cls, pdf_path: Path, shard_pages: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Page ranges (0-based, inclusive end) to parse separately
+
+        Returns an empty list when the document fits into one shard or its
+        page count cannot be read.
+        """
+        if shard_pages <= 0:
+            return []
+        try:
+            num_pages = cls._count_pdf_pages(pdf_path)
+        except Exception as e:
+            logging.warning(f"Could not count pages of {pdf_path}: {e}")
+            return []
+        if not num_pages or num_pages <= shard_pages:
+            return []
+        return [
+            (start, min(start + shard_pages, num_pages) - 1)
+            for start in range(0, num_pages, shard_pages)
+        ]
+
+    @staticmethod
+    def _merge_shards(
+        shard_dirs: List[Tuple[int, Path]], target_dir: Path, file_stem: str
+    ) -> None:
+        """
+        Merge per-shard MinerU outputs into one output directory
+
+        page_idx values are shifted by each shard's first page; images are
+        moved into target_dir/images and renamed on name clashes, with
+        content list and markdown references updated to match.
+
+        Args:
+            shard_dirs: (first page, shard method directory) in page order
+            target_dir: Method directory of the merged output
+            file_stem: File name without extension
+        """
+        import shutil
+
+        images_dir = target_dir / "images"
+        images_dir.mkdir(parents=True, exist_ok=True)
+        md_parts = []
+        content_list = []
+
+        for index, (start_page, shard_dir) in enumerate(shard_dirs):
+            renames = {}
+            shard_images = shard_dir / "images"
+            if shard_images.is_dir():
+                for image in sorted(shard_images.iterdir()):
+                    name = image.name
+                    if (images_dir / name).exists():
+                        name = f"s{index}_{name}"
+                        renames[f"images/{image.name}"] = f"images/{name}"
+                    shutil.move(str(image), str(images_dir / name))
+
+            md_file = shard_dir / f"{file_stem}.md"
+            if md_file.exists():
+                md = md_file.read_text(encoding="utf-8")
+                for old, new in renames.items():
+                    md = md.replace(old, new)
+                md_parts.append(md.strip())
+
+            json_file = shard_dir / f"{file_stem}_content_list.json"
+            if json_file.exists():
+                with open(json_file, "r", encoding="utf-8") as f:
+                    items = json.load(f)
+                for item in items:
+                    if not isinstance(item, dict):
+                        continue
+                    item["page_idx"] = item.get("page_idx", 0) + start_page
+                    for field_name in ["img_path", "table_img_path", "equation_img_path"]:
+                        if item.get(field_name) in renames:
+                            item[field_name] = renames[item[field_name]]
+                    content_list.append(item)
+
+        (target_dir / f"{file_stem}.md").write_text(
+            "\n\n".join(md_parts) + "\n", encoding="utf-8"
+        )
+        with open(
+            target_dir / f"{file_stem}_content_list.json", "w", encoding="utf-8"
+        ) as f:
+            json.dump(content_list, f, ensure_ascii=False, indent=4)
+
+    @classmethod
+    def _run_sharded(
+        cls,
+        pdf_path: Path,
+        output_dir: Path,
+        ranges: List[Tuple[int, int]],
+        method: str = "auto",
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Parse page ranges of a PDF concurrently and merge them
+
+        Each range is a separate MinerU job (worker process or CLI run) with
+        its own output directory; shard directories are removed afterwards.
+        """
+        import shutil
+        from concurrent.futures import ThreadPoolExecutor
+        from .mineru_worker import reserve_workers
+
+        file_stem = pdf_path.stem
+        out_method = "vlm" if (kwargs.get("backend") or "").startswith("vlm-") else method
+        shards_root = output_dir / f".{file_stem}_shards"
+        if max_workers is None:
+            max_workers = int(os.getenv("MINERU_SHARD_WORKERS", "2") or 2)
+
+        logging.info(
+            f"[MinerU] Parsing {pdf_path.name} in {len(ranges)} shards "
+            f"({max_workers} at a time)"
+        )
+
+        def run_shard(page_range: Tuple[int, int]) -> Path:
+            start, end = page_range
+            shard_out = shards_root / f"p{start:05d}-{end:05d}"
+            cls._run_mineru_command(
+                input_path=pdf_path,
+                output_dir=shard_out,
+                method=method,
+                start_page=start,
+                end_page=end,
+                **kwargs,
+            )
+            return shard_out / file_stem / out_method
+
+        concurrency = max(1, min(max_workers, len(ranges)))
+        # Shards go to the shared worker pool; give it a process per shard thread
+        reserve_workers(concurrency)
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                shard_dirs = list(executor.map(run_shard, ranges))
+            target_dir = output_dir / file_stem / out_method
+            target_dir.mkdir(parents=True, exist_ok=True)
+            cls._merge_shards(
+                [(start, shard_dir) for (start, _), shard_dir in zip(ranges, shard_dirs)],
+                target_dir,
+                file_stem,
+            )
+        finally:
+            shutil.rmtree(shards_root, ignore_errors=True)
+
     def parse_pdf(
         self,
         pdf_path: Union[str, Path],
@@ -869,7 +1060,9 @@ class MineruParser(Parser):
             output_dir: Output directory path
             method: Parsing method (auto, txt, ocr)
             lang: Document language for OCR optimization
-            **kwargs: Additional parameters for mineru command
+            **kwargs: Additional parameters for mineru command; shard_pages
+                (default MINERU_SHARD_PAGES, 0 = off) splits longer documents
+                into page ranges parsed in parallel
 
         Returns:
             List[Dict[str, Any]]: List of content blocks
@@ -890,14 +1083,27 @@ class MineruParser(Parser):
 
             base_output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Run mineru command
-            self._run_mineru_command(
-                input_path=pdf_path,
-                output_dir=base_output_dir,
-                method=method,
-                lang=lang,
-                **kwargs,
-            )
+            # Long documents are split into page ranges parsed in parallel
+            shard_pages = kwargs.pop("shard_pages", None)
+            if shard_pages is None:
+                shard_pages = int(os.getenv("MINERU_SHARD_PAGES", "0") or 0)
+            ranges = []
+            if kwargs.get("start_page") is None and kwargs.get("end_page") is None:
+                ranges = self._shard_ranges(pdf_path, shard_pages)
+
+            if ranges:
+                self._run_sharded(
+                    pdf_path, base_output_dir, ranges, method=method, lang=lang, **kwargs
+                )
+            else:
+                # Run mineru command
+                self._run_mineru_command(
+                    input_path=pdf_path,
+                    output_dir=base_output_dir,
+                    method=method,
+                    lang=lang,
+                    **kwargs,
+                )
 
             # Read the generated output files
             backend = kwargs.get("backend", "")
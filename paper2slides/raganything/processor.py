@@ -6,13 +6,21 @@ Contains methods for parsing documents and processing multimodal content
 
 import os
 import time
-import hashlib
-import json
 from typing import Dict, List, Any, Tuple, Optional
 from pathlib import Path
 
 from raganything.base import DocStatus
 from raganything.parser import MineruParser, DoclingParser, MineruExecutionError
+from raganything.concurrency import ConcurrencyPool
+from raganything.parse_cache import (
+    build_entry,
+    content_doc_id,
+    entry_is_valid,
+    file_sha256,
+    find_markdown,
+    parse_cache_key,
+    parse_config,
+)
 from raganything.utils import (
     separate_content,
     insert_text_content,
@@ -30,7 +38,10 @@ class ProcessorMixin:
         self, file_path: Path, parse_method: str = None, **kwargs
     ) -> str:
         """
-        Generate cache key based on file path and parsing configuration
+        Generate cache key based on file contents and parsing configuration
+
+        The key uses a SHA-256 of the file bytes rather than path and mtime,
+        so re-uploads and copies of the same document share cache entries.
 
         Args:
             file_path: Path to the file
@@ -40,41 +51,10 @@ class ProcessorMixin:
         Returns:
             str: Cache key for the file and configuration
         """
-
-        # Get file modification time
-        mtime = file_path.stat().st_mtime
-
-        # Create configuration dict for cache key
-        config_dict = {
-            "file_path": str(file_path.absolute()),
-            "mtime": mtime,
-            "parser": self.config.parser,
-            "parse_method": parse_method or self.config.parse_method,
-        }
-
-        # Add relevant kwargs to config
-        relevant_kwargs = {
-            k: v
-            for k, v in kwargs.items()
-            if k
-            in [
-                "lang",
-                "device",
-                "start_page",
-                "end_page",
-                "formula",
-                "table",
-                "backend",
-                "source",
-            ]
-        }
-        config_dict.update(relevant_kwargs)
-
-        # Generate hash from config
-        config_str = json.dumps(config_dict, sort_keys=True)
-        cache_key = hashlib.md5(config_str.encode()).hexdigest()
-
-        return cache_key
+        config = parse_config(
+            self.config.parser, parse_method or self.config.parse_method, **kwargs
+        )
+        return parse_cache_key(file_sha256(file_path), config)
 
     def _generate_content_based_doc_id(self, content_list: List[Dict[str, Any]]) -> str:
         """
@@ -86,34 +66,7 @@ class ProcessorMixin:
         Returns:
             str: Content-based document ID with doc- prefix
         """
-        from lightrag.utils import compute_mdhash_id
-
-        # Extract key content for ID generation
-        content_hash_data = []
-
-        for item in content_list:
-            if isinstance(item, dict):
-                # For text content, use the text
-                if item.get("type") == "text" and item.get("text"):
-                    content_hash_data.append(item["text"].strip())
-                # For other content types, use key identifiers
-                elif item.get("type") == "image" and item.get("img_path"):
-                    content_hash_data.append(f"image:{item['img_path']}")
-                elif item.get("type") == "table" and item.get("table_body"):
-                    content_hash_data.append(f"table:{item['table_body']}")
-                elif item.get("type") == "equation" and item.get("text"):
-                    content_hash_data.append(f"equation:{item['text']}")
-                else:
-                    # For other types, use string representation
-                    content_hash_data.append(str(item))
-
-        # Create a content signature
-        content_signature = "\n".join(content_hash_data)
-
-        # Generate doc_id from content
-        doc_id = compute_mdhash_id(content_signature, prefix="doc-")
-
-        return doc_id
+        return content_doc_id(content_list)
 
     async def _get_cached_result(
         self, cache_key: str, file_path: Path, parse_method: str = None, **kwargs
@@ -123,7 +76,7 @@ class ProcessorMixin:
 
         Args:
             cache_key: Cache key to look up
-            file_path: Path to the file for mtime check
+            file_path: Path to the file for the content hash check
             parse_method: Parse method used
             **kwargs: Additional parser parameters
 
@@ -138,41 +91,13 @@ class ProcessorMixin:
             if not cached_data:
                 return None
 
-            # Check file modification time
-            current_mtime = file_path.stat().st_mtime
-            cached_mtime = cached_data.get("mtime", 0)
-
-            if current_mtime != cached_mtime:
-                self.logger.debug(f"Cache invalid - file modified: {cache_key}")
-                return None
-
-            # Check parsing configuration
-            cached_config = cached_data.get("parse_config", {})
-            current_config = {
-                "parser": self.config.parser,
-                "parse_method": parse_method or self.config.parse_method,
-            }
-
-            # Add relevant kwargs to current config
-            relevant_kwargs = {
-                k: v
-                for k, v in kwargs.items()
-                if k
-                in [
-                    "lang",
-                    "device",
-                    "start_page",
-                    "end_page",
-                    "formula",
-                    "table",
-                    "backend",
-                    "source",
-                ]
-            }
-            current_config.update(relevant_kwargs)
-
-            if cached_config != current_config:
-                self.logger.debug(f"Cache invalid - config changed: {cache_key}")
+            current_config = parse_config(
+                self.config.parser, parse_method or self.config.parse_method, **kwargs
+            )
+            if not entry_is_valid(cached_data, file_sha256(file_path), current_config):
+                self.logger.debug(
+                    f"Cache invalid - content, config or parser output changed: {cache_key}"
+                )
                 return None
 
             content_list = cached_data.get("content_list", [])
@@ -201,6 +126,7 @@ class ProcessorMixin:
         doc_id: str,
         file_path: Path,
         parse_method: str = None,
+        markdown_paths: Optional[List[str]] = None,
         **kwargs,
     ) -> None:
         """
@@ -210,50 +136,22 @@ class ProcessorMixin:
             cache_key: Cache key to store under
             content_list: Content list to cache
             doc_id: Content-based document ID
-            file_path: Path to the file for mtime storage
+            file_path: Path to the file for the content hash
             parse_method: Parse method used
+            markdown_paths: Markdown files the parser wrote (used by fast mode)
             **kwargs: Additional parser parameters
         """
         if not hasattr(self, "parse_cache") or self.parse_cache is None:
             return
 
         try:
-            # Get file modification time
-            file_mtime = file_path.stat().st_mtime
-
-            # Create parsing configuration
-            parse_config = {
-                "parser": self.config.parser,
-                "parse_method": parse_method or self.config.parse_method,
-            }
-
-            # Add relevant kwargs to config
-            relevant_kwargs = {
-                k: v
-                for k, v in kwargs.items()
-                if k
-                in [
-                    "lang",
-                    "device",
-                    "start_page",
-                    "end_page",
-                    "formula",
-                    "table",
-                    "backend",
-                    "source",
-                ]
-            }
-            parse_config.update(relevant_kwargs)
-
+            config = parse_config(
+                self.config.parser, parse_method or self.config.parse_method, **kwargs
+            )
             cache_data = {
-                cache_key: {
-                    "content_list": content_list,
-                    "doc_id": doc_id,
-                    "mtime": file_mtime,
-                    "parse_config": parse_config,
-                    "cached_at": time.time(),
-                    "cache_version": "1.0",
-                }
+                cache_key: build_entry(
+                    file_path, content_list, config, markdown_paths, doc_id=doc_id
+                )
             }
             await self.parse_cache.upsert(cache_data)
             # Ensure data is persisted to disk
@@ -415,7 +313,13 @@ class ProcessorMixin:
 
         # Store result in cache
         await self._store_cached_result(
-            cache_key, content_list, doc_id, file_path, parse_method, **kwargs
+            cache_key,
+            content_list,
+            doc_id,
+            file_path,
+            parse_method,
+            markdown_paths=find_markdown(output_dir, file_path.stem),
+            **kwargs,
         )
 
         # Display content statistics if requested
@@ -526,6 +430,8 @@ class ProcessorMixin:
             await self._process_multimodal_content_individual(
                 multimodal_items, file_path, doc_id
             )
+            if self.description_cache is not None:
+                await self.description_cache.flush()
 
             # Mark multimodal content as processed even after fallback
             await self._mark_multimodal_processing_complete(doc_id)
@@ -684,6 +590,51 @@ class ProcessorMixin:
         # Mark multimodal content as processed
         await self._mark_multimodal_processing_complete(doc_id)
 
+    def _get_concurrency_pool(self, phase: str) -> ConcurrencyPool:
+        """
+        Concurrency pool of an indexing phase, shared by all documents
+
+        Args:
+            phase: "description" (vision/LLM calls) or "merge" (graph merges)
+
+        Returns:
+            ConcurrencyPool: The phase's pool
+        """
+        pools = self.__dict__.setdefault("_concurrency_pools", {})
+        if phase not in pools:
+            if phase == "description":
+                pools[phase] = ConcurrencyPool(
+                    phase,
+                    self.config.description_max_async,
+                    adaptive=self.config.adaptive_description_concurrency,
+                )
+            else:
+                pools[phase] = ConcurrencyPool(
+                    phase,
+                    self.config.max_concurrent_merges
+                    or getattr(self.lightrag, "max_parallel_insert", 2),
+                )
+        return pools[phase]
+
+    def _phase_global_config(self, max_async: int, per_slot: int = 1) -> Dict[str, Any]:
+        """
+        LightRAG global config with llm_model_max_async set for one phase
+
+        Args:
+            max_async: Concurrency of the phase (0 = keep LightRAG's setting)
+            per_slot: Tasks LightRAG runs per llm_model_max_async unit in this phase
+
+        Returns:
+            Dict[str, Any]: Global config for extract_entities/merge_nodes_and_edges
+        """
+        global_config = self.lightrag.__dict__
+        if max_async > 0:
+            global_config = {
+                **global_config,
+                "llm_model_max_async": max(1, -(-max_async // per_slot)),
+            }
+        return global_config
+
     async def _process_multimodal_content_batch_type_aware(
         self, multimodal_items: List[Dict[str, Any]], file_path: str, doc_id: str
     ):
@@ -709,8 +660,9 @@ class ProcessorMixin:
         except Exception:
             existing_chunks_count = 0
 
-        # Use LightRAG's concurrency control
-        semaphore = asyncio.Semaphore(getattr(self.lightrag, "max_parallel_insert", 2))
+        # Description calls have their own pool, shared across documents and
+        # independent of LightRAG's insert limit
+        description_pool = self._get_concurrency_pool("description")
 
         # Progress tracking variables
         total_items = len(multimodal_items)
@@ -720,57 +672,78 @@ class ProcessorMixin:
         # Log processing start
         self.logger.info(f"Starting to process {total_items} multimodal content items")
 
-        # Stage 1: Concurrent generation of descriptions using correct processors for each type
-        async def process_single_item_with_correct_processor(
-            item: Dict[str, Any], index: int, file_path: str
+        # Stage 1: Concurrent generation of descriptions using correct processors for each type.
+        # Items of one type are grouped description_batch_size at a time; each
+        # group is one LLM request (a group of one is the plain per-item call).
+        batch_size = max(1, getattr(self.config, "description_batch_size", 1))
+        items_by_type: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, item in enumerate(multimodal_items):
+            items_by_type.setdefault(item.get("type", "unknown"), []).append(
+                (index, item)
+            )
+
+        async def process_group_with_correct_processor(
+            content_type: str, group: List[Tuple[int, Dict[str, Any]]], file_path: str
         ):
-            """Process single item using the correct processor for its type"""
+            """Describe a group of same-type items using the correct processor"""
             nonlocal completed_count
-            async with semaphore:
-                try:
-                    content_type = item.get("type", "unknown")
+            # Select the correct processor based on content type
+            processor = get_processor_for_type(self.modal_processors, content_type)
+            if not processor:
+                self.logger.warning(f"No processor found for type: {content_type}")
+                return []
 
-                    # Select the correct processor based on content type
-                    processor = get_processor_for_type(
-                        self.modal_processors, content_type
-                    )
+            item_infos = [
+                {
+                    "page_idx": item.get("page_idx", 0),
+                    "index": index,
+                    "type": content_type,
+                }
+                for index, item in group
+            ]
 
-                    if not processor:
-                        self.logger.warning(
-                            f"No processor found for type: {content_type}"
+            # Items that fail stay None and are skipped; the rest of the group is kept
+            descriptions = [None] * len(group)
+            try:
+                # Cached descriptions don't take a slot (or skew its latency)
+                descriptions = await processor.cached_descriptions(
+                    [item for _, item in group], content_type, item_infos
+                )
+                if None in descriptions:
+                    async with description_pool.slot():
+                        descriptions = await processor.generate_descriptions_batch(
+                            [item for _, item in group],
+                            content_type,
+                            item_infos,
+                            cached=descriptions,
                         )
-                        return None
-
-                    item_info = {
-                        "page_idx": item.get("page_idx", 0),
-                        "index": index,
-                        "type": content_type,
-                    }
+            except Exception as e:
+                self.logger.error(
+                    f"Error generating descriptions for {content_type} items "
+                    f"{[index for index, _ in group]}: {e}"
+                )
 
-                    # Call the correct processor's description generation method
-                    (
-                        description,
-                        entity_info,
-                    ) = await processor.generate_description_only(
-                        modal_content=item,
-                        content_type=content_type,
-                        item_info=item_info,
-                        entity_name=None,  # Let LLM auto-generate
+            # Update progress (non-blocking)
+            async with progress_lock:
+                step = max(1, total_items // 10)
+                previous = completed_count
+                completed_count += len(group)
+                if (
+                    completed_count // step > previous // step
+                    or completed_count == total_items
+                ):
+                    progress_percent = (completed_count / total_items) * 100
+                    self.logger.info(
+                        f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
                     )
 
-                    # Update progress (non-blocking)
-                    async with progress_lock:
-                        completed_count += 1
-                        if (
-                            completed_count % max(1, total_items // 10) == 0
-                            or completed_count == total_items
-                        ):
-                            progress_percent = (completed_count / total_items) * 100
-                            self.logger.info(
-                                f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
-                            )
-
-                    return {
+            group_results = []
+            for (index, item), item_info, result in zip(group, item_infos, descriptions):
+                if result is None:
+                    continue
+                description, entity_info = result
+                group_results.append(
+                    {
                         "index": index,
                         "content_type": content_type,
                         "description": description,
@@ -781,43 +754,39 @@ class ProcessorMixin:
                         "processor": processor,  # Keep reference to the processor used
                         "file_path": file_path,  # Add file_path to the result
                     }
+                )
+            return group_results
 
-                except Exception as e:
-                    # Update progress even on error (non-blocking)
-                    async with progress_lock:
-                        completed_count += 1
-                        if (
-                            completed_count % max(1, total_items // 10) == 0
-                            or completed_count == total_items
-                        ):
-                            progress_percent = (completed_count / total_items) * 100
-                            self.logger.info(
-                                f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
-                            )
-
-                    self.logger.error(
-                        f"Error generating description for {content_type} item {index}: {e}"
-                    )
-                    return None
-
-        # Process all items concurrently with correct processors
+        # Process all groups concurrently with correct processors
         tasks = [
             asyncio.create_task(
-                process_single_item_with_correct_processor(item, i, file_path)
+                process_group_with_correct_processor(
+                    content_type, items[start : start + batch_size], file_path
+                )
             )
-            for i, item in enumerate(multimodal_items)
+            for content_type, items in items_by_type.items()
+            for start in range(0, len(items), batch_size)
         ]
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        group_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Persist new descriptions once per document rather than per item
+        if self.description_cache is not None:
+            await self.description_cache.flush()
+            cache_stats = self.description_cache.snapshot()
+            self.logger.info(
+                f"Description cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"(hit rate {cache_stats['hit_rate']})"
+            )
 
         # Filter successful results
         multimodal_data_list = []
-        for result in results:
+        for result in group_results:
             if isinstance(result, Exception):
                 self.logger.error(f"Task failed: {result}")
                 continue
-            if result is not None:
-                multimodal_data_list.append(result)
+            multimodal_data_list.extend(result)
+        multimodal_data_list.sort(key=lambda data: data["index"])
 
         if not multimodal_data_list:
             self.logger.warning("No valid multimodal descriptions generated")
@@ -1165,7 +1134,7 @@ class ProcessorMixin:
         # Directly use LightRAG's extract_entities
         chunk_results = await extract_entities(
             chunks=lightrag_chunks,
-            global_config=self.lightrag.__dict__,
+            global_config=self._phase_global_config(self.config.extraction_max_async),
             pipeline_status=pipeline_status,
             pipeline_status_lock=pipeline_status_lock,
             llm_response_cache=self.lightrag.llm_response_cache,
@@ -1254,22 +1223,28 @@ class ProcessorMixin:
         pipeline_status = await get_namespace_data("pipeline_status")
         pipeline_status_lock = get_pipeline_status_lock()
 
-        await merge_nodes_and_edges(
-            chunk_results=enhanced_chunk_results,
-            knowledge_graph_inst=self.lightrag.chunk_entity_relation_graph,
-            entity_vdb=self.lightrag.entities_vdb,
-            relationships_vdb=self.lightrag.relationships_vdb,
-            global_config=self.lightrag.__dict__,
-            full_entities_storage=self.lightrag.full_entities,
-            full_relations_storage=self.lightrag.full_relations,
-            doc_id=doc_id,
-            pipeline_status=pipeline_status,
-            pipeline_status_lock=pipeline_status_lock,
-            llm_response_cache=self.lightrag.llm_response_cache,
-            current_file_number=1,
-            total_files=1,
-            file_path=os.path.basename(file_path),
-        )
+        # Storage-bound: documents queue here without holding description
+        # or extraction slots
+        async with self._get_concurrency_pool("merge").slot():
+            await merge_nodes_and_edges(
+                chunk_results=enhanced_chunk_results,
+                knowledge_graph_inst=self.lightrag.chunk_entity_relation_graph,
+                entity_vdb=self.lightrag.entities_vdb,
+                relationships_vdb=self.lightrag.relationships_vdb,
+                # LightRAG runs 2 x llm_model_max_async merges at once
+                global_config=self._phase_global_config(
+                    self.config.merge_max_async, per_slot=2
+                ),
+                full_entities_storage=self.lightrag.full_entities,
+                full_relations_storage=self.lightrag.full_relations,
+                doc_id=doc_id,
+                pipeline_status=pipeline_status,
+                pipeline_status_lock=pipeline_status_lock,
+                llm_response_cache=self.lightrag.llm_response_cache,
+                current_file_number=1,
+                total_files=1,
+                file_path=os.path.basename(file_path),
+            )
 
         await self.lightrag._insert_done()
 
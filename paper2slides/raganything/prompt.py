@@ -271,6 +271,26 @@ Content: {content}
 
 Focus on extracting meaningful information that would be useful for knowledge retrieval and understanding the content's role in the broader context."""
 
+# Batched description prompts: several items of one type in a single request
+PROMPTS[
+    "batch_description_prompt"
+] = """You will analyze {count} {content_type} items. Each item below comes with its own instructions and JSON structure.
+
+Respond with a single JSON object of the form:
+
+{{
+    "items": [
+        {{"item": 1, "detailed_description": "...", "entity_info": {{"entity_name": "...", "entity_type": "...", "summary": "..."}}}},
+        ...
+    ]
+}}
+
+Include exactly one entry per item, numbered as below, each following that item's structure. Analyze every item independently."""
+
+PROMPTS["batch_description_item"] = """### Item {number}
+
+{prompt}"""
+
 # Modal chunk templates
 PROMPTS["image_chunk"] = """
 Image Content Analysis:
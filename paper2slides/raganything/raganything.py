@@ -32,6 +32,7 @@ from raganything.config import RAGAnythingConfig
 from raganything.query import QueryMixin
 from raganything.processor import ProcessorMixin
 from raganything.batch import BatchMixin
+from raganything.description_cache import DescriptionCache
 from raganything.utils import get_processor_supports
 from raganything.parser import MineruParser, DoclingParser
 
@@ -93,6 +94,9 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
     parse_cache: Optional[Any] = field(default=None, init=False)
     """Parse result cache storage using LightRAG KV storage."""
 
+    description_cache: Optional[DescriptionCache] = field(default=None, init=False)
+    """Multimodal description cache over LightRAG KV storage (None if disabled)."""
+
     _parser_installation_checked: bool = field(default=False, init=False)
     """Flag to track if parser installation has been checked."""
 
@@ -212,6 +216,9 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             context_extractor=self.context_extractor,
         )
 
+        for processor in self.modal_processors.values():
+            processor.description_cache = self.description_cache
+
         self.logger.info("Multimodal processors initialized with context support")
         self.logger.info(f"Available processors: {list(self.modal_processors.keys())}")
         self.logger.info(f"Context configuration: {self._create_context_config()}")
@@ -225,6 +232,26 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             else:
                 self.logger.warning(f"Unknown config parameter: {key}")
 
+    async def _initialize_description_cache(self):
+        """Create the description cache in LightRAG's KV storage if enabled"""
+        if not self.config.enable_description_cache:
+            return
+
+        storage = self.lightrag.key_string_value_json_storage_cls(
+            namespace="description_cache",
+            workspace=self.lightrag.workspace,
+            global_config=self.lightrag.__dict__,
+            embedding_func=self.embedding_func,
+        )
+        await storage.initialize()
+        self.description_cache = DescriptionCache(
+            storage,
+            model=self.config.description_cache_model
+            or getattr(self.lightrag, "llm_model_name", ""),
+        )
+        for processor in self.modal_processors.values():
+            processor.description_cache = self.description_cache
+
     async def _ensure_lightrag_initialized(self):
         """Ensure LightRAG instance is initialized, create if necessary"""
         try:
@@ -274,6 +301,9 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                         )
                         await self.parse_cache.initialize()
 
+                    if self.description_cache is None:
+                        await self._initialize_description_cache()
+
                     # Initialize processors if not already done
                     if not self.modal_processors:
                         self._initialize_processors()
@@ -333,6 +363,7 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                     embedding_func=self.embedding_func,
                 )
                 await self.parse_cache.initialize()
+                await self._initialize_description_cache()
 
                 # Initialize processors after LightRAG is ready
                 self._initialize_processors()
@@ -382,6 +413,12 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 tasks.append(self.parse_cache.finalize())
                 self.logger.debug("Scheduled parse cache finalization")
 
+            # Persist and finalize the description cache if it exists
+            if self.description_cache is not None:
+                await self.description_cache.flush()
+                tasks.append(self.description_cache.storage.finalize())
+                self.logger.debug("Scheduled description cache finalization")
+
             # Finalize LightRAG storages if LightRAG is initialized
             if self.lightrag is not None:
                 tasks.append(self.lightrag.finalize_storages())
@@ -434,6 +471,22 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 "enable_image_processing": self.config.enable_image_processing,
                 "enable_table_processing": self.config.enable_table_processing,
                 "enable_equation_processing": self.config.enable_equation_processing,
+                "description_batch_size": self.config.description_batch_size,
+                "enable_description_cache": self.config.enable_description_cache,
+                "description_cache": self.description_cache.snapshot()
+                if self.description_cache is not None
+                else None,
+            },
+            "concurrency": {
+                "description_max_async": self.config.description_max_async,
+                "adaptive_description_concurrency": self.config.adaptive_description_concurrency,
+                "extraction_max_async": self.config.extraction_max_async,
+                "merge_max_async": self.config.merge_max_async,
+                "max_concurrent_merges": self.config.max_concurrent_merges,
+                "pools": {
+                    phase: pool.snapshot()
+                    for phase, pool in self.__dict__.get("_concurrency_pools", {}).items()
+                },
             },
             "context_extraction": {
                 "context_window": self.config.context_window,
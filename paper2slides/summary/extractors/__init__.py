@@ -4,6 +4,7 @@ Extractors for tables, figures, and table cleaning
 from pathlib import Path
 from .table_extractor import extract_tables
 from .figure_extractor import extract_figures
+from .markdown_index import MarkdownIndex
 from .table_cleaner import remove_tables_from_summary, identify_table_blocks, TABLE_PLACEHOLDER
 from ..models import OriginalElements, EnhancedSummary
 
@@ -19,7 +20,8 @@ def extract_tables_and_figures(
     
     This function searches for HTML tables and images, then looks for their
     captions within a configurable range of lines. If line-based search fails,
-    it falls back to character-position-based search.
+    it falls back to character-position-based search. Line offsets and caption
+    candidates are indexed once and shared by both extractors.
     
     Args:
         markdown_path: Path to the markdown file
@@ -36,11 +38,13 @@ def extract_tables_and_figures(
     if include_base_path:
         elements.base_path = str(Path(markdown_path).parent)
     
+    index = MarkdownIndex(content, lines)
+    
     # Extract figures
-    elements.figures = extract_figures(content, lines, search_range, search_chars)
+    elements.figures = extract_figures(content, lines, search_range, search_chars, index)
     
     # Extract tables
-    elements.tables = extract_tables(content, lines, search_range, search_chars)
+    elements.tables = extract_tables(content, lines, search_range, search_chars, index)
     
     return elements
 
@@ -79,6 +83,7 @@ def create_enhanced_summary(
 __all__ = [
     "extract_tables",
     "extract_figures",
+    "MarkdownIndex",
     "remove_tables_from_summary",
     "identify_table_blocks",
     "TABLE_PLACEHOLDER",
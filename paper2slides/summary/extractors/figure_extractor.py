@@ -4,6 +4,7 @@ Figure extraction from markdown documents
 import re
 from typing import List, Tuple, Optional
 from ..models import FigureInfo
+from .markdown_index import MarkdownIndex
 
 
 def extract_figures(
@@ -11,6 +12,7 @@ def extract_figures(
     lines: List[str],
     search_range: int = 5,
     search_chars: int = 500,
+    index: Optional[MarkdownIndex] = None,
 ) -> List[FigureInfo]:
     """
     Extract figures from markdown content.
@@ -20,10 +22,13 @@ def extract_figures(
         lines: Content split by lines
         search_range: Number of lines to search for captions
         search_chars: Number of characters to search (fallback)
+        index: Prebuilt line index of content (built here if not given)
     
     Returns:
         List of extracted FigureInfo objects
     """
+    if index is None:
+        index = MarkdownIndex(content, lines)
     figures = []
     unnamed_figure_count = 0
     
@@ -31,10 +36,10 @@ def extract_figures(
     image_pattern = r'!\[([^\]]*)\]\((images/[^\)]+)\)'
     for match in re.finditer(image_pattern, content):
         image_path = match.group(2)
-        image_line = content[:match.start()].count('\n')
+        image_line = index.line_of(match.start())
         
         # Primary search: line-based
-        figure_id, caption = _find_figure_caption(lines, image_line, search_range)
+        figure_id, caption = _find_figure_caption(index, image_line, search_range)
         
         # Fallback: character-position-based search
         if figure_id is None:
@@ -58,7 +63,7 @@ def extract_figures(
 
 
 def _find_figure_caption(
-    lines: List[str], 
+    index: MarkdownIndex, 
     image_line: int, 
     search_range: int
 ) -> Tuple[Optional[str], Optional[str]]:
@@ -69,28 +74,26 @@ def _find_figure_caption(
     Stops if encountering a section header or another image.
     
     Args:
-        lines: All lines of the document
+        index: Line index of the document
         image_line: Line number where the image is located
         search_range: Number of lines to search
     """
-    figure_pattern = r'^((?:Figure|Image)\s+\d+[a-z]?)\s*:\s*(.+)$'
+    num_lines = len(index.lines)
     
     # Search forward (caption after image)
-    for i in range(image_line + 1, min(image_line + search_range + 1, len(lines))):
-        match = re.match(figure_pattern, lines[i].strip(), re.IGNORECASE)
-        if match:
-            return match.group(1), match.group(2)
+    for i in range(image_line + 1, min(image_line + search_range + 1, num_lines)):
+        if i in index.figure_captions:
+            return index.figure_captions[i]
         # Stop if hitting a section header or another image
-        if lines[i].startswith('#') or lines[i].startswith('!['):
+        if i in index.headers or i in index.image_lines:
             break
     
     # Search backward (caption before image)
     for i in range(image_line - 1, max(image_line - search_range - 1, -1), -1):
-        match = re.match(figure_pattern, lines[i].strip(), re.IGNORECASE)
-        if match:
-            return match.group(1), match.group(2)
+        if i in index.figure_captions:
+            return index.figure_captions[i]
         # Stop if hitting a section header or a table
-        if lines[i].startswith('#') or '<table>' in lines[i].lower():
+        if i in index.headers or i in index.table_open_lines:
             break
     
     return None, None
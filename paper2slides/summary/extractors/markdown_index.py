@@ -0,0 +1,61 @@
+"""
+Line index over markdown content, shared by the table and figure extractors
+"""
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+# Captions as the line-based search accepts them (matched on the stripped line)
+FIGURE_CAPTION_PATTERN = re.compile(r'^((?:Figure|Image)\s+\d+[a-z]?)\s*:\s*(.+)$', re.IGNORECASE)
+TABLE_CAPTION_PATTERN = re.compile(r'^(Table\s+\d+[a-z]?)\s*:\s*(.+)$', re.IGNORECASE)
+
+# Lines that may hold a caption; a superset of both patterns above
+_CAPTION_LINE = re.compile(r'^[^\S\n]*(?:figure|image|table)[^\S\n]+\d', re.IGNORECASE | re.MULTILINE)
+_HEADER_LINE = re.compile(r'^#', re.MULTILINE)
+_IMAGE_LINE = re.compile(r'^!\[', re.MULTILINE)
+_TABLE_OPEN = re.compile(r'<table>', re.IGNORECASE)
+_TABLE_CLOSE = re.compile(r'</table>', re.IGNORECASE)
+
+
+class MarkdownIndex:
+    """
+    Line offsets and caption candidates of a markdown document.
+
+    Built in one pass over the content; line lookups are bisections and
+    caption searches only consult the lines collected here, so extraction
+    stays linear in document size.
+    """
+
+    def __init__(self, content: str, lines: Optional[List[str]] = None):
+        self.content = content
+        self.lines = lines if lines is not None else content.split('\n')
+        self.line_starts = [0]
+        self.line_starts.extend(m.end() for m in re.finditer('\n', content))
+
+        self.headers = self._line_set(_HEADER_LINE)
+        self.image_lines = self._line_set(_IMAGE_LINE)
+        self.table_open_lines = self._line_set(_TABLE_OPEN)
+        self.table_close_lines = sorted(self._line_set(_TABLE_CLOSE))
+
+        self.figure_captions: Dict[int, Tuple[str, str]] = {}
+        self.table_captions: Dict[int, Tuple[str, str]] = {}
+        for line_no in sorted(self._line_set(_CAPTION_LINE)):
+            stripped = self.lines[line_no].strip()
+            match = FIGURE_CAPTION_PATTERN.match(stripped)
+            if match:
+                self.figure_captions[line_no] = (match.group(1), match.group(2))
+            match = TABLE_CAPTION_PATTERN.match(stripped)
+            if match:
+                self.table_captions[line_no] = (match.group(1), match.group(2))
+
+    def _line_set(self, pattern: re.Pattern) -> set:
+        return {self.line_of(m.start()) for m in pattern.finditer(self.content)}
+
+    def line_of(self, position: int) -> int:
+        """Line number (0-based) of a character position"""
+        return bisect_right(self.line_starts, position) - 1
+
+    def table_end_line(self, table_line: int) -> int:
+        """First line at or after table_line containing </table>, else table_line"""
+        i = bisect_left(self.table_close_lines, table_line)
+        return self.table_close_lines[i] if i < len(self.table_close_lines) else table_line
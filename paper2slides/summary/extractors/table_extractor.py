@@ -4,6 +4,7 @@ Table extraction from markdown documents
 import re
 from typing import List, Tuple, Optional
 from ..models import TableInfo
+from .markdown_index import MarkdownIndex
 
 
 def extract_tables(
@@ -11,6 +12,7 @@ def extract_tables(
     lines: List[str],
     search_range: int = 5,
     search_chars: int = 500,
+    index: Optional[MarkdownIndex] = None,
 ) -> List[TableInfo]:
     """
     Extract tables from markdown content.
@@ -20,10 +22,13 @@ def extract_tables(
         lines: Content split by lines
         search_range: Number of lines to search for captions
         search_chars: Number of characters to search (fallback)
+        index: Prebuilt line index of content (built here if not given)
     
     Returns:
         List of extracted TableInfo objects
     """
+    if index is None:
+        index = MarkdownIndex(content, lines)
     tables = []
     unnamed_table_count = 0
     
@@ -31,10 +36,10 @@ def extract_tables(
     table_html_pattern = r'<table>.*?</table>'
     for match in re.finditer(table_html_pattern, content, re.DOTALL):
         html_content = match.group(0)
-        table_line = content[:match.start()].count('\n')
+        table_line = index.line_of(match.start())
         
         # Primary search: line-based
-        table_id, caption = _find_table_caption(lines, table_line, search_range)
+        table_id, caption = _find_table_caption(index, table_line, search_range)
         
         # Fallback: character-position-based search
         if table_id is None:
@@ -58,7 +63,7 @@ def extract_tables(
 
 
 def _find_table_caption(
-    lines: List[str], 
+    index: MarkdownIndex, 
     table_line: int, 
     search_range: int
 ) -> Tuple[Optional[str], Optional[str]]:
@@ -69,34 +74,26 @@ def _find_table_caption(
     Stops if encountering a section header.
     
     Args:
-        lines: All lines of the document
+        index: Line index of the document
         table_line: Line number where the table starts
         search_range: Number of lines to search
     """
-    table_pattern = r'^(Table\s+\d+[a-z]?)\s*:\s*(.+)$'
-    
     # Search backward (caption before table)
     for i in range(table_line - 1, max(table_line - search_range - 1, -1), -1):
-        match = re.match(table_pattern, lines[i].strip(), re.IGNORECASE)
-        if match:
-            return match.group(1), match.group(2)
+        if i in index.table_captions:
+            return index.table_captions[i]
         # Stop if hitting a section header
-        if lines[i].startswith('#'):
+        if i in index.headers:
             break
     
     # Search forward (caption after table)
     # Need to skip past the table itself first
-    table_end_line = table_line
-    for i in range(table_line, len(lines)):
-        if '</table>' in lines[i].lower():
-            table_end_line = i
-            break
+    table_end_line = index.table_end_line(table_line)
     
-    for i in range(table_end_line + 1, min(table_end_line + search_range + 1, len(lines))):
-        match = re.match(table_pattern, lines[i].strip(), re.IGNORECASE)
-        if match:
-            return match.group(1), match.group(2)
-        if lines[i].startswith('#'):
+    for i in range(table_end_line + 1, min(table_end_line + search_range + 1, len(index.lines))):
+        if i in index.table_captions:
+            return index.table_captions[i]
+        if i in index.headers:
             break
     
     return None, None
@@ -6,6 +6,7 @@ from typing import List
 from dataclasses import dataclass, field
 
 from .clean import clean_references
+from ..utils import chat_completion
 from rag import RAGQueryResult
 
 
@@ -82,7 +83,7 @@ async def extract_general(
     
     Args:
         rag_results: List of query results
-        llm_client: OpenAI client (optional if skip_llm=True)
+        llm_client: AsyncOpenAI client (optional if skip_llm=True)
         model: Model to use
         clean_refs: Whether to clean references
         skip_llm: If True, skip LLM extraction and use merged RAG results directly
@@ -105,7 +106,8 @@ async def extract_general(
     
     prompt = EXTRACT_PROMPT.format(content=merged)
     
-    response = llm_client.chat.completions.create(
+    response = await chat_completion(
+        llm_client,
         model=model,
         messages=[{"role": "user", "content": prompt}],
         max_completion_tokens=8000,
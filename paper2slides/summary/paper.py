@@ -9,6 +9,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 from .clean import clean_references
+from ..utils import chat_completion
 from ..rag import RAGQueryResult
 from ..prompts.paper_extraction import EXTRACT_PROMPTS
 
@@ -149,7 +150,7 @@ async def _extract_section(
     Args:
         content: Merged RAG content for the section
         section: Section name (must be in EXTRACT_PROMPTS)
-        llm_client: OpenAI client
+        llm_client: AsyncOpenAI client
         model: Model to use
     """
     if not content or len(content) < 100:
@@ -161,15 +162,11 @@ async def _extract_section(
     
     prompt = prompt_template.format(content=content)
     
-    # Run sync LLM call in executor for async compatibility
-    loop = asyncio.get_event_loop()
-    response = await loop.run_in_executor(
-        None,
-        lambda: llm_client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            max_completion_tokens=4000,
-        )
+    response = await chat_completion(
+        llm_client,
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        max_completion_tokens=4000,
     )
     
     return response.choices[0].message.content or ""
@@ -188,7 +185,7 @@ async def extract_paper(
     
     Args:
         rag_results: RAG query results
-        llm_client: OpenAI client
+        llm_client: AsyncOpenAI client
         model: Model to use
         clean_refs: Whether to clean references from RAG answers
         parallel: If True, process LLM sections in parallel
@@ -351,15 +348,12 @@ async def extract_paper_metadata_from_markdown(
         # Multiple files: complex multi-scenario prompt
         prompt = _build_multi_file_prompt(file_headers)
     
-    loop = asyncio.get_event_loop()
-    response = await loop.run_in_executor(
-        None,
-        lambda: llm_client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            max_completion_tokens=1500,
-            temperature=0.1,  # Low temperature for accuracy
-        )
+    response = await chat_completion(
+        llm_client,
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        max_completion_tokens=1500,
+        temperature=0.1,  # Low temperature for accuracy
     )
     
     result = response.choices[0].message.content or ""
@@ -1,5 +1,12 @@
 from .file_utils import save_json, load_json, save_text
 from .logging import setup_logging, log_section
+from .llm_client import get_async_client, close_async_clients, chat_completion
+from .metrics import RunMetrics, current_metrics, metrics_scope, stage_scope
+from .rate_limit import RateLimiter, RateLimitConfig, get_rate_limiter, rate_limit_stats
+from .image_cache import (
+    FigureAsset, FigureAssetCache, ImageProfile, get_figure_cache, current_figure_cache, figure_cache_scope,
+    get_image_profile,
+)
 
 __all__ = [
     "save_json",
@@ -7,4 +14,22 @@ __all__ = [
     "save_text",
     "setup_logging",
     "log_section",
+    "get_async_client",
+    "close_async_clients",
+    "chat_completion",
+    "RateLimiter",
+    "RateLimitConfig",
+    "get_rate_limiter",
+    "rate_limit_stats",
+    "FigureAsset",
+    "FigureAssetCache",
+    "get_figure_cache",
+    "current_figure_cache",
+    "figure_cache_scope",
+    "ImageProfile",
+    "get_image_profile",
+    "RunMetrics",
+    "current_metrics",
+    "metrics_scope",
+    "stage_scope",
 ]
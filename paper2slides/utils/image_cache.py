@@ -0,0 +1,348 @@
+"""
+Per-run figure asset cache
+
+The planner, the image generator, fast-mode RAG and the image providers all
+send the same figures. Each figure is read from disk once per run; its
+base64 string, decoded PIL image and prepared variants are derived lazily
+and shared by every consumer.
+
+Assets are keyed by (resolved path, mtime, size), so an edited file is
+reloaded. The cache for the current run is held in a context variable:
+run_pipeline opens a scope with figure_cache_scope() for the whole run
+(run_stage opens one per stage when called outside a scope, as batch runs
+do), and tasks/threads started inside it inherit the same cache.
+
+Before upload, figures are prepared per consumer (ImageProfile): the long
+edge is capped, the image is re-encoded (JPEG for photos, PNG for flat
+diagrams) and metadata is dropped. Vision LLM input ("vision") gets a
+smaller size than image-generation references ("reference"). Prepared
+images are also stored on disk by content hash, so later runs skip the
+re-encode. Override profiles with IMAGE_PROFILES (JSON), e.g.
+    IMAGE_PROFILES='{"vision": {"max_edge": 768}, "reference": {"format": "original"}}'
+"""
+import io
+import os
+import json
+import base64
+import hashlib
+import logging
+import threading
+import contextlib
+import contextvars
+from dataclasses import dataclass, fields, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from .metrics import incr
+
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".bmp": "image/bmp",
+    ".webp": "image/webp",
+    ".tiff": "image/tiff",
+    ".tif": "image/tiff",
+}
+
+
+_FORMATS = {"jpeg": ("JPEG", "image/jpeg", ".jpg"), "png": ("PNG", "image/png", ".png"), "webp": ("WEBP", "image/webp", ".webp")}
+
+# Diagrams (PNG stays sharp and small): few distinct colors, and a handful of
+# them (background, strokes) covering most pixels
+_FLAT_MAX_COLORS = 4096
+_FLAT_DOMINANT_COLORS = 8
+_FLAT_DOMINANT_SHARE = 0.75
+
+
+def guess_mime_type(path: Union[str, Path]) -> str:
+    """MIME type from the file extension (defaults to JPEG)."""
+    return MIME_TYPES.get(Path(path).suffix.lower(), "image/jpeg")
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    """How a figure is prepared for one consumer."""
+    max_edge: int = 2048
+    """Long-edge cap in pixels (smaller images are not upscaled)"""
+
+    format: str = "auto"
+    """auto (PNG for flat/transparent images, else JPEG), jpeg, png, webp, or original (no processing)"""
+
+    quality: int = 85
+    """JPEG/WebP quality"""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ImageProfile":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    @property
+    def key(self) -> str:
+        return f"{self.max_edge}-{self.format}-{self.quality}"
+
+
+DEFAULT_PROFILES = {
+    # Planner and fast-mode RAG: the model only needs to read the figure
+    "vision": ImageProfile(max_edge=1024, quality=80),
+    # Image generation: the figure is redrawn into the slide, keep detail
+    "reference": ImageProfile(max_edge=2048, quality=90),
+}
+
+
+def get_image_profile(name: str) -> ImageProfile:
+    """Named profile, with IMAGE_PROFILES overrides applied."""
+    profile = DEFAULT_PROFILES.get(name, ImageProfile())
+    raw = os.getenv("IMAGE_PROFILES")
+    if raw:
+        try:
+            overrides = json.loads(raw).get(name)
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning(f"Invalid IMAGE_PROFILES JSON ({e}); using defaults")
+            overrides = None
+        if overrides:
+            profile = ImageProfile.from_dict({**asdict(profile), **overrides})
+    return profile
+
+
+def _is_flat(image) -> bool:
+    """True for diagram-like images (line plots, charts) as opposed to photos."""
+    if image.mode in ("1", "P"):
+        return True
+    colors = image.getcolors(_FLAT_MAX_COLORS)
+    if colors is None:
+        return False
+    top = sorted((count for count, _ in colors), reverse=True)[:_FLAT_DOMINANT_COLORS]
+    return sum(top) >= _FLAT_DOMINANT_SHARE * image.size[0] * image.size[1]
+
+
+def _encode(image, profile: ImageProfile) -> Tuple[bytes, str]:
+    """Re-encode a PIL image for profile; no metadata (EXIF/ICC/text) is written."""
+    fmt = profile.format
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+    if fmt not in _FORMATS:
+        fmt = "png" if has_alpha or _is_flat(image) else "jpeg"
+
+    pil_format, mime_type, _ = _FORMATS[fmt]
+    if pil_format == "JPEG":
+        image = image.convert("RGB")
+    elif image.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    buffer = io.BytesIO()
+    if pil_format == "PNG":
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.save(buffer, format=pil_format, quality=profile.quality, optimize=True)
+    return buffer.getvalue(), mime_type
+
+
+class FigureAsset:
+    """One figure file: raw bytes plus lazily derived encodings."""
+
+    def __init__(self, path: Path, data: bytes, mime_type: str, disk_dir: Optional[Path] = None):
+        self.path = path
+        self.data = data
+        self.mime_type = mime_type
+        self.disk_dir = disk_dir
+        self._sha256: Optional[str] = None
+        self._base64: Optional[str] = None
+        self._data_url: Optional[str] = None
+        self._image = None
+        self._variants: Dict[ImageProfile, "FigureAsset"] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base64(self) -> str:
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.data).decode("utf-8")
+        return self._base64
+
+    @property
+    def data_url(self) -> str:
+        if self._data_url is None:
+            self._data_url = f"data:{self.mime_type};base64,{self.base64}"
+        return self._data_url
+
+    def image(self):
+        """Decoded PIL image (loaded once; treat as read-only)."""
+        with self._lock:
+            if self._image is None:
+                from PIL import Image
+                image = Image.open(io.BytesIO(self.data))
+                image.load()
+                self._image = image
+            return self._image
+
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data).hexdigest()
+        return self._sha256
+
+    def prepared(self, profile: Union[str, ImageProfile]) -> "FigureAsset":
+        """Variant prepared for a consumer profile (name or ImageProfile).
+
+        Returns self when processing would not make the upload smaller.
+        """
+        if isinstance(profile, str):
+            profile = get_image_profile(profile)
+        if profile.format == "original":
+            return self
+
+        with self._lock:
+            variant = self._variants.get(profile)
+        if variant is not None:
+            return variant
+
+        variant = self._load_variant(profile)
+        if variant is None:
+            incr("cache.prepared_image.misses")
+            variant = self._make_variant(profile)
+            self._store_variant(profile, variant)
+        else:
+            incr("cache.prepared_image.hits")
+
+        with self._lock:
+            return self._variants.setdefault(profile, variant)
+
+    def _variant_path(self, profile: ImageProfile) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        name = f"{self.sha256}-{profile.key}"
+        return Path(self.disk_dir) / name[:2] / name
+
+    def _load_variant(self, profile: ImageProfile) -> Optional["FigureAsset"]:
+        base = self._variant_path(profile)
+        if base is None:
+            return None
+        for _, mime_type, ext in _FORMATS.values():
+            path = base.with_suffix(ext)
+            if path.exists():
+                try:
+                    return FigureAsset(self.path, path.read_bytes(), mime_type)
+                except OSError:
+                    return None
+        if base.with_suffix(".orig").exists():
+            return self
+        return None
+
+    def _store_variant(self, profile: ImageProfile, variant: "FigureAsset"):
+        base = self._variant_path(profile)
+        if base is None:
+            return
+        if variant is self:
+            # Marker only: processing did not help, the original is used as is
+            path, data = base.with_suffix(".orig"), b""
+        else:
+            ext = next(ext for _, mime_type, ext in _FORMATS.values() if mime_type == variant.mime_type)
+            path, data = base.with_suffix(ext), variant.data
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"Failed to store prepared image {path}: {e}")
+
+    def _make_variant(self, profile: ImageProfile) -> "FigureAsset":
+        try:
+            image = self.image()
+        except Exception as e:
+            logger.warning(f"Cannot decode image {self.path}: {e}")
+            return self
+
+        resized = max(image.size) > profile.max_edge
+        if resized:
+            image = image.copy()
+            image.thumbnail((profile.max_edge, profile.max_edge))
+        data, mime_type = _encode(image, profile)
+        if not resized and len(data) >= len(self.data):
+            return self
+
+        variant = FigureAsset(self.path, data, mime_type)
+        if resized:
+            variant._image = image
+        logger.debug(f"Prepared {self.path.name}: {image.size[0]}x{image.size[1]} {mime_type}, "
+                     f"{len(self.data) // 1024} KB -> {len(data) // 1024} KB")
+        return variant
+
+
+_AssetKey = Tuple[str, int, int]
+
+
+class FigureAssetCache:
+    """Thread-safe map from figure files to FigureAssets.
+
+    disk_dir, if given, persists prepared variants across runs.
+    """
+
+    def __init__(self, disk_dir: Optional[Path] = None):
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._assets: Dict[_AssetKey, FigureAsset] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Union[str, Path]) -> Optional[FigureAsset]:
+        """Asset for path, or None if the file is missing or unreadable."""
+        path = Path(path)
+        try:
+            stat = path.stat()
+            resolved = path.resolve()
+        except OSError:
+            return None
+        key = (str(resolved), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            asset = self._assets.get(key)
+            if asset is not None:
+                self.hits += 1
+                incr("cache.figure.hits")
+                return asset
+
+        try:
+            data = resolved.read_bytes()
+        except OSError as e:
+            logger.warning(f"Failed to read image {path}: {e}")
+            return None
+
+        incr("cache.figure.misses")
+        with self._lock:
+            self.misses += 1
+            return self._assets.setdefault(key, FigureAsset(resolved, data, guess_mime_type(resolved), self.disk_dir))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._assets)
+
+
+_current: contextvars.ContextVar[Optional[FigureAssetCache]] = contextvars.ContextVar(
+    "figure_asset_cache", default=None
+)
+
+
+def current_figure_cache() -> Optional[FigureAssetCache]:
+    """Cache of the current figure_cache_scope, or None outside of any."""
+    return _current.get()
+
+
+def get_figure_cache() -> FigureAssetCache:
+    """Cache of the current run (a throwaway cache outside of any run)."""
+    cache = _current.get()
+    return cache if cache is not None else FigureAssetCache()
+
+
+@contextlib.contextmanager
+def figure_cache_scope(disk_dir: Optional[Path] = None) -> Iterator[FigureAssetCache]:
+    """Share one FigureAssetCache with everything run inside this block."""
+    cache = FigureAssetCache(disk_dir)
+    token = _current.set(cache)
+    try:
+        yield cache
+    finally:
+        _current.reset(token)
+        logger.debug(f"Figure cache: {len(cache)} assets, {cache.hits} hits, {cache.misses} misses")
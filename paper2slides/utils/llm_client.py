@@ -0,0 +1,143 @@
+"""
+Shared async OpenAI client pool
+
+One AsyncOpenAI client per (event loop, api_key, base_url), backed by a
+pooled keep-alive HTTP connection pool. Concurrency is governed by the
+callers' semaphores instead of the default thread-pool size, and retries
+by the shared rate limiter (SDK retries are disabled).
+"""
+import os
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from .rate_limit import get_rate_limiter, provider_name, estimate_tokens
+from .metrics import payload_bytes
+
+logger = logging.getLogger(__name__)
+
+# HTTP pool settings (override via environment)
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_MAX_KEEPALIVE = 32
+DEFAULT_KEEPALIVE_EXPIRY = 120.0
+DEFAULT_TIMEOUT = 600.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+
+_ClientKey = Tuple[str, Optional[str]]
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_ClientKey, AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _env_number(name: str, default, cast=int):
+    """Read a numeric environment variable, falling back to default"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning(f"Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client used by AsyncOpenAI"""
+    limits = httpx.Limits(
+        max_connections=_env_number("LLM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS),
+        max_keepalive_connections=_env_number("LLM_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE),
+        keepalive_expiry=_env_number("LLM_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY, float),
+    )
+    return DefaultAsyncHttpxClient(limits=limits)
+
+
+def _request_timeout() -> httpx.Timeout:
+    # Set on the AsyncOpenAI client, which passes it per request; a Timeout
+    # object on the http client is not understood by every transport
+    return httpx.Timeout(
+        _env_number("LLM_TIMEOUT", DEFAULT_TIMEOUT, float),
+        connect=DEFAULT_CONNECT_TIMEOUT,
+    )
+
+
+def get_async_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Get the shared AsyncOpenAI client for the running event loop.
+
+    Args:
+        api_key: API key, defaults to RAG_LLM_API_KEY
+        base_url: Base URL, defaults to RAG_LLM_BASE_URL
+    """
+    loop = asyncio.get_running_loop()
+    api_key = api_key if api_key is not None else os.getenv("RAG_LLM_API_KEY", "")
+    base_url = base_url or os.getenv("RAG_LLM_BASE_URL") or None
+
+    clients = _clients.setdefault(loop, {})
+    key = (api_key, base_url)
+    client = clients.get(key)
+    if client is None:
+        # Retries (with Retry-After and AIMD backoff) are done by the rate limiter
+        kwargs = {
+            "api_key": api_key,
+            "http_client": _build_http_client(),
+            "timeout": _request_timeout(),
+            "max_retries": 0,
+        }
+        if base_url:
+            kwargs["base_url"] = base_url
+        client = AsyncOpenAI(**kwargs)
+        clients[key] = client
+    return client
+
+
+def _usage_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) if usage else None
+
+
+def _describe_completion(response) -> Dict[str, Any]:
+    """Run-metrics fields of a chat completion."""
+    fields: Dict[str, Any] = {"model": getattr(response, "model", None)}
+    usage = getattr(response, "usage", None)
+    if usage:
+        fields["prompt_tokens"] = getattr(usage, "prompt_tokens", None)
+        fields["completion_tokens"] = getattr(usage, "completion_tokens", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        fields["cached_tokens"] = getattr(details, "cached_tokens", None) if details else None
+    choices = getattr(response, "choices", None) or []
+    if choices and getattr(choices[0], "message", None):
+        fields["response_bytes"] = len(choices[0].message.content or "")
+    return fields
+
+
+async def chat_completion(client: AsyncOpenAI, **kwargs: Any):
+    """
+    client.chat.completions.create(**kwargs) through the provider/model rate limiter.
+
+    Requests and tokens are budgeted per (base_url host, model); throttling
+    and transient errors are retried with backoff.
+    """
+    limiter = get_rate_limiter(provider_name(str(client.base_url)), kwargs.get("model"))
+    max_output = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or 1024
+    return await limiter.call(
+        lambda: client.chat.completions.create(**kwargs),
+        tokens=estimate_tokens(kwargs.get("messages"), max_output),
+        usage=_usage_tokens,
+        kind="llm",
+        request_bytes=payload_bytes(kwargs.get("messages")),
+        describe=_describe_completion,
+    )
+
+
+async def close_async_clients():
+    """Close all shared clients bound to the running event loop."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        try:
+            await client.close()
+        except Exception as e:
+            logger.debug(f"Failed to close LLM client: {e}")
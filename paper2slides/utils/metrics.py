@@ -0,0 +1,138 @@
+"""
+Run metrics: per-stage timings, per-call records and cache counters
+
+run_pipeline opens a metrics_scope() for each run; everything executed
+inside it (stages, provider calls through the rate limiter, caches) reports
+to that run's RunMetrics via the module-level helpers, which are no-ops
+outside a run. The summary is stored as state["metrics"] in state.json.
+
+Call records carry: kind (llm/image/embedding), provider/model, stage,
+wall and queue-wait seconds, retries, prompt/completion tokens, request
+and response bytes, and status.
+"""
+import time
+import threading
+import contextlib
+import contextvars
+from typing import Any, Dict, Iterator, List, Optional
+
+# Totals summed per (stage, kind) in the summary
+_CALL_TOTALS = (
+    "wall_seconds", "queue_wait_seconds", "retries",
+    "prompt_tokens", "completion_tokens", "cached_tokens",
+    "request_bytes", "response_bytes",
+)
+
+
+class RunMetrics:
+    """Metrics collector for one pipeline run (thread-safe)."""
+
+    def __init__(self, max_calls: int = 2000):
+        self.max_calls = max_calls
+        self.started_at = time.time()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[Dict[str, Any]] = []
+        self.dropped_calls = 0
+        self.counters: Dict[str, int] = {}
+        self._totals: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record_stage(self, stage: str, status: str, wall_seconds: float, queue_wait_seconds: float = 0.0):
+        with self._lock:
+            self.stages[stage] = {
+                "status": status,
+                "wall_seconds": round(wall_seconds, 3),
+                "queue_wait_seconds": round(queue_wait_seconds, 3),
+            }
+
+    def record_call(self, kind: str, **fields: Any):
+        record = {"kind": kind, "stage": _current_stage.get(), "ts": round(time.time(), 3)}
+        record.update({k: round(v, 3) if isinstance(v, float) else v for k, v in fields.items() if v is not None})
+        with self._lock:
+            totals = self._totals.setdefault(record["stage"] or "-", {}).setdefault(kind, {"calls": 0, "errors": 0})
+            totals["calls"] += 1
+            if record.get("status") == "error":
+                totals["errors"] += 1
+            for name in _CALL_TOTALS:
+                if name in record:
+                    totals[name] = totals.get(name, 0) + record[name]
+            if len(self.calls) < self.max_calls:
+                self.calls.append(record)
+            else:
+                self.dropped_calls += 1
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = {
+                stage: {kind: {k: round(v, 3) if isinstance(v, float) else v for k, v in t.items()}
+                        for kind, t in kinds.items()}
+                for stage, kinds in self._totals.items()
+            }
+            return {
+                "started_at": self.started_at,
+                "elapsed_seconds": round(time.time() - self.started_at, 3),
+                "stages": {stage: dict(m, calls=totals.get(stage, {})) for stage, m in self.stages.items()},
+                "calls_by_stage": totals,
+                "counters": dict(self.counters),
+                "calls": list(self.calls),
+                "dropped_calls": self.dropped_calls,
+            }
+
+
+_current: contextvars.ContextVar[Optional[RunMetrics]] = contextvars.ContextVar("run_metrics", default=None)
+_current_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("metrics_stage", default=None)
+
+
+def current_metrics() -> Optional[RunMetrics]:
+    """Collector of the current run, or None outside of a run."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def metrics_scope(metrics: Optional[RunMetrics] = None) -> Iterator[RunMetrics]:
+    """Report metrics of everything run inside this block to one collector."""
+    metrics = metrics or RunMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def stage_scope(stage: str) -> Iterator[None]:
+    """Tag calls made inside this block with a pipeline stage."""
+    token = _current_stage.set(stage)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+def record_call(kind: str, **fields: Any):
+    """Record one provider call in the current run (no-op outside a run)."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record_call(kind, **fields)
+
+
+def incr(name: str, n: int = 1):
+    """Increment a counter of the current run (no-op outside a run)."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.incr(name, n)
+
+
+def payload_bytes(value: Any) -> int:
+    """Approximate serialized size of a request payload (sum of string lengths)."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(payload_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(payload_bytes(v) for v in value)
+    return 0
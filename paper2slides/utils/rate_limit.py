@@ -0,0 +1,408 @@
+"""
+Shared rate-limit manager for LLM and image-generation calls
+
+One RateLimiter per (provider, model) combines:
+- token buckets for requests-per-minute and tokens-per-minute budgets
+- an adaptive concurrency limit (AIMD): +1 per window of successes,
+  halved on 429/5xx
+- a shared pause honoring Retry-After, so a throttled provider is not
+  hammered by every waiting caller at once (no retry storms)
+
+Budgets come from RATE_LIMITS (JSON), keyed "provider/model" or "provider":
+    RATE_LIMITS='{"api.openai.com": {"rpm": 500, "tpm": 300000},
+                  "openrouter.ai/google/gemini-3-pro-image-preview": {"rpm": 20}}'
+"""
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, fields
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+from .metrics import record_call
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class RateLimitConfig:
+    """Budgets and retry policy for one provider/model."""
+    rpm: Optional[float] = None
+    """Requests per minute (None = unlimited)"""
+
+    tpm: Optional[float] = None
+    """Tokens per minute (None = unlimited)"""
+
+    max_concurrency: int = 16
+    """Upper bound of the adaptive concurrency limit"""
+
+    min_concurrency: int = 1
+    """Lower bound the limit is never decreased below"""
+
+    max_retries: int = 4
+    """Retries after the first attempt for throttling/transient errors"""
+
+    base_delay: float = 1.0
+    """Initial backoff when the provider gives no Retry-After"""
+
+    max_delay: float = 60.0
+    """Backoff and Retry-After cap"""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RateLimitConfig":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+class _Bucket:
+    """Token bucket refilled continuously at budget/60 per second."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        """Take amount now (possibly into debt); return seconds to wait before using it."""
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def _classify(exc: BaseException) -> Tuple[Optional[bool], bool, Optional[float]]:
+    """Return (retryable, throttled, retry_after) for a provider exception.
+
+    throttled means 429/5xx: the provider is over capacity, so concurrency
+    is decreased. Connection errors and timeouts are retryable but not
+    treated as capacity signals. Other HTTP errors are not retryable;
+    anything else is unknown (None).
+    """
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if not isinstance(status, int):
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+
+    retry_after = _retry_after(exc)
+    if status == 429 or (isinstance(status, int) and status >= 500):
+        return True, True, retry_after
+    if isinstance(status, int):
+        return False, False, None
+
+    name = type(exc).__name__
+    if "Timeout" in name or "Connection" in name:
+        return True, False, retry_after
+    return None, False, None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds from Retry-After / retry-after-ms headers, if present."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value:
+            return float(value) / 1000.0
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class RateLimiter:
+    """Rate limiter shared by all calls to one provider/model.
+
+    State is plain counters guarded by a thread lock, so one limiter can be
+    used from several event loops (e.g. a CLI run and worker threads).
+    Callers at the concurrency limit park on a future of their own loop and
+    are woken when a slot frees up.
+    """
+
+    def __init__(self, name: str, config: Optional[RateLimitConfig] = None):
+        self.name = name
+        self.config = config or RateLimitConfig()
+        self.limit = float(self.config.max_concurrency)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._requests = _Bucket(self.config.rpm) if self.config.rpm else None
+        self._tokens = _Bucket(self.config.tpm) if self.config.tpm else None
+        self.stats = {"calls": 0, "retries": 0, "throttled": 0, "failed": 0, "tokens": 0, "wait_seconds": 0.0}
+
+    # ---- Admission ----
+
+    async def _acquire(self, tokens: int) -> float:
+        """Wait for a slot and budget; return seconds waited."""
+        start = time.monotonic()
+        while True:
+            waiter = None
+            with self._lock:
+                now = time.monotonic()
+                pause = self.blocked_until - now
+                if pause <= 0 and self.in_flight < max(1, int(self.limit)):
+                    self.in_flight += 1
+                    wait = self._requests.reserve(1) if self._requests else 0.0
+                    if self._tokens and tokens:
+                        wait = max(wait, self._tokens.reserve(tokens))
+                    break
+                if pause <= 0:
+                    waiter = asyncio.get_running_loop().create_future()
+                    self._waiters.append(waiter)
+            if waiter is None:
+                await asyncio.sleep(pause)
+                continue
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    else:
+                        # Woken but cancelled: pass the wake-up on
+                        self._wake()
+                raise
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._release()
+                raise
+        waited = time.monotonic() - start
+        with self._lock:
+            self.stats["wait_seconds"] += waited
+        return waited
+
+    def _wake(self):
+        """Wake waiters for the free slots (caller holds the lock)"""
+        free = max(1, int(self.limit)) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            try:
+                waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+            except RuntimeError:
+                # Waiter's loop is closed
+                continue
+            free -= 1
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    # ---- AIMD ----
+
+    def _on_success(self, estimated: int, actual: Optional[int]):
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["tokens"] += actual if actual is not None else estimated
+            if self._tokens and actual is not None:
+                self._tokens.refund(estimated - actual)
+            # Additive increase: about +1 per `limit` successful calls
+            self.limit = min(float(self.config.max_concurrency), self.limit + 1.0 / max(1.0, self.limit))
+            self._wake()
+
+    def _on_throttle(self, retry_after: Optional[float]):
+        with self._lock:
+            now = time.monotonic()
+            self.stats["throttled"] += 1
+            # Multiplicative decrease, at most once per second so a burst of
+            # 429s from requests already in flight counts as one signal
+            if now - self._last_decrease >= 1.0:
+                self.limit = max(float(self.config.min_concurrency), self.limit / 2.0)
+                self._last_decrease = now
+                logger.warning(f"[{self.name}] throttled, concurrency limit -> {int(self.limit)}")
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + min(retry_after, self.config.max_delay))
+
+    # ---- Calls ----
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+        usage: Optional[Callable[[T], Optional[int]]] = None,
+        retry_unknown: bool = False,
+        max_retries: Optional[int] = None,
+        kind: str = "llm",
+        request_bytes: Optional[int] = None,
+        describe: Optional[Callable[[T], Dict[str, Any]]] = None,
+    ) -> T:
+        """Run fn under the limiter, retrying throttling and transient errors.
+
+        Args:
+            fn: Zero-argument coroutine factory (called once per attempt)
+            tokens: Estimated tokens for the TPM budget
+            usage: Optional function returning actual tokens used from the result
+            retry_unknown: Also retry errors that are not HTTP errors (e.g. a
+                response without an image), without treating them as throttling
+            max_retries: Override config.max_retries (e.g. when fn retries itself)
+            kind: Call kind for run metrics (llm, image, embedding)
+            request_bytes: Request payload size for run metrics
+            describe: Optional function returning extra metrics fields from the
+                result (prompt_tokens, completion_tokens, response_bytes, ...)
+        """
+        retries = self.config.max_retries if max_retries is None else max_retries
+        attempt = 0
+        started = time.monotonic()
+        queue_wait = 0.0
+
+        def report(status: str, result=None, error: Optional[BaseException] = None):
+            fields = {}
+            if describe and result is not None:
+                try:
+                    fields = describe(result) or {}
+                except Exception:
+                    fields = {}
+            record_call(
+                kind,
+                provider=self.name,
+                status=status,
+                error=type(error).__name__ if error else None,
+                wall_seconds=time.monotonic() - started,
+                queue_wait_seconds=queue_wait,
+                retries=attempt,
+                request_bytes=request_bytes,
+                **fields,
+            )
+
+        while True:
+            queue_wait += await self._acquire(tokens)
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                retryable, throttled, retry_after = _classify(e)
+                if throttled:
+                    self._on_throttle(retry_after)
+                give_up = retryable is False or (retryable is None and not retry_unknown)
+                if give_up or attempt >= retries:
+                    with self._lock:
+                        self.stats["failed"] += 1
+                    report("error", error=e)
+                    raise
+                delay = retry_after or min(self.config.max_delay, self.config.base_delay * 2 ** attempt)
+                delay *= random.uniform(0.8, 1.2)
+                attempt += 1
+                with self._lock:
+                    self.stats["retries"] += 1
+                logger.warning(f"[{self.name}] {type(e).__name__}: {e}; retry {attempt}/{retries} in {delay:.1f}s")
+            else:
+                actual = None
+                if usage:
+                    try:
+                        actual = usage(result)
+                    except Exception:
+                        actual = None
+                self._on_success(tokens, actual)
+                report("ok", result)
+                return result
+            finally:
+                self._release()
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "rpm": self.config.rpm,
+                "tpm": self.config.tpm,
+                **{k: round(v, 2) if isinstance(v, float) else v for k, v in self.stats.items()},
+            }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _load_overrides() -> Dict[str, Dict[str, Any]]:
+    raw = os.getenv("RATE_LIMITS")
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+        return data if isinstance(data, dict) else {}
+    except json.JSONDecodeError as e:
+        logger.warning(f"Invalid RATE_LIMITS JSON ({e}); using defaults")
+        return {}
+
+
+def provider_name(base_url: Optional[str]) -> str:
+    """Provider key for an API base URL (its host), defaulting to OpenAI."""
+    if not base_url:
+        return "api.openai.com"
+    return urlparse(str(base_url)).hostname or str(base_url)
+
+
+def get_rate_limiter(provider: str, model: Optional[str] = None) -> RateLimiter:
+    """Get the process-wide limiter for a provider/model.
+
+    Config lookup order in RATE_LIMITS: "provider/model", "provider", "default".
+    """
+    name = f"{provider}/{model}" if model else provider
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            overrides = _load_overrides()
+            settings = overrides.get(name) or overrides.get(provider) or overrides.get("default") or {}
+            limiter = _limiters[name] = RateLimiter(name, RateLimitConfig.from_dict(settings))
+        return limiter
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every limiter created in this process."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
+
+
+def estimate_tokens(messages: Any, max_output: int = 1024) -> int:
+    """Rough token estimate (~4 chars/token, fixed cost per image) for TPM budgeting."""
+    chars = 0
+    images = 0
+
+    def walk(value):
+        nonlocal chars, images
+        if isinstance(value, str):
+            chars += len(value)
+        elif isinstance(value, dict):
+            if value.get("type") == "image_url":
+                images += 1
+                return
+            for v in value.values():
+                walk(v)
+        elif isinstance(value, (list, tuple)):
+            for v in value:
+                walk(v)
+
+    walk(messages)
+    return chars // 4 + images * 1000 + max_output
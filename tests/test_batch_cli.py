@@ -0,0 +1,30 @@
+"""
+Test --batch argument handling.
+
+Run with:
+    python -m pytest tests/test_batch_cli.py
+"""
+import sys
+import argparse
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.main import _batch_project_names, _parse_stage_workers
+
+
+def test_files_sharing_a_stem_get_separate_projects(tmp_path):
+    files = [tmp_path / name for name in ("paper.md", "paper.pdf", "other.pdf")]
+    for f in files:
+        f.write_text("x")
+
+    assert _batch_project_names(files) == ["paper_md", "paper_pdf", "other"]
+
+
+def test_invalid_stage_workers_are_argparse_errors():
+    assert _parse_stage_workers("rag=1, generate=3") == {"rag": 1, "generate": 3}
+    with pytest.raises(argparse.ArgumentTypeError):
+        _parse_stage_workers("render=2")
@@ -0,0 +1,59 @@
+"""
+Test BatchParser process mode with a stand-in mineru CLI.
+
+Run with:
+    python -m pytest tests/test_batch_parser.py
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.raganything.batch_parser import BatchParser
+
+FAKE_MINERU = """#!{python}
+import sys, time
+from pathlib import Path
+args = sys.argv[1:]
+path = Path(args[args.index("-p") + 1])
+out = Path(args[args.index("-o") + 1]) / path.stem / "auto"
+if "slow" in path.name:
+    time.sleep(60)
+out.mkdir(parents=True, exist_ok=True)
+(out / (path.stem + ".md")).write_text("# parsed")
+"""
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="POSIX process groups")
+def test_process_mode_times_out_single_files(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    mineru = bin_dir / "mineru"
+    mineru.write_text(FAKE_MINERU.format(python=sys.executable))
+    mineru.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("MINERU_WORKERS", "0")
+
+    files = []
+    for name in ("a", "slow", "b"):
+        path = tmp_path / f"{name}.pdf"
+        path.write_bytes(b"%PDF-1.4\n")
+        files.append(str(path))
+
+    parser = BatchParser(
+        max_workers=2,
+        show_progress=False,
+        timeout_per_file=5,
+        skip_installation_check=True,
+        execution_mode="process",
+    )
+    result = parser.process_batch(files, str(tmp_path / "out"))
+
+    assert sorted(Path(f).stem for f in result.successful_files) == ["a", "b"]
+    assert [Path(f).stem for f in result.failed_files] == ["slow"]
+    assert "timed out" in result.errors[files[1]]
+    assert (tmp_path / "out" / "b" / "auto" / "b.md").exists()
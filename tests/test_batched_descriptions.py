@@ -0,0 +1,79 @@
+"""
+Test batched multimodal description generation.
+
+Run with:
+    python -m pytest tests/test_batched_descriptions.py
+"""
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.raganything.modalprocessors import TableModalProcessor
+
+
+def _result(name, number=None):
+    result = {
+        "detailed_description": f"about {name}",
+        "entity_info": {"entity_name": name, "entity_type": "table", "summary": name},
+    }
+    if number is not None:
+        result["item"] = number
+    return result
+
+
+def _processor(responses):
+    calls = []
+
+    async def caption_func(prompt, system_prompt=None, **kwargs):
+        calls.append(prompt)
+        return responses.pop(0)
+
+    # Skip LightRAG wiring; only description generation is exercised
+    processor = TableModalProcessor.__new__(TableModalProcessor)
+    processor.modal_caption_func = caption_func
+    processor.content_source = None
+    return processor, calls
+
+
+def test_one_request_per_group_with_single_item_fallback():
+    # Item 2 is missing from the batched response and gets its own call
+    batched = json.dumps({"items": [_result("A", 1), _result("C", 3)]})
+    processor, calls = _processor([f"```json\n{batched}\n```", json.dumps(_result("B"))])
+    tables = [{"type": "table", "table_body": body} for body in ("a", "b", "c")]
+    infos = [{"index": i} for i in range(3)]
+
+    results = asyncio.run(processor.generate_descriptions_batch(tables, "table", infos))
+
+    assert [entity["entity_name"] for _, entity in results] == ["A (table)", "B (table)", "C (table)"]
+    assert len(calls) == 2
+    assert "### Item 3" in calls[0] and "Body: c" in calls[0]
+
+
+def test_unparseable_batch_falls_back_to_single_calls():
+    processor, calls = _processor(["not json", json.dumps(_result("A")), json.dumps(_result("B"))])
+    tables = [{"type": "table", "table_body": body} for body in ("a", "b")]
+
+    results = asyncio.run(processor.generate_descriptions_batch(tables, "table", [{}, {}]))
+
+    assert sorted(entity["entity_name"] for _, entity in results) == ["A (table)", "B (table)"]
+    assert len(calls) == 3
+
+
+def test_failed_item_does_not_drop_the_rest_of_the_group():
+    batched = json.dumps({"items": [_result("A", 1)]})
+    processor, calls = _processor([f"```json\n{batched}\n```"])
+
+    async def failing_single(modal_content, content_type, item_info=None, entity_name=None):
+        raise RuntimeError("context extraction failed")
+
+    processor.generate_description_only = failing_single
+    tables = [{"type": "table", "table_body": body} for body in ("a", "b")]
+
+    results = asyncio.run(processor.generate_descriptions_batch(tables, "table", [{}, {}]))
+
+    assert results[0][1]["entity_name"] == "A (table)"
+    assert results[1] is None
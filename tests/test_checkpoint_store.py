@@ -0,0 +1,49 @@
+"""
+Test content-addressed checkpoint reuse.
+
+Run with:
+    python -m pytest tests/test_checkpoint_store.py
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.core import get_base_dir, get_config_dir, detect_start_stage, publish_checkpoint
+from paper2slides.core.paths import get_rag_checkpoint
+from paper2slides.utils import save_json, load_json
+
+
+def _setup(tmp_path: Path, name: str, data: bytes):
+    pdf = tmp_path / "inputs" / name / "paper.pdf"
+    pdf.parent.mkdir(parents=True)
+    pdf.write_bytes(data)
+    config = {"input_path": str(pdf), "content_type": "paper", "fast_mode": True, "output_type": "slides"}
+    base_dir = get_base_dir(str(tmp_path / "outputs"), name, "paper")
+    return config, base_dir, get_config_dir(base_dir, config)
+
+
+def test_same_bytes_reuse_across_projects(tmp_path):
+    config_a, base_a, config_dir_a = _setup(tmp_path, "a", b"%PDF same bytes")
+    md = base_a / "rag_output" / "paper.md"
+    md.parent.mkdir(parents=True)
+    md.write_text("# Paper")
+    save_json(get_rag_checkpoint(base_a, config_a), {"rag_results": {}, "markdown_paths": [str(md)]})
+    publish_checkpoint("rag", base_a, config_dir_a, config_a)
+
+    config_b, base_b, config_dir_b = _setup(tmp_path, "b", b"%PDF same bytes")
+    assert detect_start_stage(base_b, config_dir_b, config_b) == "summary"
+    restored = load_json(get_rag_checkpoint(base_b, config_b))
+    assert restored["markdown_paths"] == [str(md)]
+    assert restored["input_path"] == config_b["input_path"]
+
+
+def test_same_name_different_bytes_is_not_reused(tmp_path):
+    config, base_dir, config_dir = _setup(tmp_path, "a", b"%PDF first")
+    save_json(get_rag_checkpoint(base_dir, config), {"rag_results": {}, "markdown_paths": []})
+    publish_checkpoint("rag", base_dir, config_dir, config)
+    assert detect_start_stage(base_dir, config_dir, config) == "summary"
+
+    Path(config["input_path"]).write_bytes(b"%PDF second, different paper")
+    assert detect_start_stage(base_dir, config_dir, config) == "rag"
@@ -0,0 +1,46 @@
+"""
+Test page-indexed context extraction.
+
+Run with:
+    python -m pytest tests/test_context_extractor.py
+"""
+import sys
+import random
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.raganything.modalprocessors import ContextExtractor, ContextConfig
+
+
+def _reference_page_context(extractor, content_list, current_page):
+    """Full scan over the content list, as before the page index."""
+    window = extractor.config.context_window
+    texts = []
+    for item in content_list:
+        page = item.get("page_idx", 0)
+        if max(0, current_page - window) <= page < current_page + window + 1 and item.get("type") in extractor.config.filter_content_types:
+            text = extractor._extract_text_from_item(item)
+            if text and text.strip():
+                texts.append(text if page == current_page else f"[Page {page}] {text}")
+    return extractor._truncate_context("\n".join(texts))
+
+
+def test_page_index_matches_full_scan():
+    rng = random.Random(0)
+    content_list = []
+    for i in range(300):
+        # Mostly page order, with a few out-of-order blocks
+        page = i // 10 if rng.random() < 0.9 else rng.randint(0, 29)
+        kind = rng.choice(["text", "text", "image", "table"])
+        content_list.append({"type": kind, "text": f"block {i}.", "page_idx": page, "text_level": rng.choice([0, 0, 1])})
+
+    extractor = ContextExtractor(ContextConfig(context_window=2, max_context_tokens=400, filter_content_types=["text", "image"]))
+    for page in range(32):
+        expected = _reference_page_context(extractor, content_list, page)
+        assert extractor.extract_context(content_list, {"page_idx": page}, "minerU") == expected
+
+    # Same page reuses the cached string
+    first = extractor.extract_context(content_list, {"page_idx": 5}, "minerU")
+    assert extractor.extract_context(content_list, {"page_idx": 5, "index": 51}, "minerU") is first
@@ -0,0 +1,139 @@
+"""
+Test the persistent multimodal description cache.
+
+Run with:
+    python -m pytest tests/test_description_cache.py
+"""
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.raganything.description_cache import DescriptionCache
+from paper2slides.raganything.modalprocessors import ImageModalProcessor, TableModalProcessor
+
+
+class MemoryKV:
+    """In-memory stand-in for a LightRAG KV storage"""
+
+    def __init__(self):
+        self.data = {}
+        self.persisted = 0
+        self.reads = 0
+
+    async def get_by_id(self, key):
+        self.reads += 1
+        return self.data.get(key)
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+    async def index_done_callback(self):
+        self.persisted += 1
+
+
+def _result(name, number=None):
+    result = {
+        "detailed_description": f"about {name}",
+        "entity_info": {"entity_name": name, "entity_type": "table", "summary": name},
+    }
+    if number is not None:
+        result["item"] = number
+    return result
+
+
+def _processor(cls, cache, responses):
+    calls = []
+
+    async def caption_func(prompt, system_prompt=None, **kwargs):
+        calls.append(prompt)
+        return responses.pop(0)
+
+    # Skip LightRAG wiring; only description generation is exercised
+    processor = cls.__new__(cls)
+    processor.modal_caption_func = caption_func
+    processor.content_source = None
+    processor.description_cache = cache
+    return processor, calls
+
+
+def test_batched_descriptions_are_reused_across_documents():
+    cache = DescriptionCache(MemoryKV(), model="m")
+    batched = json.dumps({"items": [_result("A", 1), _result("B", 2)]})
+    processor, calls = _processor(TableModalProcessor, cache, [batched, json.dumps(_result("C"))])
+
+    first = [
+        {"type": "table", "table_body": "a", "img_path": "/doc1/t1.jpg", "page_idx": 1},
+        {"type": "table", "table_body": "b", "img_path": "/doc1/t2.jpg", "page_idx": 2},
+    ]
+    asyncio.run(processor.generate_descriptions_batch(first, "table", [{}, {}]))
+    assert len(calls) == 1
+
+    # Same tables at other paths/pages plus one new table: only the new one is described
+    second = [
+        {"type": "table", "table_body": "b", "img_path": "/doc2/x.jpg", "page_idx": 7},
+        {"type": "table", "table_body": "c", "img_path": "/doc2/y.jpg", "page_idx": 8},
+        {"type": "table", "table_body": "a", "img_path": "/doc2/z.jpg", "page_idx": 9},
+    ]
+    results = asyncio.run(processor.generate_descriptions_batch(second, "table", [{}, {}, {}]))
+    assert [entity["entity_name"] for _, entity in results] == ["B (table)", "C (table)", "A (table)"]
+    assert len(calls) == 2 and "c" in calls[1]
+
+    asyncio.run(cache.flush())
+    assert cache.storage.persisted == 1
+    stats = cache.snapshot()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (2, 3, 3)
+    assert stats["hit_rate"] == 0.4
+
+
+def test_image_key_uses_bytes_and_model(tmp_path):
+    first, copy, other = tmp_path / "a.jpg", tmp_path / "b.jpg", tmp_path / "c.jpg"
+    first.write_bytes(b"pixels")
+    copy.write_bytes(b"pixels")
+    other.write_bytes(b"other pixels")
+
+    cache = DescriptionCache(MemoryKV(), model="m")
+    processor, _ = _processor(ImageModalProcessor, cache, [])
+    key = lambda path: processor._description_cache_key({"img_path": str(path)}, "image")
+    assert key(first) == key(copy) != key(other)
+
+    digest = processor._description_content_digest({"img_path": str(first)})
+    other_model = DescriptionCache(MemoryKV(), model="other")
+    assert cache.key("image", digest) == key(first) != other_model.key("image", digest)
+
+
+def test_unparseable_responses_are_not_cached():
+    cache = DescriptionCache(MemoryKV(), model="m")
+    processor, calls = _processor(TableModalProcessor, cache, ["not json", json.dumps(_result("A"))])
+    table = {"type": "table", "table_body": "a"}
+
+    description, _ = asyncio.run(processor.generate_description_only(table, "table"))
+    assert description == "not json"
+    assert cache.storage.data == {}
+
+    # Described again, and the parsed answer is what gets cached
+    description, entity = asyncio.run(processor.generate_description_only(table, "table"))
+    assert len(calls) == 2 and entity["entity_name"] == "A (table)"
+    assert asyncio.run(processor.generate_description_only(table, "table"))[0] == "about A"
+    assert len(calls) == 2
+
+
+def test_each_item_is_looked_up_once():
+    cache = DescriptionCache(MemoryKV(), model="m")
+    # Item "a" is cached; the batch covers "b" only, so "c" is described alone
+    batched = json.dumps({"items": [_result("B", 1)]})
+    processor, calls = _processor(TableModalProcessor, cache, [json.dumps(_result("A")), batched, json.dumps(_result("C"))])
+    tables = [{"type": "table", "table_body": body} for body in ("a", "b", "c")]
+    asyncio.run(processor.generate_description_only(tables[0], "table"))
+    cache.storage.reads = 0
+
+    cached = asyncio.run(processor.cached_descriptions(tables, "table", [{}, {}, {}]))
+    results = asyncio.run(processor.generate_descriptions_batch(tables, "table", [{}, {}, {}], cached=cached))
+
+    assert [entity["entity_name"] for _, entity in results] == ["A (table)", "B (table)", "C (table)"]
+    assert cache.storage.reads == 3 and len(calls) == 3
+    stats = cache.snapshot()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
@@ -0,0 +1,44 @@
+"""
+Test streamed pipeline progress events.
+
+Run with:
+    python -m pytest tests/test_events.py
+"""
+import sys
+import asyncio
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.core.events import EventBus
+
+
+def test_late_subscriber_gets_history_and_thread_events():
+    """History is replayed, worker-thread events are delivered, done ends the stream."""
+    async def scenario():
+        bus = EventBus()
+        bus.publish("s1", {"type": "stage", "stage": "rag", "status": "running"})
+
+        received = []
+
+        async def consume():
+            async for event in bus.subscribe("s1"):
+                received.append(event["type"])
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+
+        # Generate stage reports slides from worker threads
+        worker = threading.Thread(target=bus.publish, args=("s1", {"type": "slide", "index": 0}))
+        worker.start()
+        worker.join()
+        await asyncio.sleep(0)
+        bus.publish("s1", {"type": "done"})
+
+        await asyncio.wait_for(consumer, timeout=1)
+        assert received == ["stage", "slide", "done"]
+        assert [e["seq"] for e in bus.history("s1")] == [1, 2, 3]
+
+    asyncio.run(scenario())
@@ -0,0 +1,57 @@
+"""
+Test that fast mode reuses cached parser output.
+
+Run with:
+    python -m pytest tests/test_fast_parse_cache.py
+"""
+import sys
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.core.stages.rag_stage import _parse_with_cache
+from paper2slides.raganything.parse_cache import ParseCacheFile
+
+
+class _FakeBatchParser:
+    """Writes MinerU's output layout and counts parsed files."""
+
+    def __init__(self):
+        self.parsed = []
+
+    def filter_supported_files(self, file_paths, recursive=True):
+        return [str(p) for p in file_paths]
+
+    def process_batch(self, file_paths, output_dir, parse_method="auto", recursive=True):
+        for file_path in file_paths:
+            stem = Path(file_path).stem
+            out = Path(output_dir) / stem / parse_method
+            out.mkdir(parents=True)
+            (out / f"{stem}_content_list.json").write_text(json.dumps([{"type": "text", "text": "hello"}]))
+            (out / f"{stem}.md").write_text("hello")
+            self.parsed.append(file_path)
+        return SimpleNamespace(successful_files=list(file_paths))
+
+
+def test_second_run_skips_parsing(tmp_path):
+    pdf = tmp_path / "paper.pdf"
+    pdf.write_bytes(b"%PDF-1.4 bytes")
+    output_dir = tmp_path / "rag_output"
+    storage_dir = tmp_path / "rag_storage"
+
+    first = _FakeBatchParser()
+    markdown_paths = _parse_with_cache(first, str(pdf), output_dir, storage_dir)
+    assert first.parsed == [str(pdf)]
+    assert markdown_paths == [str(output_dir / "paper" / "auto" / "paper.md")]
+    assert (storage_dir / "kv_store_parse_cache.json").exists()
+
+    second = _FakeBatchParser()
+    assert _parse_with_cache(second, str(pdf), output_dir, storage_dir) == markdown_paths
+    assert second.parsed == []
+
+    # Missing output invalidates the entry
+    Path(markdown_paths[0]).unlink()
+    assert ParseCacheFile(storage_dir).lookup(pdf, {"parser": "mineru", "parse_method": "auto"}) is None
@@ -0,0 +1,102 @@
+"""
+Test the per-run figure asset cache.
+
+Run with:
+    python -m pytest tests/test_image_cache.py
+"""
+import os
+import sys
+import asyncio
+from pathlib import Path
+
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.utils.image_cache import ImageProfile, figure_cache_scope, get_figure_cache
+
+
+def test_assets_shared_within_run_and_reloaded_on_change(tmp_path):
+    path = tmp_path / "fig.png"
+    Image.new("RGB", (400, 200), "red").save(path)
+
+    async def lookup():
+        return get_figure_cache().get(path)
+
+    with figure_cache_scope() as cache:
+        first = cache.get(path)
+        # Tasks started inside the run see the same cache
+        assert asyncio.run(lookup()) is first
+        assert first.base64 is first.base64
+        assert first.image().size == (400, 200)
+
+        small = first.prepared(ImageProfile(max_edge=100))
+        assert small.image().size == (100, 50)
+        assert small.mime_type == "image/png"
+        assert first.prepared(ImageProfile(max_edge=100)) is small
+        assert first.prepared(ImageProfile(format="original")) is first
+
+        Image.new("RGB", (10, 10), "blue").save(path)
+        os.utime(path, ns=(0, 12345))
+        assert cache.get(path) is not first
+        assert cache.get(tmp_path / "missing.png") is None
+
+    assert get_figure_cache() is not cache
+
+
+def test_prepared_variants_are_resized_reencoded_and_stored_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("IMAGE_PROFILES", '{"vision": {"max_edge": 64}}')
+    path = tmp_path / "photo.png"
+    # Noise: a photo-like image, so it is re-encoded as JPEG without its metadata
+    image = Image.effect_noise((640, 480), 64).convert("RGB")
+    image.save(path, pnginfo=_text_chunk())
+    disk = tmp_path / "prepared"
+
+    with figure_cache_scope(disk) as cache:
+        vision = cache.get(path).prepared("vision")
+        assert vision.mime_type == "image/jpeg"
+        assert vision.image().size == (64, 48)
+        assert len(vision.data) < path.stat().st_size
+        assert b"secret" not in vision.data
+        reference = cache.get(path).prepared("reference")
+        assert reference.image().size == (640, 480)
+
+    stored = list(disk.rglob("*.jpg"))
+    assert len(stored) == 2
+    with figure_cache_scope(disk) as cache:
+        again = cache.get(path).prepared("vision")
+        assert again.data == vision.data
+        assert again._image is None  # served from disk, not re-encoded
+
+
+def _text_chunk():
+    from PIL.PngImagePlugin import PngInfo
+    info = PngInfo()
+    info.add_text("Comment", "secret")
+    return info
+
+
+def test_batch_stages_get_a_disk_backed_figure_cache(tmp_path, monkeypatch):
+    from paper2slides.core import pipeline
+    from paper2slides.core.batch import BatchDocument, run_batch_pipeline
+
+    seen = []
+
+    async def fake_stage(*args, **kwargs):
+        seen.append((get_figure_cache(), get_figure_cache()))
+
+    for name in ("run_rag_stage", "run_summary_stage", "run_plan_stage", "run_generate_stage"):
+        monkeypatch.setattr(pipeline, name, fake_stage)
+    monkeypatch.setattr(pipeline, "publish_checkpoint", lambda *args: None)
+    monkeypatch.delenv("CHECKPOINT_STORE_DIR", raising=False)
+
+    base_dir = tmp_path / "out" / "paper" / "paper"
+    doc = BatchDocument(name="paper", base_dir=base_dir, config_dir=base_dir / "cfg", config={}, from_stage="plan")
+    doc.config_dir.mkdir(parents=True)
+    asyncio.run(run_batch_pipeline([doc]))
+
+    assert len(seen) == 2
+    for first, second in seen:
+        assert first is second
+        assert first.disk_dir == tmp_path / "out" / ".cas" / "images"
@@ -0,0 +1,91 @@
+"""
+Test concurrent slide generation with an async provider.
+
+Run with:
+    python -m pytest tests/test_image_generator.py
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.generator import GenerationConfig, GenerationInput, ContentPlan, Section, OutputType
+from paper2slides.generator.image_generator import ImageGenerator
+from paper2slides.generator.providers import ImageGenerationProvider, ImageGenerationResponse
+from paper2slides.summary import OriginalElements
+
+
+class FakeProvider(ImageGenerationProvider):
+    """Async provider that records how many requests are in flight."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    def get_default_model(self) -> str:
+        return "fake"
+
+    def generate_image(self, request):
+        raise AssertionError("blocking path should not be used")
+
+    async def agenerate_image(self, request):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return ImageGenerationResponse(image_data=request.prompt[-16:].encode(), mime_type="image/png")
+
+
+def _inputs(num_slides: int):
+    plan = ContentPlan(
+        output_type="slides",
+        sections=[Section(id=f"s{i}", title=f"Slide {i}", section_type="content", content=f"body {i}") for i in range(num_slides)],
+    )
+    gen_input = GenerationInput(
+        config=GenerationConfig(output_type=OutputType.SLIDES),
+        content=None,
+        origin=OriginalElements(),
+    )
+    return plan, gen_input
+
+
+def test_slides_run_concurrently_in_order():
+    provider = FakeProvider()
+    generator = ImageGenerator(provider=provider)
+    plan, gen_input = _inputs(10)
+    saved = []
+
+    images = asyncio.run(generator.generate(
+        plan, gen_input, max_workers=4,
+        save_callback=lambda img, i, total: saved.append(i),
+    ))
+
+    assert [img.section_id for img in images] == [f"s{i}" for i in range(10)]
+    assert provider.peak == 4
+    assert sorted(saved) == list(range(10))
+
+
+def test_cancel_stops_in_flight_requests():
+    async def scenario():
+        provider = FakeProvider(delay=10)
+        generator = ImageGenerator(provider=provider)
+        plan, gen_input = _inputs(2)
+        task = asyncio.create_task(generator.generate(plan, gen_input))
+        await asyncio.sleep(0.05)
+        assert provider.active == 1
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert provider.active == 0
+        assert provider.calls == 1
+
+    asyncio.run(scenario())
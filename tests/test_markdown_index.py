@@ -0,0 +1,45 @@
+"""
+Test indexed table/figure extraction.
+
+Run with:
+    python -m pytest tests/test_markdown_index.py
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.summary.extractors import extract_figures, extract_tables, MarkdownIndex
+
+CONTENT = "\n".join([
+    "# Paper",
+    "Table 1: Results before the table",
+    "<table><tr><td>1</td></tr>",
+    "</table>",
+    "![](images/a.jpg)",
+    "  Figure 1: Caption after the image  ",
+    "## Next",
+    "![](images/b.jpg)",
+    "<table><tr><td>2</td></tr></table>",
+    "Table 2: Caption after the table",
+])
+
+
+def test_line_numbers_and_captions():
+    lines = CONTENT.split("\n")
+    index = MarkdownIndex(CONTENT, lines)
+    for pos in (0, 7, 8, len(CONTENT) - 1):
+        assert index.line_of(pos) == CONTENT[:pos].count("\n")
+
+    figures = extract_figures(CONTENT, lines, search_chars=0, index=index)
+    assert [(f.figure_id, f.caption, f.line_number) for f in figures] == [
+        ("Figure 1", "Caption after the image", 4),
+        ("Doc Figure 1", None, 7),
+    ]
+
+    tables = extract_tables(CONTENT, lines, index=index)
+    assert [(t.table_id, t.caption, t.line_number) for t in tables] == [
+        ("Table 1", "Results before the table", 2),
+        ("Table 2", "Caption after the table", 8),
+    ]
@@ -0,0 +1,90 @@
+"""
+Test run metrics collected from rate-limited provider calls.
+
+Run with:
+    python -m pytest tests/test_metrics.py
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.utils.metrics import RunMetrics, metrics_scope, stage_scope, incr
+from paper2slides.utils.rate_limit import RateLimiter, RateLimitConfig
+
+
+class FakeTimeout(Exception):
+    """Name contains "Timeout", so the limiter retries it."""
+
+
+def test_calls_are_recorded_per_stage_with_retries():
+    async def scenario():
+        limiter = RateLimiter("test/model", RateLimitConfig(base_delay=0.01, max_retries=1))
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise FakeTimeout()
+            return "answer"
+
+        async def broken():
+            raise ValueError("bad response")
+
+        await limiter.call(
+            flaky, request_bytes=120,
+            describe=lambda r: {"prompt_tokens": 30, "completion_tokens": 5, "response_bytes": len(r)},
+        )
+        with pytest.raises(ValueError):
+            await limiter.call(broken, kind="image")
+
+    metrics = RunMetrics()
+    with metrics_scope(metrics):
+        with stage_scope("summary"):
+            asyncio.run(scenario())
+            incr("cache.figure.hits", 2)
+    # Outside the scope nothing is recorded
+    incr("cache.figure.hits")
+
+    data = metrics.to_dict()
+    ok, failed = data["calls"]
+    assert ok["stage"] == "summary" and ok["kind"] == "llm" and ok["provider"] == "test/model"
+    assert ok["retries"] == 1 and ok["status"] == "ok"
+    assert ok["prompt_tokens"] == 30 and ok["request_bytes"] == 120 and ok["response_bytes"] == 6
+    assert failed["kind"] == "image" and failed["status"] == "error" and failed["error"] == "ValueError"
+    totals = data["calls_by_stage"]["summary"]
+    assert totals["llm"]["calls"] == 1 and totals["llm"]["completion_tokens"] == 5
+    assert totals["image"]["errors"] == 1
+    assert data["counters"] == {"cache.figure.hits": 2}
+
+
+def test_batch_runs_save_metrics_per_document(tmp_path, monkeypatch):
+    from paper2slides.core import pipeline
+    from paper2slides.core.batch import BatchDocument, run_batch_pipeline
+    from paper2slides.core.state import load_state
+    from paper2slides.utils.metrics import record_call
+
+    async def fake_stage(*args, **kwargs):
+        record_call("llm", provider="test/model", status="ok")
+
+    for name in ("run_rag_stage", "run_summary_stage", "run_plan_stage", "run_generate_stage"):
+        monkeypatch.setattr(pipeline, name, fake_stage)
+    monkeypatch.setattr(pipeline, "publish_checkpoint", lambda *args: None)
+
+    docs = [
+        BatchDocument(name=name, base_dir=tmp_path / name, config_dir=tmp_path / name / "cfg", config={}, from_stage="summary")
+        for name in ("a", "b")
+    ]
+    for doc in docs:
+        doc.config_dir.mkdir(parents=True)
+    asyncio.run(run_batch_pipeline(docs))
+
+    for doc in docs:
+        data = load_state(doc.config_dir)["metrics"]
+        assert set(data["stages"]) == {"summary", "plan", "generate"}
+        assert {call["stage"] for call in data["calls"]} == {"summary", "plan", "generate"}
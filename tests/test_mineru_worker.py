@@ -0,0 +1,105 @@
+"""
+Test parsing through persistent MinerU worker processes.
+
+A fake `mineru` package stands in for MinerU's in-process API.
+
+Run with:
+    python -m pytest tests/test_mineru_worker.py
+"""
+import os
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.raganything import mineru_worker
+from paper2slides.raganything.parser import MineruParser, MineruExecutionError
+
+FAKE_COMMON = '''
+import os
+import json
+from pathlib import Path
+
+
+def read_fn(path):
+    return Path(path).read_bytes()
+
+
+def do_parse(output_dir, pdf_file_names, pdf_bytes_list, p_lang_list,
+             backend="pipeline", parse_method="auto", formula_enable=True,
+             table_enable=True, server_url=None, start_page_id=0, end_page_id=None, **kwargs):
+    for name in pdf_file_names:
+        if name == "bad":
+            raise TypeError("malformed document")
+        out = Path(output_dir) / name / parse_method
+        out.mkdir(parents=True, exist_ok=True)
+        (out / f"{name}.md").write_text(f"# {name}")
+        content = [{"type": "text", "text": str(os.getpid()), "page_idx": 0}]
+        (out / f"{name}_content_list.json").write_text(json.dumps(content))
+'''
+
+
+@pytest.fixture
+def fake_mineru(tmp_path, monkeypatch):
+    package = tmp_path / "site" / "mineru"
+    (package / "cli").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "cli" / "__init__.py").write_text("")
+    (package / "cli" / "common.py").write_text(textwrap.dedent(FAKE_COMMON))
+    # Spawned workers inherit the parent's sys.path
+    monkeypatch.syspath_prepend(str(tmp_path / "site"))
+    monkeypatch.setattr(mineru_worker, "_importable", None)
+    monkeypatch.setattr(mineru_worker, "_disabled", False)
+    monkeypatch.setattr(mineru_worker, "_reserved", 0)
+    yield package / "cli" / "common.py"
+    mineru_worker.shutdown_mineru_workers()
+    sys.modules.pop("mineru", None)
+
+
+def test_documents_share_one_worker_process(tmp_path, fake_mineru, monkeypatch):
+    monkeypatch.setenv("MINERU_WORKERS", "1")
+    parser = MineruParser()
+    pids = []
+    for name in ("a", "b"):
+        pdf = tmp_path / f"{name}.pdf"
+        pdf.write_bytes(b"%PDF-1.4\n")
+        content = parser.parse_pdf(pdf, output_dir=str(tmp_path / "out"))
+        pids.append(content[0]["text"])
+
+    assert pids[0] == pids[1]
+    assert pids[0] != str(os.getpid())
+
+
+def test_disabled_pool_uses_cli(monkeypatch):
+    monkeypatch.setenv("MINERU_WORKERS", "0")
+    assert mineru_worker.get_mineru_worker_pool() is None
+    assert mineru_worker.run_in_worker("x.pdf", "out") is False
+
+
+def test_document_errors_fail_the_document_only(tmp_path, fake_mineru, monkeypatch):
+    monkeypatch.setenv("MINERU_WORKERS", "1")
+    for name in ("bad", "good"):
+        (tmp_path / f"{name}.pdf").write_bytes(b"%PDF-1.4\n")
+
+    with pytest.raises(MineruExecutionError):
+        MineruParser._run_mineru_command(tmp_path / "bad.pdf", tmp_path / "out")
+    assert mineru_worker.run_in_worker(tmp_path / "good.pdf", tmp_path / "out") is True
+
+
+def test_api_mismatch_disables_pool(tmp_path, fake_mineru, monkeypatch):
+    monkeypatch.setenv("MINERU_WORKERS", "1")
+    fake_mineru.write_text("def read_fn(path):\n    pass\n\n\ndef do_parse(output_dir, names):\n    pass\n")
+
+    assert mineru_worker.run_in_worker(tmp_path / "a.pdf", tmp_path / "out") is False
+    assert mineru_worker.get_mineru_worker_pool() is None
+
+
+def test_pool_grows_to_reserved_workers(fake_mineru, monkeypatch):
+    monkeypatch.delenv("MINERU_WORKERS", raising=False)
+    assert mineru_worker.get_mineru_worker_pool().num_workers == 1
+    mineru_worker.reserve_workers(3)
+    assert mineru_worker.get_mineru_worker_pool().num_workers == 3
@@ -0,0 +1,59 @@
+"""
+Test the content-addressed parse cache.
+
+Run with:
+    python -m pytest tests/test_parse_cache.py
+"""
+import sys
+import asyncio
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.raganything.processor import ProcessorMixin
+
+
+class _MemoryKV:
+    def __init__(self):
+        self.data = {}
+
+    async def get_by_id(self, key):
+        return self.data.get(key)
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+    async def index_done_callback(self):
+        pass
+
+
+class _Processor(ProcessorMixin):
+    def __init__(self):
+        self.config = SimpleNamespace(parser="mineru", parse_method="auto")
+        self.parse_cache = _MemoryKV()
+        self.logger = logging.getLogger(__name__)
+
+
+def test_copies_share_entries_until_outputs_disappear(tmp_path):
+    processor = _Processor()
+    original = tmp_path / "uploads" / "1" / "paper.pdf"
+    copy = tmp_path / "uploads" / "2" / "renamed.pdf"
+    for path in (original, copy):
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"%PDF-1.4 same bytes")
+    figure = tmp_path / "fig.jpg"
+    figure.write_bytes(b"jpeg")
+    content_list = [{"type": "image", "img_path": str(figure), "page_idx": 0}]
+
+    key = processor._generate_cache_key(original, lang="en")
+    assert processor._generate_cache_key(copy, lang="en") == key
+    assert processor._generate_cache_key(copy, lang="ch") != key
+
+    asyncio.run(processor._store_cached_result(key, content_list, "doc-1", original, lang="en"))
+    assert asyncio.run(processor._get_cached_result(key, copy, lang="en")) == (content_list, "doc-1")
+
+    figure.unlink()
+    assert asyncio.run(processor._get_cached_result(key, copy, lang="en")) is None
@@ -0,0 +1,102 @@
+"""
+Test the streaming slide PDF writer.
+
+Run with:
+    python -m pytest tests/test_pdf_writer.py
+"""
+import io
+import re
+import sys
+import zlib
+from pathlib import Path
+
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.generator.pdf_writer import StreamingPDFWriter
+
+
+def _encode(image, fmt):
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _objects(pdf: bytes):
+    """Map object number -> (dictionary, stream) via the xref table."""
+    xref = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+    size = int(re.search(rb"xref\n0 (\d+)", pdf[xref:]).group(1))
+    entries = pdf[xref:].split(b"\n")[2:2 + size]
+    objects = {}
+    for num, entry in enumerate(entries[1:], start=1):
+        offset = int(entry[:10])
+        assert pdf[offset:].startswith(f"{num} 0 obj".encode())
+        body = pdf[offset:pdf.index(b"endobj", offset)]
+        stream = None
+        if b"\nstream\n" in body:
+            length = int(re.search(rb"/Length (\d+)", body).group(1))
+            start = body.index(b"\nstream\n") + 8
+            stream = body[start:start + length]
+        objects[num] = (body, stream)
+    return objects
+
+
+def _unpredict_png(stream, width, bpp):
+    """Undo PNG row filters."""
+    raw = zlib.decompress(stream)
+    stride = width * bpp
+    rows, prev, pos = [], bytearray(stride), 0
+    while pos < len(raw):
+        ftype, row = raw[pos], bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        for i in range(stride):
+            left = row[i - bpp] if i >= bpp else 0
+            up = prev[i]
+            if ftype == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif ftype == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif ftype == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif ftype == 4:
+                upleft = prev[i - bpp] if i >= bpp else 0
+                p = left + up - upleft
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - upleft)
+                row[i] = (row[i] + (left if pa <= pb and pa <= pc else up if pb <= pc else upleft)) & 0xFF
+        rows.append(bytes(row))
+        prev = row
+    return b"".join(rows)
+
+
+def test_pages_stream_in_any_order_without_decoding(tmp_path):
+    photo = Image.effect_noise((40, 30), 50).convert("RGB")
+    jpeg = _encode(photo, "JPEG")
+    png = _encode(Image.linear_gradient("L").resize((20, 10)).convert("RGB"), "PNG")
+    rgba = Image.new("RGBA", (10, 10), (255, 0, 0, 0))
+
+    output = tmp_path / "slides.pdf"
+    writer = StreamingPDFWriter(output)
+    writer.add_page(2, _encode(rgba, "PNG"), "image/png")
+    writer.add_page(0, jpeg, "image/jpeg")
+    writer.add_page(1, png, "image/png")
+    assert not output.exists()
+    writer.close()
+
+    pdf = output.read_bytes()
+    objects = _objects(pdf)
+    kids = [int(n) for n in re.findall(rb"(\d+) 0 R", re.search(rb"/Kids \[(.*?)\]", objects[2][0]).group(1))]
+    images = []
+    for kid in kids:
+        image_num = int(re.search(rb"/Im0 (\d+) 0 R", objects[kid][0]).group(1))
+        images.append(objects[image_num])
+
+    # Page order follows the slide index; MediaBox is pixels at 100 dpi
+    assert b"/MediaBox [0 0 28.8000 21.6000]" in objects[kids[0]][0]
+    assert b"/DCTDecode" in images[0][0] and images[0][1] == jpeg
+    assert b"/Predictor 15" in images[1][0]
+    pixels = Image.open(io.BytesIO(png)).convert("RGB").tobytes()
+    assert _unpredict_png(images[1][1], 20, 3) == pixels
+    # Alpha PNGs are flattened onto white
+    assert zlib.decompress(images[2][1]) == b"\xff\xff\xff" * 100
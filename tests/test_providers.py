@@ -162,6 +162,21 @@ def test_factory():
         return False
 
 
+def test_google_response_uses_inline_bytes():
+    """Google responses are taken from inline_data without re-encoding."""
+    from types import SimpleNamespace
+
+    png = b"\x89PNG\r\n\x1a\n-image-bytes"
+    response = SimpleNamespace(parts=[
+        SimpleNamespace(text="Here is your slide", inline_data=None),
+        SimpleNamespace(text=None, inline_data=SimpleNamespace(data=png, mime_type="image/jpeg")),
+    ])
+    provider = GoogleGenAIProvider.__new__(GoogleGenAIProvider)
+    result = provider._parse_response(response)
+    assert result.image_data is png
+    assert result.mime_type == "image/jpeg"
+
+
 def main():
     """Run all provider tests."""
     print("\n" + "="*60)
@@ -0,0 +1,92 @@
+"""
+Test the pipeline job scheduler.
+
+Run with:
+    python -m pytest tests/test_scheduler.py
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.core.scheduler import JobScheduler, SchedulerLimits
+
+
+def test_admission_order_and_queue_position():
+    """Jobs beyond max_jobs queue by priority, then FIFO."""
+    async def scenario():
+        scheduler = JobScheduler(SchedulerLimits(max_jobs=1))
+        release = asyncio.Event()
+        started = []
+
+        def make(name):
+            async def job():
+                started.append(name)
+                await release.wait()
+            return job
+
+        scheduler.submit("a", make("a"))
+        scheduler.submit("b", make("b"))
+        scheduler.submit("c", make("c"), priority=5)
+        await asyncio.sleep(0)
+
+        assert started == ["a"]
+        assert scheduler.queue_position("c") == 1
+        assert scheduler.queue_position("b") == 2
+
+        release.set()
+        while scheduler.running_jobs() or scheduler.queued_jobs():
+            await asyncio.sleep(0.01)
+        assert started == ["a", "c", "b"]
+        assert scheduler.get_job("b").status == "completed"
+
+    asyncio.run(scenario())
+
+
+def test_stage_pool_limit_and_resource_key():
+    """Per-stage pools cap concurrency; same resource_key jobs serialize."""
+    async def scenario():
+        scheduler = JobScheduler(SchedulerLimits(max_jobs=4, parse=1))
+        active = 0
+        peak = 0
+
+        def make(job_id):
+            async def job():
+                nonlocal active, peak
+                async with scheduler.stage_slot(job_id, "rag"):
+                    active += 1
+                    peak = max(peak, active)
+                    await asyncio.sleep(0.01)
+                    active -= 1
+            return job
+
+        for job_id in ["a", "b", "c"]:
+            scheduler.submit(job_id, make(job_id))
+        scheduler.submit("d", make("d"), resource_key="proj")
+        scheduler.submit("e", make("e"), resource_key="proj")
+        await asyncio.sleep(0)
+
+        assert scheduler.get_job("e").status == "queued"
+        while scheduler.running_jobs() or scheduler.queued_jobs():
+            await asyncio.sleep(0.01)
+        assert peak == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancel_queued_job():
+    async def scenario():
+        scheduler = JobScheduler(SchedulerLimits(max_jobs=1))
+        release = asyncio.Event()
+        scheduler.submit("a", release.wait)
+        scheduler.submit("b", release.wait)
+        await asyncio.sleep(0)
+
+        assert scheduler.cancel("b")
+        assert scheduler.queue_position("b") is None
+        assert scheduler.get_job("b").status == "cancelled"
+        release.set()
+
+    asyncio.run(scenario())
@@ -0,0 +1,65 @@
+"""
+Test page-range sharded MinerU parsing.
+
+Run with:
+    python -m pytest tests/test_sharded_parse.py
+"""
+import sys
+import json
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper2slides.raganything.parser import MineruParser
+
+
+def _fake_mineru(input_path, output_dir, method="auto", start_page=None, end_page=None, **kwargs):
+    """Write MinerU output for pages start..end with shard-relative page_idx."""
+    stem = Path(input_path).stem
+    out = Path(output_dir) / stem / method
+    (out / "images").mkdir(parents=True)
+    (out / "images" / "fig.jpg").write_bytes(f"{start_page}".encode())
+    content = [{"type": "text", "text": f"page {p}", "page_idx": p - start_page} for p in range(start_page, end_page + 1)]
+    content.append({"type": "image", "img_path": "images/fig.jpg", "page_idx": 0})
+    (out / f"{stem}_content_list.json").write_text(json.dumps(content))
+    (out / f"{stem}.md").write_text(f"pages {start_page}-{end_page}\n![](images/fig.jpg)")
+
+
+def test_shards_are_merged_with_page_offsets(tmp_path, monkeypatch):
+    monkeypatch.setattr(MineruParser, "_count_pdf_pages", staticmethod(lambda path: 5))
+    monkeypatch.setattr(MineruParser, "_run_mineru_command", staticmethod(_fake_mineru))
+    pdf = tmp_path / "thesis.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n")
+    out = tmp_path / "out"
+
+    content = MineruParser().parse_pdf(pdf, output_dir=str(out), shard_pages=2)
+
+    texts = [(item["text"], item["page_idx"]) for item in content if item["type"] == "text"]
+    assert texts == [(f"page {p}", p) for p in range(5)]
+
+    images = [item for item in content if item["type"] == "image"]
+    assert [item["page_idx"] for item in images] == [0, 2, 4]
+    # Clashing image names are renamed and still resolve to each shard's file
+    assert [Path(item["img_path"]).read_bytes() for item in images] == [b"0", b"2", b"4"]
+
+    md = (out / "thesis" / "auto" / "thesis.md").read_text()
+    assert md.index("pages 0-1") < md.index("pages 2-3") < md.index("pages 4-4")
+    assert "images/s1_fig.jpg" in md and "images/s2_fig.jpg" in md
+    assert not (out / ".thesis_shards").exists()
+
+
+def test_shards_reserve_one_worker_each(tmp_path, monkeypatch):
+    from paper2slides.raganything import mineru_worker
+
+    reserved = []
+    monkeypatch.setattr(mineru_worker, "reserve_workers", reserved.append)
+    monkeypatch.setattr(MineruParser, "_count_pdf_pages", staticmethod(lambda path: 9))
+    monkeypatch.setattr(MineruParser, "_run_mineru_command", staticmethod(_fake_mineru))
+    monkeypatch.setenv("MINERU_SHARD_WORKERS", "4")
+    pdf = tmp_path / "thesis.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n")
+
+    MineruParser().parse_pdf(pdf, output_dir=str(tmp_path / "out"), shard_pages=3)
+
+    assert reserved == [3]